@@ -11,9 +11,9 @@ router = APIRouter()
 # Compare all models (full prediction output)
 # ---------------------------------------------------------
 @router.get("/")
-def compare(symbol: str):
+def compare(symbol: str, parallel: bool = False):
     models = ["baseline", "lstm", "xgboost", "transformer", "ensemble"]
-    return compare_models(symbol, models)
+    return compare_models(symbol, models, parallel=parallel)
 
 
 # ---------------------------------------------------------
@@ -29,7 +29,7 @@ def overlay(symbol: str):
 # Model Ranking (Step 7)
 # ---------------------------------------------------------
 @router.get("/rank")
-def rank(symbol: str):
+def rank(symbol: str, parallel: bool = False):
     models = ["baseline", "lstm", "xgboost", "transformer", "ensemble"]
-    return rank_models(symbol, models)
+    return rank_models(symbol, models, parallel=parallel)
 
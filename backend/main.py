@@ -1,11 +1,15 @@
 # backend/main.py
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Depends, Query, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any, Literal, Optional
 import time
 import math
 import random
-import httpx
+import aiohttp
+
+from backend.schemas.market import Candle
+from core.data.kline_parser import parse_binance_klines
+from core.utils.http_client import http_pool, get_http_session
 
 app = FastAPI(
     title="TbirdTrader Backend",
@@ -24,6 +28,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ------------------------------------------------------------------------------
+# Shared upstream HTTP pool (keep-alive, per-host limits, timeouts)
+# ------------------------------------------------------------------------------
+@app.on_event("startup")
+async def startup_http_pool() -> None:
+    await http_pool.startup()
+
+
+@app.on_event("shutdown")
+async def shutdown_http_pool() -> None:
+    await http_pool.shutdown()
+
 # ------------------------------------------------------------------------------
 # Health
 # ------------------------------------------------------------------------------
@@ -62,12 +78,14 @@ BINANCE_INTERVAL_MAP: Dict[str, str] = {
 # ------------------------------------------------------------------------------
 # /paper/candles — REAL candles from Binance (BTCEUR)
 # ------------------------------------------------------------------------------
-@app.get("/paper/candles")
+# Encoded directly as a JSON Response; response_model documents its shape
+@app.get("/paper/candles", response_model=List[Candle])
 async def get_candles(
     symbol: str = Query(default="BTC-EUR", description="Trading pair label, e.g. BTC-EUR"),
     interval: Interval = Query(default="1m", description="Bar interval"),
     limit: int = Query(default=200, ge=1, le=1000, description="Number of candles (Binance max 1000)"),
-) -> List[Dict[str, Any]]:
+    session: aiohttp.ClientSession = Depends(get_http_session),
+) -> Response:
     """
     Returns real market candles from Binance, mapped to your frontend shape:
 
@@ -91,44 +109,17 @@ async def get_candles(
     )
 
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.get(url)
+        async with session.get(url) as resp:
             resp.raise_for_status()
-            data = resp.json()
+            payload = await resp.read()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch Binance data: {e}")
 
-    # Binance klines format:
-    # [
-    #   [
-    #     0 open time (ms),
-    #     1 open,
-    #     2 high,
-    #     3 low,
-    #     4 close,
-    #     5 volume,
-    #     6 close time (ms),
-    #     ...
-    #   ],
-    #   ...
-    # ]
-    candles: List[Dict[str, Any]] = []
-    for row in data:
-        try:
-            candles.append({
-                "timestamp": int(row[0] // 1000),  # open time ms -> seconds
-                "open": float(row[1]),
-                "high": float(row[2]),
-                "low": float(row[3]),
-                "close": float(row[4]),
-            })
-        except Exception:
-            # Skip malformed rows
-            continue
-
-    # Ensure ascending
-    candles.sort(key=lambda x: x["timestamp"])
-    return candles
+    # Binance klines: [open time (ms), open, high, low, close, volume, close time (ms), ...]
+    # Parsed column-wise into typed arrays (malformed rows dropped, sorted
+    # ascending) and encoded straight to JSON without per-row dicts.
+    candles = parse_binance_klines(payload)
+    return Response(content=candles.to_json_records(), media_type="application/json")
 
 # ------------------------------------------------------------------------------
 # /paper/account — matches BalancesCard (demo/mocked values, stable shape)
@@ -240,7 +231,7 @@ def model_predict(
             # Quick 1m fetch from Binance for anchor
             binance_symbol = symbol.replace("-", "")
             url = f"https://api.binance.com/api/v3/klines?symbol={binance_symbol}&interval=1m&limit=1"
-            r = httpx.get(url, timeout=10.0)
+            r = http_pool.get(url)
             r.raise_for_status()
             arr = r.json()
             if isinstance(arr, list) and len(arr) > 0:
@@ -43,6 +43,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---------------------------------------------------------
+# Shared upstream HTTP pool
+# ---------------------------------------------------------
+from core.utils.http_client import http_pool
+
+
+@app.on_event("startup")
+async def startup_http_pool():
+    await http_pool.startup()
+
+
+@app.on_event("shutdown")
+async def shutdown_http_pool():
+    await http_pool.shutdown()
+
+# ---------------------------------------------------------
+# Live L2 order books (ORDER_BOOK_SYMBOLS)
+# ---------------------------------------------------------
+from core.market.order_book import order_books, start_depth_feeds
+
+_depth_feeds = []
+
+
+@app.on_event("startup")
+async def startup_order_books():
+    _depth_feeds.extend(start_depth_feeds(order_books))
+
+
+@app.on_event("shutdown")
+async def shutdown_order_books():
+    for task in _depth_feeds:
+        task.cancel()
+
+# ---------------------------------------------------------
+# Live trade stream -> closed bars (STREAM_SYMBOLS)
+# ---------------------------------------------------------
+from core.data.streaming import start_stream
+
+_stream_tasks = []
+
+
+@app.on_event("startup")
+async def startup_stream():
+    _stream_tasks.extend(start_stream())
+
+
+@app.on_event("shutdown")
+async def shutdown_stream():
+    for task in _stream_tasks:
+        task.cancel()
+
+# ---------------------------------------------------------
+# Model registry warm-up (MODEL_PRELOAD)
+# ---------------------------------------------------------
+from core.model.model_registry import MODEL_PRELOAD, model_registry
+
+
+@app.on_event("startup")
+async def preload_models():
+    model_registry.preload([n.strip() for n in MODEL_PRELOAD.split(",") if n.strip()])
+
 # ---------------------------------------------------------
 # Routers
 # ---------------------------------------------------------
@@ -64,8 +125,9 @@ from backend.routers.market_orderbook import router as orderbook_router
 # ---------------------------------------------------------
 # NEW: Real Candlestick + Ensemble Prediction Endpoint
 # ---------------------------------------------------------
+from core.data.kline_parser import normalize_frame
 from core.data.market_data import MarketData
-from core.model.predictor import predict   # ⭐ REAL MODEL IMPORT
+from core.model.predictor import cached_predict   # ⭐ REAL MODEL IMPORT
 
 candles_router = APIRouter()
 market = MarketData()
@@ -84,69 +146,22 @@ async def get_candles(
     # ---------------------------------------------------------
     df = market.get_historical_data(symbol, interval, limit=limit)
 
-    if "timestamp" not in df.columns:
-        df = df.reset_index()
-
-    rename_map = {}
-    for col in df.columns:
-        if col.lower() in ["time", "timestamp", "date"]:
-            rename_map[col] = "timestamp"
-    df = df.rename(columns=rename_map)
-
-    if "timestamp" not in df.columns:
-        raise ValueError("No timestamp column found in market data")
-
-    def to_unix(ts):
-        if hasattr(ts, "timestamp"):
-            return int(ts.timestamp())
-        try:
-            return int(ts)
-        except Exception:
-            return int(pd.to_datetime(ts).timestamp())
-
-    df["timestamp"] = df["timestamp"].apply(to_unix)
-
     # ---------------------------------------------------------
-    # 2. Build OHLC candles
+    # 2. Build OHLC candles (column-wise, sorted ascending)
     # ---------------------------------------------------------
-    candles = []
-    prev_close = None
-    has_ohlc = all(col in df.columns for col in ["open", "high", "low"])
-
-    for _, row in df.iterrows():
-        ts = int(row["timestamp"])
-        close = float(row["close"])
-
-        if has_ohlc:
-            open_price = float(row["open"])
-            high = float(row["high"])
-            low = float(row["low"])
-        else:
-            open_price = prev_close if prev_close is not None else close
-            high = max(open_price, close)
-            low = min(open_price, close)
-
-        candles.append({
-            "timestamp": ts,
-            "open": open_price,
-            "high": high,
-            "low": low,
-            "close": close,
-        })
-
-        prev_close = close
-
-    candles.sort(key=lambda x: x["timestamp"])
+    ohlc = normalize_frame(df)
+    candles = ohlc.to_records()
 
     # ---------------------------------------------------------
     # 3. Call REAL ENSEMBLE MODEL using SAME candle data
     # ---------------------------------------------------------
-    df_for_model = pd.DataFrame(candles)
+    df_for_model = ohlc.to_frame()
 
-    model_output = predict(
+    model_output = cached_predict(
         symbol=symbol,
         model="ensemble",
-        df=df_for_model
+        df=df_for_model,
+        interval=interval,
     )
 
     # ---------------------------------------------------------
@@ -235,6 +250,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---------------------------------------------------------
+# Shared upstream HTTP pool
+# ---------------------------------------------------------
+from core.utils.http_client import http_pool
+
+
+@app.on_event("startup")
+async def startup_http_pool():
+    await http_pool.startup()
+
+
+@app.on_event("shutdown")
+async def shutdown_http_pool():
+    await http_pool.shutdown()
+
+# ---------------------------------------------------------
+# Live L2 order books (ORDER_BOOK_SYMBOLS)
+# ---------------------------------------------------------
+from core.market.order_book import order_books, start_depth_feeds
+
+_depth_feeds = []
+
+
+@app.on_event("startup")
+async def startup_order_books():
+    _depth_feeds.extend(start_depth_feeds(order_books))
+
+
+@app.on_event("shutdown")
+async def shutdown_order_books():
+    for task in _depth_feeds:
+        task.cancel()
+
+# ---------------------------------------------------------
+# Live trade stream -> closed bars (STREAM_SYMBOLS)
+# ---------------------------------------------------------
+from core.data.streaming import start_stream
+
+_stream_tasks = []
+
+
+@app.on_event("startup")
+async def startup_stream():
+    _stream_tasks.extend(start_stream())
+
+
+@app.on_event("shutdown")
+async def shutdown_stream():
+    for task in _stream_tasks:
+        task.cancel()
+
+# ---------------------------------------------------------
+# Model registry warm-up (MODEL_PRELOAD)
+# ---------------------------------------------------------
+from core.model.model_registry import MODEL_PRELOAD, model_registry
+
+
+@app.on_event("startup")
+async def preload_models():
+    model_registry.preload([n.strip() for n in MODEL_PRELOAD.split(",") if n.strip()])
+
 # ---------------------------------------------------------
 # Routers
 # ---------------------------------------------------------
@@ -256,8 +332,9 @@ from backend.routers.market_orderbook import router as orderbook_router
 # ---------------------------------------------------------
 # NEW: Real Candlestick + Ensemble Prediction Endpoint
 # ---------------------------------------------------------
+from core.data.kline_parser import normalize_frame
 from core.data.market_data import MarketData
-from core.model.predictor import predict   # ⭐ REAL MODEL IMPORT
+from core.model.predictor import cached_predict   # ⭐ REAL MODEL IMPORT
 
 candles_router = APIRouter()
 market = MarketData()
@@ -276,69 +353,22 @@ async def get_candles(
     # ---------------------------------------------------------
     df = market.get_historical_data(symbol, interval, limit=limit)
 
-    if "timestamp" not in df.columns:
-        df = df.reset_index()
-
-    rename_map = {}
-    for col in df.columns:
-        if col.lower() in ["time", "timestamp", "date"]:
-            rename_map[col] = "timestamp"
-    df = df.rename(columns=rename_map)
-
-    if "timestamp" not in df.columns:
-        raise ValueError("No timestamp column found in market data")
-
-    def to_unix(ts):
-        if hasattr(ts, "timestamp"):
-            return int(ts.timestamp())
-        try:
-            return int(ts)
-        except Exception:
-            return int(pd.to_datetime(ts).timestamp())
-
-    df["timestamp"] = df["timestamp"].apply(to_unix)
-
     # ---------------------------------------------------------
-    # 2. Build OHLC candles
+    # 2. Build OHLC candles (column-wise, sorted ascending)
     # ---------------------------------------------------------
-    candles = []
-    prev_close = None
-    has_ohlc = all(col in df.columns for col in ["open", "high", "low"])
-
-    for _, row in df.iterrows():
-        ts = int(row["timestamp"])
-        close = float(row["close"])
-
-        if has_ohlc:
-            open_price = float(row["open"])
-            high = float(row["high"])
-            low = float(row["low"])
-        else:
-            open_price = prev_close if prev_close is not None else close
-            high = max(open_price, close)
-            low = min(open_price, close)
-
-        candles.append({
-            "timestamp": ts,
-            "open": open_price,
-            "high": high,
-            "low": low,
-            "close": close,
-        })
-
-        prev_close = close
-
-    candles.sort(key=lambda x: x["timestamp"])
+    ohlc = normalize_frame(df)
+    candles = ohlc.to_records()
 
     # ---------------------------------------------------------
     # 3. Call REAL ENSEMBLE MODEL using SAME candle data
     # ---------------------------------------------------------
-    df_for_model = pd.DataFrame(candles)
+    df_for_model = ohlc.to_frame()
 
-    model_output = predict(
+    model_output = cached_predict(
         symbol=symbol,
         model="ensemble",
-        df=df_for_model
+        df=df_for_model,
+        interval=interval,
     )
 
     # ---------------------------------------------------------
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from core.market.data_loader import load_historical_data
 from core.backtesting.backtester import Backtester
+from core.backtesting.sweep import SWEEP_MAX_CONFIGS, grid, grid_size, random_search, run_sweep
+from core.backtesting.walk_forward import walk_forward
+from core.backtesting.monte_carlo import MC_MAX_PATHS, MC_PATHS, monte_carlo
 
 router = APIRouter()
 
+# History loaded by /walk_forward (Coinbase pages of 300 candles)
+WALK_FORWARD_MAX_BARS = 20000
+
 
 @router.get("/run")
 def run_backtest(symbol: str = Query("BTC-EUR", description="Trading pair symbol")):
@@ -27,3 +33,120 @@ def run_backtest(symbol: str = Query("BTC-EUR", description="Trading pair symbol
     except Exception as e:
         return {"error": str(e)}
 
+
+def _values(text: str) -> list:
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def _space(rsi_low: str, rsi_high: str, risk_pct: str) -> dict:
+    """
+    Parameter values of a sweep request, rejected (422) when the full
+    grid exceeds SWEEP_MAX_CONFIGS.
+    """
+    try:
+        space = {"rsi_low": _values(rsi_low), "rsi_high": _values(rsi_high), "risk_pct": _values(risk_pct)}
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if grid_size(space) > SWEEP_MAX_CONFIGS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{grid_size(space)} configurations exceed the maximum of {SWEEP_MAX_CONFIGS}",
+        )
+    return space
+
+
+@router.get("/sweep")
+def sweep_backtest(
+    symbol: str = Query("BTC-EUR", description="Trading pair symbol"),
+    rsi_low: str = Query("25,30,35", description="Comma-separated values"),
+    rsi_high: str = Query("65,70,75", description="Comma-separated values"),
+    risk_pct: str = Query("1,2,3", description="Comma-separated values"),
+    samples: int = Query(
+        0, ge=0, le=SWEEP_MAX_CONFIGS,
+        description="Random configurations drawn from the value ranges; 0 = full grid",
+    ),
+    sort: str = Query("sharpe_ratio", description="Metric to rank by"),
+    limit: int = Query(50, ge=1, description="Rows returned"),
+):
+    """
+    Backtest every parameter configuration in parallel and return the
+    best `limit` configurations by `sort`.
+    """
+    space = _space(rsi_low, rsi_high, risk_pct)
+
+    try:
+        df = load_historical_data(symbol)
+        if samples > 0:
+            configs = random_search({k: (min(v), max(v)) for k, v in space.items()}, samples)
+        else:
+            configs = grid(space)
+
+        table = run_sweep(df, configs, symbol=symbol, sort_by=sort)
+        return {
+            "symbol": symbol,
+            "configurations": len(table),
+            "results": table.head(limit).to_dict(orient="records"),
+        }
+
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@router.get("/walk_forward")
+def walk_forward_backtest(
+    symbol: str = Query("BTC-EUR", description="Trading pair symbol"),
+    bars: int = Query(5000, ge=1, le=WALK_FORWARD_MAX_BARS, description="Candles of history to load"),
+    train: int = Query(1000, ge=1, description="Bars per train fold"),
+    test: int = Query(250, ge=1, description="Bars per test fold"),
+    expanding: bool = Query(False, description="Expanding instead of rolling train windows"),
+    rsi_low: str = Query("25,30,35", description="Comma-separated values"),
+    rsi_high: str = Query("65,70,75", description="Comma-separated values"),
+    risk_pct: str = Query("1,2,3", description="Comma-separated values"),
+    objective: str = Query("sharpe_ratio", description="Metric optimized on each train fold"),
+):
+    """
+    Walk-forward optimization: per-fold parameters and out-of-sample
+    metrics, plus the stitched out-of-sample equity curve.
+    """
+    space = _space(rsi_low, rsi_high, risk_pct)
+
+    try:
+        if train + test > bars:
+            raise ValueError(f"train + test ({train + test}) exceeds the {bars} bars requested")
+        # Paginated: a cold or short candle store is backfilled to `bars`
+        df = load_historical_data(symbol, limit=bars)
+        configs = grid(space)
+        return {"symbol": symbol, **walk_forward(
+            df, configs, train, test, expanding=expanding, symbol=symbol, objective=objective,
+        )}
+
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@router.get("/monte_carlo")
+def monte_carlo_backtest(
+    symbol: str = Query("BTC-EUR", description="Trading pair symbol"),
+    source: str = Query(
+        "returns", pattern="^(returns|trades)$",
+        description="Resample 'returns' (bar returns) or 'trades' (realized trade returns)",
+    ),
+    paths: int = Query(MC_PATHS, ge=1, le=MC_MAX_PATHS, description="Resampled paths"),
+    block: int = Query(1, ge=1, description="Block length; > 1 = moving-block bootstrap"),
+    confidence: float = Query(0.95, gt=0, lt=1, description="Confidence interval level"),
+):
+    """
+    Run a backtest and resample it: distributions and confidence
+    intervals of total return, max drawdown and Sharpe ratio.
+    """
+    try:
+        df = load_historical_data(symbol)
+        bt = Backtester()
+        result = bt.run(df, symbol=symbol)
+        return {"symbol": symbol, **monte_carlo(
+            result, source=source, paths=paths, block=block,
+            confidence=confidence, initial_capital=bt.initial_capital,
+        )}
+
+    except Exception as e:
+        return {"error": str(e)}
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from core.data.market_data import MarketData  # <-- you forgot this import
 from core.market.data_loader import load_price
+from core.utils.cache import quote_cache
 
 router = APIRouter()
 
@@ -15,3 +16,7 @@ def get_price(symbol: str = "BTC-EUR"):
 def get_historical(symbol: str = "BTC-EUR", interval: str = "1h"):
     df = market.get_historical_data(symbol, interval)
     return {"candles": df.to_dict(orient="records")}
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    return quote_cache.stats()
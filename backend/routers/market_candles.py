@@ -1,56 +1,72 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 import aiohttp
-from datetime import datetime, timedelta
+import asyncio
+
+from backend.schemas.market import CandlesOut
+from core.data.kline_parser import Candles, concat, parse_coinbase_candles
+from core.data.market_data import CoinbaseProvider, page_windows
+from core.utils.http_client import get_http_session
+from core.utils.time_utils import iso_utc, now_ts
 
 router = APIRouter()
 
 # Coinbase granularity options (in seconds)
 VALID_GRANULARITIES = [60, 300, 900, 3600, 21600, 86400]
 
+# Upper bound per request: at most 17 Coinbase pages of 300 candles
+MAX_CANDLES = 5000
+
+
+async def _fetch_window(
+    session: aiohttp.ClientSession,
+    symbol: str,
+    granularity: int,
+    window: tuple,
+) -> Candles:
+    first, last, _ = window
+
+    # Passed as params so the "+00:00" offsets are percent-encoded
+    params = {
+        "granularity": granularity,
+        "start": iso_utc(first),
+        "end": iso_utc(last),
+    }
+
+    await CoinbaseProvider.rate_limiter.acquire_async()
+    async with session.get(CoinbaseProvider.URL.format(symbol=symbol), params=params) as resp:
+        if resp.status != 200:
+            raise HTTPException(
+                status_code=resp.status,
+                detail=f"Coinbase error: {await resp.text()}"
+            )
 
-@router.get("/market/candles")
+        # Coinbase: [time, low, high, open, close, volume], parsed column-wise
+        return parse_coinbase_candles(await resp.read())
+
+
+# Encoded directly as a JSON Response; response_model documents its shape
+@router.get("/market/candles", response_model=CandlesOut)
 async def get_candles(
     symbol: str = Query(..., description="Trading pair, e.g. BTC-EUR"),
     granularity: int = Query(300, description="Candle size in seconds"),
-    limit: int = Query(200, description="Number of candles")
-):
+    limit: int = Query(200, ge=1, le=MAX_CANDLES, description="Number of candles"),
+    session: aiohttp.ClientSession = Depends(get_http_session),
+) -> Response:
     if granularity not in VALID_GRANULARITIES:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid granularity. Allowed: {VALID_GRANULARITIES}"
         )
 
-    end_time = datetime.utcnow()
-    start_time = end_time - timedelta(seconds=granularity * limit)
-
-    url = (
-        f"https://api.exchange.coinbase.com/products/{symbol}/candles"
-        f"?granularity={granularity}"
-        f"&start={start_time.isoformat()}"
-        f"&end={end_time.isoformat()}"
-    )
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                raise HTTPException(
-                    status_code=resp.status,
-                    detail=f"Coinbase error: {await resp.text()}"
-                )
-
-            raw = await resp.json()
-
-    # Coinbase returns: [time, low, high, open, close, volume]
-    candles = [
-        {
-            "timestamp": c[0],
-            "open": c[3],
-            "high": c[2],
-            "low": c[1],
-            "close": c[4],
-            "volume": c[5],
-        }
-        for c in raw
-    ]
-
-    return {"candles": candles}
+    # Coinbase caps each request at 300 candles: fetch windows concurrently
+    last_open = (now_ts() // granularity) * granularity
+    windows = page_windows(last_open, granularity, limit, CoinbaseProvider.PAGE_SIZE)
+
+    pages = await asyncio.gather(*[
+        _fetch_window(session, symbol, granularity, w) for w in windows
+    ])
+
+    # Merged ascending and de-duplicated, encoded without per-row dicts
+    candles = concat(pages).tail(limit)
+    records = candles.to_json_records(("timestamp", "open", "high", "low", "close", "volume"))
+    return Response(content=b'{"candles":' + records + b"}", media_type="application/json")
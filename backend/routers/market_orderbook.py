@@ -1,27 +1,51 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 import aiohttp
 
+from core.data.market_data import replay_market
+from core.market.order_book import order_books
+from core.utils.cache import quote_cache
+from core.utils.http_client import get_http_session
+
 router = APIRouter()
 
-@router.get("/orderbook")
-async def orderbook(symbol: str):
+
+async def _fetch_orderbook_top(session: aiohttp.ClientSession, symbol: str) -> dict:
     url = f"https://api.exchange.coinbase.com/products/{symbol}/book?level=1"
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=10) as resp:
-                if resp.status != 200:
-                    raise HTTPException(status_code=resp.status, detail="Coinbase error")
+    async with session.get(url) as resp:
+        if resp.status != 200:
+            raise HTTPException(status_code=resp.status, detail="Coinbase error")
+
+        data = await resp.json()
 
-                data = await resp.json()
+        return {
+            "best_bid": float(data["bids"][0][0]),
+            "best_ask": float(data["asks"][0][0]),
+        }
 
-                best_bid = float(data["bids"][0][0])
-                best_ask = float(data["asks"][0][0])
 
-                return {
-                    "best_bid": best_bid,
-                    "best_ask": best_ask,
-                }
+@router.get("/orderbook")
+async def orderbook(
+    symbol: str,
+    session: aiohttp.ClientSession = Depends(get_http_session),
+):
+    # Local L2 book when a depth feed keeps it fresh
+    book = order_books.fresh(symbol)
+    if book is not None:
+        best_bid, best_ask = book.top()
+        return {"best_bid": best_bid, "best_ask": best_ask}
+
+    replay = replay_market()
+
+    try:
+        if replay is not None:
+            best_bid, best_ask = replay.get_orderbook_top(symbol)
+            return {"best_bid": best_bid, "best_ask": best_ask}
+
+        return await quote_cache.aget_or_fetch(
+            ("orderbook", symbol),
+            lambda: _fetch_orderbook_top(session, symbol),
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,17 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
-from core.model.predictor import predict
+from core.model.model_registry import model_registry
+from core.model.predictor import cached_predict
+from core.model.screener import screen
+from core.utils.cache import prediction_cache
 import numpy as np
 
 router = APIRouter()
 
+# Upper bounds for /screen: candles loaded per symbol, symbols per request
+SCREEN_MAX_BARS = 5000
+SCREEN_MAX_SYMBOLS = 100
+
 
 def _to_json(obj):
     """
@@ -36,7 +43,7 @@ def predict_signal(symbol: str = "BTC-EUR", model: str = "baseline"):
     Ensures the response is JSON-serializable.
     """
     try:
-        raw = predict(symbol, model)
+        raw = cached_predict(symbol, model)
         safe = _to_json(raw)
         return JSONResponse(content=safe)
 
@@ -44,3 +51,42 @@ def predict_signal(symbol: str = "BTC-EUR", model: str = "baseline"):
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
 
+@router.get("/screen")
+def screen_symbols(
+    symbols: str = "",
+    model: str = "baseline",
+    granularity: int = 60,
+    limit: int = Query(200, ge=1, le=SCREEN_MAX_BARS, description="Candles per symbol"),
+    sort: str = "confidence",
+):
+    """
+    Signals for a whole watchlist in one pass, sorted by `sort`.
+    symbols: comma-separated; empty = SCREEN_SYMBOLS.
+    """
+    universe = [s.strip() for s in symbols.split(",") if s.strip()]
+    if len(universe) > SCREEN_MAX_SYMBOLS:
+        return JSONResponse(
+            content={"error": f"At most {SCREEN_MAX_SYMBOLS} symbols per request"}, status_code=422,
+        )
+
+    try:
+        return JSONResponse(content=screen(universe, model, granularity, limit, sort))
+
+    except Exception as e:
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+
+@router.get("/cache/stats")
+def prediction_cache_stats():
+    """
+    Hit rate, size and evictions of the prediction cache.
+    """
+    return prediction_cache.stats()
+
+
+@router.get("/registry")
+def registry():
+    """
+    Registered models, artifact versions and warm-instance cache stats.
+    """
+    return model_registry.stats()
@@ -0,0 +1,19 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class Candle(BaseModel):
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+class CandleWithVolume(Candle):
+    volume: float
+
+
+class CandlesOut(BaseModel):
+    candles: List[CandleWithVolume]
@@ -1,8 +1,10 @@
 import asyncio
+import math
 import aiohttp
 from datetime import datetime
 
 from backend.services.risk import RiskManager, DEFAULT_RISK_CONFIG
+from core.market.order_book import order_books
 
 
 class AsyncBotEngine:
@@ -119,6 +121,11 @@ class AsyncBotEngine:
 
     async def get_orderbook_top(self, symbol: str):
         """Return (best_bid, best_ask)."""
+        # Local L2 book when a feed keeps it fresh, REST otherwise
+        best_bid, best_ask = order_books.get_top(symbol)
+        if best_bid is not None and best_ask is not None:
+            return best_bid, best_ask
+
         try:
             async with self.session.get(f"http://localhost:8000/market/orderbook?symbol={symbol}") as resp:
                 data = await resp.json()
@@ -126,6 +133,17 @@ class AsyncBotEngine:
         except Exception:
             return (None, None)
 
+    async def estimate_slippage_pct(self, symbol: str, side: str, size_eur: float):
+        """
+        Expected slippage (%) of a market order, from the local L2 book.
+        None without a fresh book; inf when the book cannot fill the order.
+        """
+        book = order_books.fresh(symbol)
+        if book is None:
+            return None
+        slippage = book.slippage_pct("buy" if side == "buy" else "sell", notional=size_eur)
+        return math.inf if slippage is None else slippage
+
     # ---------------------------------------------------------
     # Prediction + price fetch
     # ---------------------------------------------------------
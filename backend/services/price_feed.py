@@ -1,4 +1,6 @@
-import requests
+from core.data.market_data import replay_market
+from core.utils.cache import quote_cache
+from core.utils.http_client import http_pool
 
 COINBASE_API_BASE = "https://api.exchange.coinbase.com"
 
@@ -9,14 +11,21 @@ def get_current_price(symbol: str) -> float:
 
     symbol: e.g. "BTC-EUR"
     Coinbase uses this format directly as product_id.
+    Served from the shared quote cache for a short TTL.
     """
     product_id = symbol  # "BTC-EUR"
 
-    url = f"{COINBASE_API_BASE}/products/{product_id}/ticker"
-    resp = requests.get(url, timeout=5)
-    resp.raise_for_status()
-    data = resp.json()
+    replay = replay_market()
+    if replay is not None:
+        return float(replay.get_ticker(product_id)["price"])
 
-    # "price" is the last traded price
-    return float(data["price"])
+    def fetch():
+        url = f"{COINBASE_API_BASE}/products/{product_id}/ticker"
+        resp = http_pool.get(url, timeout=5)
+        resp.raise_for_status()
+        data = resp.json()
 
+        # "price" is the last traded price
+        return float(data["price"])
+
+    return quote_cache.get_or_fetch(("ticker", product_id), fetch)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Protocol, Tuple
@@ -30,6 +31,9 @@ class MarketDataService(Protocol):
         """
         ...
 
+    # Optional: estimate_slippage_pct(symbol, side, size_eur) -> Optional[float]
+    # (None: no fresh book to estimate from; inf: the book cannot fill the order)
+
 
 # --- Risk configuration --- #
 
@@ -41,6 +45,7 @@ class RiskConfig:
     trade_cooldown_seconds: int
     min_signal_confidence: float
     max_spread_pct: float
+    max_slippage_pct: float = 0.0   # 0 disables the check
 
 
 # --- Risk manager --- #
@@ -103,6 +108,15 @@ class RiskManager:
             if spread_pct > self.config.max_spread_pct:
                 return False, "Spread too wide"
 
+        # 7) Expected slippage (needs a local order book)
+        estimate = getattr(self.market_data, "estimate_slippage_pct", None)
+        if self.config.max_slippage_pct > 0 and estimate is not None:
+            slippage_pct = await estimate(symbol, side, size_eur)
+            if slippage_pct is not None and math.isinf(slippage_pct):
+                return False, "Order book too thin for order size"
+            if slippage_pct is not None and slippage_pct > self.config.max_slippage_pct:
+                return False, "Expected slippage too high"
+
         return True, "OK"
 
 
@@ -115,4 +129,5 @@ DEFAULT_RISK_CONFIG = RiskConfig(
     trade_cooldown_seconds=300,  # 5 minutes
     min_signal_confidence=0.6,
     max_spread_pct=0.3,
+    max_slippage_pct=0.5,
 )
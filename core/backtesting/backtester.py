@@ -3,12 +3,24 @@ Backtester
 ----------
 Simulates trades over historical data using the AI model.
 Produces equity curve, trade log, and performance metrics.
+
+Two modes with identical results:
+- vectorized (default): features and signals are computed once over the
+  whole history; positions, PnL and equity come from array operations
+  and trades are emitted at the bars where the position changes.
+- loop: re-runs the feature pipeline on every prefix and steps the
+  position manager bar by bar. Used for custom sizers / position
+  managers and for a position manager that already holds state.
 """
 
+from bisect import bisect_left
+
+import numpy as np
 import pandas as pd
-from core.model.predictor import compute_features, generate_signal
+from core.model.feature_engineering import compute_indicators
+from core.model.predictor import RSI_HIGH, RSI_LOW, compute_features, generate_signal, signals_from_indicators
 from core.trading.trade_sizer import TradeSizer
-from core.trading.position_manager import PositionManager
+from core.trading.position_manager import Position, PositionManager, Trade
 from core.backtesting.metrics import (
     compute_total_return,
     compute_max_drawdown,
@@ -18,10 +30,35 @@ from core.backtesting.metrics import (
 )
 
 
+# Bars of history required before the first simulated step
+WARMUP_BARS = 50
+
+
+def _round_cents(values: np.ndarray) -> np.ndarray:
+    """
+    Python's round(v, 2) over an array. np.round agrees with it except
+    next to a half-cent tie, where values are re-rounded one by one.
+    """
+    rounded = np.round(values, 2)
+    scaled = np.abs(values) * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+
 class Backtester:
-    def __init__(self, initial_capital: float = 10000):
+    def __init__(
+        self,
+        initial_capital: float = 10000,
+        risk_pct: float = 2.0,
+        rsi_low: float = RSI_LOW,
+        rsi_high: float = RSI_HIGH,
+    ):
         self.initial_capital = initial_capital
-        self.trade_sizer = TradeSizer()
+        self.rsi_low = rsi_low
+        self.rsi_high = rsi_high
+        self.trade_sizer = TradeSizer(risk_pct)
         self.position_manager = PositionManager()
 
     # ---------------------------------------------------------
@@ -36,13 +73,28 @@ class Backtester:
             df["timestamp"] = df.index.astype(str)
         return df
 
-    # ---------------------------------------------------------
-    # Main Backtest Loop
-    # ---------------------------------------------------------
-    def run(self, df: pd.DataFrame, symbol: str = "UNKNOWN") -> dict:
+    def _can_vectorize(self) -> bool:
+        return (
+            type(self.trade_sizer) is TradeSizer
+            and type(self.position_manager) is PositionManager
+            and self.position_manager.position is None
+            and not self.position_manager.trades
+        )
+
+    def run(
+        self,
+        df: pd.DataFrame,
+        symbol: str = "UNKNOWN",
+        vectorized: bool = True,
+        indicators: dict = None,
+    ) -> dict:
         """
         Run a full backtest over the provided DataFrame.
 
+        `indicators` may hold compute_indicators() of df["close"], computed
+        once and shared between runs over the same history (vectorized
+        mode only).
+
         Returns:
             {
                 "metrics": {...},
@@ -52,19 +104,27 @@ class Backtester:
             }
         """
         df = self._prepare_dataframe(df)
+        if vectorized and self._can_vectorize():
+            return self._run_vectorized(df, symbol, indicators)
+        return self._run_loop(df, symbol)
+
+    # ---------------------------------------------------------
+    # Main Backtest Loop
+    # ---------------------------------------------------------
+    def _run_loop(self, df: pd.DataFrame, symbol: str) -> dict:
 
         capital = self.initial_capital
         equity_curve: list[float] = []
         results: list[dict] = []
 
         # Start after enough data exists for indicators
-        for i in range(50, len(df)):
+        for i in range(WARMUP_BARS, len(df)):
             window = df.iloc[:i].copy()
             row = df.iloc[i]
 
             # Feature engineering + signal generation
             features = compute_features(window)
-            signal, confidence = generate_signal(features)
+            signal, confidence = generate_signal(features, self.rsi_low, self.rsi_high)
 
             prediction = {
                 "signal": signal,
@@ -108,14 +168,130 @@ class Backtester:
                 "equity": equity,
             })
 
-        # -----------------------------------------------------
-        # Metrics
-        # -----------------------------------------------------
+        trades = [t.__dict__ for t in self.position_manager.trades]
+        return self._summarize(equity_curve, trades, results)
+
+    # ---------------------------------------------------------
+    # Vectorized Backtest
+    # ---------------------------------------------------------
+    def _run_vectorized(self, df: pd.DataFrame, symbol: str, indicators: dict = None) -> dict:
+        n = len(df)
+        steps = max(n - WARMUP_BARS, 0)
+        if steps == 0:
+            return self._summarize([], [], [])
+
+        # Row values exactly as df.iloc[i] yields them (common row dtype)
+        rows = df.to_numpy()
+        columns = list(df.columns)
+        timestamps = [str(v) for v in rows[WARMUP_BARS:, columns.index("timestamp")]]
+        price = np.array([float(v) for v in rows[WARMUP_BARS:, columns.index("close")]])
+
+        # Step i trades on the features of bars [0, i-1]
+        if indicators is None:
+            indicators = compute_indicators(df["close"].to_numpy(dtype=np.float64))
+        signal, confidence = signals_from_indicators(indicators, self.rsi_low, self.rsi_high)
+        signal = signal[WARMUP_BARS - 1:n - 1]
+        confidence = confidence[WARMUP_BARS - 1:n - 1]
+        direction = np.select([signal == "BUY", signal == "SELL"], [1, -1], default=0)
+
+        risk = self.trade_sizer.risk_pct / 100
+        signal_side = {1: "BUY", -1: "SELL"}
+        candidates = {
+            0: np.flatnonzero(direction != 0).tolist(),     # flat: any signal opens
+            1: np.flatnonzero(direction == -1).tolist(),    # long: SELL reverses
+            -1: np.flatnonzero(direction == 1).tolist(),    # short: BUY reverses
+        }
+
+        # Walk position changes only; capital moves only when one closes
+        capital = float(self.initial_capital)
+        side, entry, held = 0, 0.0, 0.0
+        events, trades = [], []
+        cursor = 0
+        while True:
+            pending = candidates[side]
+            k = bisect_left(pending, cursor)
+            if k == len(pending):
+                break
+            i = pending[k]
+            size = round(capital * risk * float(confidence[i]), 2)
+            cursor = i + 1
+            if size <= 0:
+                continue
+
+            realized = 0.0
+            if side != 0:
+                realized = (price[i] - entry) * held if side == 1 else (entry - price[i]) * held
+                capital += realized
+                trades.append(Trade(timestamps[i], symbol, "CLOSE", held, float(price[i]), pnl=realized))
+            side, entry, held = int(direction[i]), float(price[i]), size
+            trades.append(Trade(timestamps[i], symbol, signal_side[side], size, entry, pnl=0.0))
+            events.append((i, capital, realized, side, entry, held))
+
+        # Forward-fill the state after each event over the following bars
+        state = np.zeros((steps, 5))
+        state[:, 0] = self.initial_capital
+        realized_pnl = np.zeros(steps)
+        if events:
+            at = np.array([e[0] for e in events])
+            owner = np.searchsorted(at, np.arange(steps), side="right") - 1
+            values = np.array([e[1:] for e in events])
+            held_from = owner >= 0
+            state[held_from] = values[owner[held_from]]
+            realized_pnl[at] = values[:, 1]
+        capital_after = state[:, 0]
+        position = state[:, 2]
+        entry_price = state[:, 3]
+        held_size = state[:, 4]
+
+        unrealized = np.where(
+            position == 1,
+            (price - entry_price) * held_size,
+            np.where(position == -1, (entry_price - price) * held_size, 0.0),
+        )
+        equity = capital_after + unrealized
+
+        # Sizes are reported on every bar, from the capital before the step
+        capital_before = np.concatenate([[float(self.initial_capital)], capital_after[:-1]])
+        sizes = np.where(direction != 0, _round_cents(capital_before * risk * confidence), 0.0)
+
+        results = [
+            {
+                "timestamp": ts,
+                "price": p,
+                "signal": sig,
+                "confidence": conf,
+                "size": sz,
+                "capital": cap,
+                "unrealized_pnl": upnl,
+                "realized_pnl": rpnl,
+                "equity": eq,
+            }
+            for ts, p, sig, conf, sz, cap, upnl, rpnl, eq in zip(
+                timestamps, price.tolist(), signal.tolist(), confidence.tolist(), sizes.tolist(),
+                capital_after.tolist(), unrealized.tolist(), realized_pnl.tolist(), equity.tolist(),
+            )
+        ]
+
+        # Leave the position manager as the loop would
+        self.position_manager.trades.extend(trades)
+        if side != 0:
+            self.position_manager.position = Position(
+                symbol=symbol,
+                side="LONG" if side == 1 else "SHORT",
+                size=held,
+                entry_price=entry,
+                unrealized_pnl=float(unrealized[-1]),
+            )
+
+        return self._summarize(equity.tolist(), [t.__dict__ for t in trades], results)
+
+    # ---------------------------------------------------------
+    # Metrics
+    # ---------------------------------------------------------
+    def _summarize(self, equity_curve: list, trades: list, results: list) -> dict:
         equity_series = pd.Series(equity_curve)
         returns = equity_series.pct_change().fillna(0)
 
-        trades = [t.__dict__ for t in self.position_manager.trades]
-
         metrics = {
             "total_return": compute_total_return(equity_series),
             "max_drawdown": compute_max_drawdown(equity_series),
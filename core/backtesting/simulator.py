@@ -0,0 +1,511 @@
+"""
+Event-Driven Simulator
+----------------------
+Replays bars and ticks through a strategy with realistic order handling:
+market / limit / stop orders, fees, slippage and order latency.
+
+Market data arrives as one pre-merged, time-sorted stream (all symbols
+and feeds merged once with a stable sort; bars before ticks on equal
+times). A bar is an event at its close time (open time + bar length):
+the strategy sees its close only once it is known, so orders placed in
+on_bar can never fill on ticks inside the bar they were based on.
+Everything the simulation creates on the fly (order arrivals, fill reports, timers) goes through a
+heap keyed by (time, sequence). The dispatch loop takes whichever is
+next, queued events first on equal timestamps.
+
+Event objects use __slots__. The Bar / Tick handed to the strategy are
+reused between events (copy fields you want to keep), so replaying data
+allocates nothing per event.
+
+Fill rules:
+- bars: only orders that reached the book by the bar's open take part
+  (an order arriving mid-bar waits for the next bar); market orders
+  fill at the open; limit orders at the open if it
+  gapped through the limit, else at the limit when the bar's range
+  reaches it; stop orders trigger the same way and fill like market
+  orders (with slippage).
+- ticks: orders fill at the tick price once marketable / triggered.
+Fills settle cash and positions immediately; the strategy is notified
+through a FILL event after the latency model's delay.
+"""
+
+import heapq
+import itertools
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.metrics import compute_max_drawdown, compute_sharpe_ratio, compute_total_return
+
+# Event kinds
+BAR, TICK, ORDER, FILL, TIMER = range(5)
+
+# Order types
+MARKET, LIMIT, STOP = "market", "limit", "stop"
+
+INF = float("inf")
+
+
+# ---------------------------------------------------------
+# Events
+# ---------------------------------------------------------
+class Bar:
+    # time: close time (event time); start: open time
+    __slots__ = ("time", "start", "symbol", "open", "high", "low", "close", "volume")
+
+
+class Tick:
+    __slots__ = ("time", "symbol", "price", "size")
+
+
+class Order:
+    __slots__ = ("id", "symbol", "side", "qty", "type", "limit", "stop", "submitted", "arrived", "status")
+
+    def __init__(self, id, symbol, side, qty, type, limit, stop, submitted):
+        self.id = id
+        self.symbol = symbol
+        self.side = side            # +1 buy, -1 sell
+        self.qty = qty
+        self.type = type
+        self.limit = limit
+        self.stop = stop
+        self.submitted = submitted
+        self.arrived = None         # time the order reached the book
+        self.status = "pending"     # pending -> open -> filled / cancelled
+
+
+class Fill:
+    __slots__ = ("time", "order", "price", "qty", "fee")
+
+    def __init__(self, time, order, price, qty, fee):
+        self.time = time
+        self.order = order
+        self.price = price
+        self.qty = qty              # signed: > 0 bought, < 0 sold
+        self.fee = fee
+
+    def to_dict(self) -> dict:
+        return {
+            "time": self.time,
+            "order_id": self.order.id,
+            "symbol": self.order.symbol,
+            "side": "BUY" if self.qty > 0 else "SELL",
+            "type": self.order.type,
+            "price": self.price,
+            "qty": abs(self.qty),
+            "fee": self.fee,
+        }
+
+
+class Timer:
+    __slots__ = ("time", "name")
+
+    def __init__(self, time, name):
+        self.time = time
+        self.name = name
+
+
+# ---------------------------------------------------------
+# Cost models
+# ---------------------------------------------------------
+class PercentFee:
+    __slots__ = ("rate", "minimum")
+
+    def __init__(self, rate: float = 0.001, minimum: float = 0.0):
+        self.rate = rate
+        self.minimum = minimum
+
+    def __call__(self, price: float, qty: float) -> float:
+        return max(abs(price * qty) * self.rate, self.minimum)
+
+
+class BpsSlippage:
+    """
+    Market / stop fills move `bps` basis points against the order.
+    """
+    __slots__ = ("factor",)
+
+    def __init__(self, bps: float = 5.0):
+        self.factor = bps / 10_000
+
+    def __call__(self, price: float, side: int, qty: float) -> float:
+        return price * (1 + side * self.factor)
+
+
+class FixedLatency:
+    """
+    Delay (seconds) between submitting an order and the exchange
+    accepting it, and between a fill and its report to the strategy.
+    """
+    __slots__ = ("seconds",)
+
+    def __init__(self, seconds: float = 0.0):
+        self.seconds = seconds
+
+    def __call__(self, order: Order) -> float:
+        return self.seconds
+
+
+def _no_fee(price, qty):
+    return 0.0
+
+
+def _no_slippage(price, side, qty):
+    return price
+
+
+# ---------------------------------------------------------
+# Strategy interface
+# ---------------------------------------------------------
+class Strategy:
+    """
+    Override the callbacks you need; handlers left as defined here are
+    not called at all.
+    """
+
+    def on_start(self, sim: "Simulator"):
+        pass
+
+    def on_bar(self, sim: "Simulator", bar: Bar):
+        pass
+
+    def on_tick(self, sim: "Simulator", tick: Tick):
+        pass
+
+    def on_fill(self, sim: "Simulator", fill: Fill):
+        pass
+
+    def on_timer(self, sim: "Simulator", timer: Timer):
+        pass
+
+    def on_finish(self, sim: "Simulator"):
+        pass
+
+
+def _handler(strategy: Strategy, name: str):
+    method = getattr(type(strategy), name, None)
+    if method is None or method is getattr(Strategy, name):
+        return None
+    return getattr(strategy, name)
+
+
+# ---------------------------------------------------------
+# Simulator
+# ---------------------------------------------------------
+class Simulator:
+    def __init__(
+        self,
+        strategy: Strategy,
+        cash: float = 10000.0,
+        fee=None,
+        slippage=None,
+        latency=None,
+    ):
+        self.strategy = strategy
+        self.initial_cash = float(cash)
+        self.cash = float(cash)
+        self.fee = fee or _no_fee
+        self.slippage = slippage or _no_slippage
+        self.latency = latency
+
+        self.now = -INF
+        self.positions: Dict[str, float] = {}
+        self.last_price: Dict[str, float] = {}
+        self.fills: List[Fill] = []
+        self.fees = 0.0
+        self.events = 0
+        self.equity_times: List[float] = []
+        self.equity_curve: List[float] = []
+
+        self._feeds = []
+        self._queue = []
+        self._seq = itertools.count()
+        self._order_ids = itertools.count(1)
+        self._book: Dict[str, List[Order]] = {}
+
+    # ---------------------------------------------------------
+    # Market data
+    # ---------------------------------------------------------
+    def add_bars(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        time_column: str = "timestamp",
+        duration: Optional[float] = None,
+    ):
+        """
+        OHLCV bars; `time_column` (default timestamp) holds open times.
+        Each bar is dispatched at its close, open time + `duration`
+        seconds (default: the smallest step between consecutive bars).
+        """
+        n = len(df)
+        start = df[time_column].to_numpy(dtype=np.float64)
+        if duration is None:
+            steps = np.diff(start)
+            steps = steps[steps > 0]
+            duration = float(steps.min()) if len(steps) else 0.0
+        self._feeds.append((
+            BAR, symbol, start + duration,
+            [df[c].to_numpy(dtype=np.float64) if c in df else np.zeros(n)
+             for c in ("open", "high", "low", "close", "volume")] + [start],
+        ))
+
+    def add_ticks(self, symbol: str, times, prices, sizes=None):
+        prices = np.asarray(prices, dtype=np.float64)
+        sizes = np.zeros(len(prices)) if sizes is None else np.asarray(sizes, dtype=np.float64)
+        self._feeds.append((TICK, symbol, np.asarray(times, dtype=np.float64), [prices, sizes]))
+
+    def _merged_stream(self):
+        """
+        All feeds merged into one time-sorted stream of plain lists
+        (kind, symbol, time, f0 .. f5). On equal times bars come first (a
+        bar closing at t precedes ticks at t); otherwise ties keep feed
+        order.
+        """
+        if not self._feeds:
+            return [[]] * 9
+        times = np.concatenate([f[2] for f in self._feeds])
+        kinds = np.concatenate([np.full(len(f[2]), f[0], dtype=np.int8) for f in self._feeds])
+        order = np.lexsort((kinds, times))
+
+        symbols = np.concatenate([np.full(len(f[2]), i, dtype=np.int32) for i, f in enumerate(self._feeds)])
+        fields = []
+        for j in range(6):
+            fields.append(np.concatenate([
+                f[3][j] if j < len(f[3]) else np.zeros(len(f[2])) for f in self._feeds
+            ])[order].tolist())
+        names = [f[1] for f in self._feeds]
+        return [kinds[order].tolist(), [names[i] for i in symbols[order].tolist()], times[order].tolist()] + fields
+
+    # ---------------------------------------------------------
+    # Strategy API
+    # ---------------------------------------------------------
+    def _push(self, time: float, kind: int, event):
+        heapq.heappush(self._queue, (time, next(self._seq), kind, event))
+
+    def submit(
+        self,
+        symbol: str,
+        side: str,
+        qty: float,
+        type: str = MARKET,
+        limit: Optional[float] = None,
+        stop: Optional[float] = None,
+    ) -> Order:
+        """
+        Submit an order; it reaches the book after the latency delay.
+        side is "BUY" or "SELL".
+        """
+        if type == LIMIT and limit is None:
+            raise ValueError("Limit orders need a limit price")
+        if type == STOP and stop is None:
+            raise ValueError("Stop orders need a stop price")
+        order = Order(next(self._order_ids), symbol, 1 if side == "BUY" else -1, float(qty), type, limit, stop, self.now)
+        delay = self.latency(order) if self.latency else 0.0
+        self._push(self.now + delay, ORDER, order)
+        return order
+
+    def cancel(self, order: Order):
+        if order.status in ("pending", "open"):
+            order.status = "cancelled"
+
+    def schedule(self, time: float, name: str = "timer") -> Timer:
+        timer = Timer(time, name)
+        self._push(time, TIMER, timer)
+        return timer
+
+    def position(self, symbol: str) -> float:
+        return self.positions.get(symbol, 0.0)
+
+    def open_orders(self, symbol: str = None) -> List[Order]:
+        books = [self._book.get(symbol, [])] if symbol else self._book.values()
+        return [o for book in books for o in book if o.status == "open"]
+
+    def equity(self) -> float:
+        value = self.cash
+        for symbol, qty in self.positions.items():
+            if qty:
+                value += qty * self.last_price.get(symbol, 0.0)
+        return value
+
+    # ---------------------------------------------------------
+    # Matching
+    # ---------------------------------------------------------
+    def _fill(self, order: Order, price: float):
+        qty = order.side * order.qty
+        fee = self.fee(price, order.qty)
+        self.cash -= qty * price + fee
+        self.fees += fee
+        self.positions[order.symbol] = self.positions.get(order.symbol, 0.0) + qty
+        order.status = "filled"
+
+        fill = Fill(self.now, order, price, qty, fee)
+        self.fills.append(fill)
+        delay = self.latency(order) if self.latency else 0.0
+        self._push(self.now + delay, FILL, fill)
+
+    def _match_price(self, order: Order, open_: float, high: float, low: float) -> Optional[float]:
+        """
+        Fill price of `order` within a price range that starts at
+        `open_` (a tick is a range with open = high = low), or None.
+        """
+        side = order.side
+        if order.type == MARKET:
+            return self.slippage(open_, side, order.qty)
+        if order.type == LIMIT:
+            limit = order.limit
+            if side > 0:
+                return open_ if open_ <= limit else (limit if low <= limit else None)
+            return open_ if open_ >= limit else (limit if high >= limit else None)
+        stop = order.stop
+        if side > 0:
+            trigger = open_ if open_ >= stop else (stop if high >= stop else None)
+        else:
+            trigger = open_ if open_ <= stop else (stop if low <= stop else None)
+        return None if trigger is None else self.slippage(trigger, side, order.qty)
+
+    def _match(self, book: List[Order], open_: float, high: float, low: float, start: float) -> List[Order]:
+        """
+        Match open orders against a price range that starts at time
+        `start`; orders that arrived after it wait for the next range.
+        """
+        remaining = []
+        for order in book:
+            if order.status != "open":
+                continue
+            if order.arrived > start:
+                remaining.append(order)
+                continue
+            price = self._match_price(order, open_, high, low)
+            if price is None:
+                remaining.append(order)
+            else:
+                self._fill(order, price)
+        return remaining
+
+    # ---------------------------------------------------------
+    # Event loop
+    # ---------------------------------------------------------
+    def run(self) -> dict:
+        strategy = self.strategy
+        on_bar = _handler(strategy, "on_bar")
+        on_tick = _handler(strategy, "on_tick")
+        on_fill = _handler(strategy, "on_fill")
+        on_timer = _handler(strategy, "on_timer")
+
+        kinds, symbols, times, f0, f1, f2, f3, f4, f5 = self._merged_stream()
+        n = len(times)
+        queue = self._queue
+        pop = heapq.heappop
+        book = self._book
+        last_price = self.last_price
+        equity_times = self.equity_times
+        equity_curve = self.equity_curve
+
+        bar = Bar()
+        tick = Tick()
+
+        strategy.on_start(self)
+        i = 0
+        events = 0
+        while True:
+            if queue and (i >= n or queue[0][0] <= times[i]):
+                t, _, kind, event = pop(queue)
+                self.now = t
+                events += 1
+                if kind == ORDER:
+                    if event.status == "pending":
+                        event.status = "open"
+                        event.arrived = t
+                        book.setdefault(event.symbol, []).append(event)
+                elif kind == FILL:
+                    if on_fill:
+                        on_fill(self, event)
+                elif on_timer:
+                    on_timer(self, event)
+                continue
+
+            if i >= n:
+                break
+
+            t = times[i]
+            symbol = symbols[i]
+            self.now = t
+            events += 1
+
+            if kinds[i] == TICK:
+                price = f0[i]
+                last_price[symbol] = price
+                orders = book.get(symbol)
+                if orders:
+                    book[symbol] = self._match(orders, price, price, price, t)
+                if on_tick:
+                    tick.time, tick.symbol, tick.price, tick.size = t, symbol, price, f1[i]
+                    on_tick(self, tick)
+            else:
+                orders = book.get(symbol)
+                if orders:
+                    book[symbol] = self._match(orders, f0[i], f1[i], f2[i], f5[i])
+                last_price[symbol] = f3[i]
+                equity_times.append(t)
+                equity_curve.append(self.equity())
+                if on_bar:
+                    bar.time, bar.start, bar.symbol = t, f5[i], symbol
+                    bar.open, bar.high, bar.low, bar.close, bar.volume = f0[i], f1[i], f2[i], f3[i], f4[i]
+                    on_bar(self, bar)
+            i += 1
+
+        self.events += events
+        strategy.on_finish(self)
+        return self.summary()
+
+    def summary(self) -> dict:
+        equity = pd.Series(self.equity_curve, dtype=np.float64)
+        returns = equity.pct_change().fillna(0)
+        return {
+            "events": self.events,
+            "final_equity": self.equity(),
+            "cash": self.cash,
+            "positions": dict(self.positions),
+            "fees": self.fees,
+            "fills": [f.to_dict() for f in self.fills],
+            "equity_curve": self.equity_curve,
+            "equity_times": self.equity_times,
+            "metrics": {
+                "total_return": compute_total_return(equity),
+                "max_drawdown": compute_max_drawdown(equity),
+                "sharpe_ratio": compute_sharpe_ratio(returns),
+            },
+        }
+
+
+# ---------------------------------------------------------
+# Model signals as a strategy
+# ---------------------------------------------------------
+class SignalStrategy(Strategy):
+    """
+    Trades generate_signal() on bar closes: a BUY / SELL signal targets a
+    long / short position of `qty`; HOLD keeps the current position.
+    Orders are market orders, so they fill at the next bar's open (or the
+    first tick after the close).
+    """
+
+    def __init__(self, df: pd.DataFrame, symbol: str, qty: float = 1.0, time_column: str = "timestamp"):
+        from core.model.feature_engineering import compute_indicators
+        from core.model.predictor import signals_from_indicators
+
+        signal, _ = signals_from_indicators(compute_indicators(df["close"].to_numpy(dtype=np.float64)))
+        direction = np.select([signal == "BUY", signal == "SELL"], [1.0, -1.0], default=np.nan)
+        self.target = dict(zip(df[time_column].to_numpy(dtype=np.float64).tolist(), (direction * qty).tolist()))
+        self.symbol = symbol
+        self.current = 0.0
+
+    def on_bar(self, sim: Simulator, bar: Bar):
+        target = self.target.get(bar.start)
+        if bar.symbol != self.symbol or target is None or target != target:   # NaN = HOLD
+            return
+        if target != self.current:
+            delta = target - self.current
+            sim.submit(self.symbol, "BUY" if delta > 0 else "SELL", abs(delta))
+            self.current = target
@@ -0,0 +1,144 @@
+"""
+Parameter Sweep
+---------------
+Runs the backtester over many parameter configurations: a full grid or
+a random search space.
+
+The candle frame is placed in shared memory once; configurations are
+sent to the process pool in chunks, and each chunk attaches the frame
+and computes indicators once for all of its configurations (only the
+signal thresholds and sizing differ between them). Metrics are streamed
+back as chunks complete and collected into one results table.
+
+Sweepable parameters are the Backtester arguments: initial_capital,
+risk_pct, rsi_low, rsi_high.
+"""
+
+import itertools
+import math
+import os
+import random
+from concurrent.futures import as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.backtester import Backtester
+from core.model.feature_engineering import compute_indicators
+from core.model.parallel import BACKTEST_POOL_WORKERS, get_pool
+from core.utils.shared_arrays import SharedFrame, attach_frame
+
+# Configurations per pool task: amortizes attaching the frame and the
+# indicator pass over many cheap backtests
+SWEEP_CHUNK = 64
+
+# Upper bound on configurations per sweep request (grid size or samples)
+SWEEP_MAX_CONFIGS = int(os.getenv("SWEEP_MAX_CONFIGS", "5000"))
+
+
+# ---------------------------------------------------------
+# Search spaces
+# ---------------------------------------------------------
+def grid(space: Dict[str, Sequence]) -> List[dict]:
+    """
+    Every combination of the listed values:
+    grid({"rsi_low": [25, 30], "risk_pct": [1, 2]}) -> 4 configs.
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def grid_size(space: Dict[str, Sequence]) -> int:
+    """
+    Number of configurations grid(space) yields, without building them.
+    """
+    return math.prod(len(values) for values in space.values())
+
+
+def random_search(space: Dict[str, object], samples: int, seed: Optional[int] = None) -> List[dict]:
+    """
+    `samples` random configurations. A (low, high) tuple is sampled
+    uniformly; a list is sampled from its values.
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(samples):
+        config = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                config[name] = rng.uniform(*values)
+            else:
+                config[name] = rng.choice(list(values))
+        configs.append(config)
+    return configs
+
+
+# ---------------------------------------------------------
+# Backtests
+# ---------------------------------------------------------
+def _backtest_configs(df: pd.DataFrame, symbol: str, configs: List[dict], indicators: dict = None) -> List[dict]:
+    if indicators is None:
+        indicators = compute_indicators(df["close"].to_numpy(dtype=np.float64))
+    rows = []
+    for config in configs:
+        try:
+            result = Backtester(**config).run(df, symbol, indicators=indicators)
+            rows.append({**config, **result["metrics"], "trades": len(result["trades"])})
+        except Exception as e:
+            rows.append({**config, "error": str(e)})
+    return rows
+
+
+def _sweep_task(descriptor, symbol: str, configs: List[dict]) -> List[dict]:
+    shm, df = attach_frame(descriptor)
+    try:
+        return _backtest_configs(df, symbol, configs)
+    finally:
+        del df
+        shm.close()
+
+
+def iter_sweep(
+    df: pd.DataFrame,
+    configs: Iterable[dict],
+    symbol: str = "UNKNOWN",
+    parallel: bool = True,
+    chunk_size: int = SWEEP_CHUNK,
+) -> Iterator[dict]:
+    """
+    Yield one metrics row per configuration as results come in (not in
+    submission order when parallel).
+    """
+    configs = list(configs)
+    chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+
+    if not parallel or BACKTEST_POOL_WORKERS <= 1 or len(chunks) <= 1:
+        indicators = compute_indicators(df["close"].to_numpy(dtype=np.float64))
+        for chunk in chunks:
+            yield from _backtest_configs(df, symbol, chunk, indicators)
+        return
+
+    pool = get_pool("backtest")
+    with SharedFrame(df) as frame:
+        descriptor = frame.descriptor()
+        futures = [pool.submit(_sweep_task, descriptor, symbol, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    configs: Iterable[dict],
+    symbol: str = "UNKNOWN",
+    sort_by: str = "sharpe_ratio",
+    parallel: bool = True,
+) -> pd.DataFrame:
+    """
+    Results table with one row per configuration (parameters, metrics
+    and trade count), best `sort_by` first.
+    """
+    table = pd.DataFrame(list(iter_sweep(df, configs, symbol, parallel)))
+    if sort_by in table.columns:
+        table = table.sort_values(sort_by, ascending=False, na_position="last").reset_index(drop=True)
+    return table
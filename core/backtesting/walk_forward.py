@@ -0,0 +1,179 @@
+"""
+Walk-Forward Optimization
+-------------------------
+Splits a long history into train / test folds (rolling or expanding),
+picks the best parameter configuration on each train fold and evaluates
+it out of sample on the following test fold.
+
+Indicators are computed once over the whole history and sliced per
+fold; they are causal, so a fold never sees bars after its end. For the
+pool, candles and indicator columns share one shared-memory block and
+each fold runs as one task. The result stitches the test-fold equity
+curves into one out-of-sample curve.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.backtester import WARMUP_BARS, Backtester
+from core.backtesting.metrics import compute_max_drawdown, compute_sharpe_ratio, compute_total_return
+from core.backtesting.sweep import _backtest_configs
+from core.model.feature_engineering import compute_indicators
+from core.model.parallel import BACKTEST_POOL_WORKERS, get_pool
+from core.utils.shared_arrays import SharedFrame, attach_frame
+
+# Indicator columns travel next to the candles in the shared frame
+_PREFIX = "ind:"
+
+
+# ---------------------------------------------------------
+# Folds
+# ---------------------------------------------------------
+def make_folds(n: int, train: int, test: int, step: int = None, expanding: bool = False) -> List[dict]:
+    """
+    Bar ranges [start, end) of consecutive folds. Test windows follow
+    their train window and advance by `step` (default: `test`, so test
+    windows tile the history). Expanding folds keep the train start at 0.
+    """
+    step = step or test
+    folds = []
+    start = 0
+    while start + train + test <= n:
+        train_start = 0 if expanding else start
+        folds.append({
+            "fold": len(folds),
+            "train": (train_start, start + train),
+            "test": (start + train, start + train + test),
+        })
+        start += step
+    return folds
+
+
+def _window(df: pd.DataFrame, indicators: Dict[str, np.ndarray], start: int, end: int):
+    """
+    Bars [start, end) plus up to WARMUP_BARS before them, which the
+    backtester skips: trading covers [start, end), except in a window
+    starting within WARMUP_BARS of the history's first bar, which only
+    trades from bar WARMUP_BARS on.
+    """
+    lo = max(0, start - WARMUP_BARS)
+    return df.iloc[lo:end].reset_index(drop=True), {k: v[lo:end] for k, v in indicators.items()}
+
+
+def _run_fold(
+    df: pd.DataFrame,
+    indicators: Dict[str, np.ndarray],
+    fold: dict,
+    configs: List[dict],
+    symbol: str,
+    objective: str,
+) -> dict:
+    train_df, train_ind = _window(df, indicators, *fold["train"])
+    rows = [r for r in _backtest_configs(train_df, symbol, configs, train_ind) if "error" not in r]
+    if not rows:
+        return {**fold, "error": "no configuration could be evaluated on the train fold"}
+
+    best = max(rows, key=lambda r: r[objective] if r[objective] == r[objective] else -np.inf)
+    params = {k: best[k] for k in configs[0]}
+
+    test_df, test_ind = _window(df, indicators, *fold["test"])
+    bt = Backtester(**params)
+    result = bt.run(test_df, symbol, indicators=test_ind)
+
+    return {
+        **fold,
+        "params": params,
+        "train_" + objective: best[objective],
+        "test_metrics": result["metrics"],
+        "trades": len(result["trades"]),
+        "timestamps": [r["timestamp"] for r in result["results"]],
+        # Fold return path relative to its starting capital
+        "growth": [e / bt.initial_capital for e in result["equity_curve"]],
+    }
+
+
+def _fold_task(descriptor, fold: dict, configs: List[dict], symbol: str, objective: str) -> dict:
+    shm, frame = attach_frame(descriptor)
+    try:
+        indicators = {c[len(_PREFIX):]: frame[c].to_numpy() for c in frame.columns if c.startswith(_PREFIX)}
+        df = frame[[c for c in frame.columns if not c.startswith(_PREFIX)]]
+        return _run_fold(df, indicators, fold, configs, symbol, objective)
+    finally:
+        del frame
+        shm.close()
+
+
+# ---------------------------------------------------------
+# Driver
+# ---------------------------------------------------------
+def walk_forward(
+    df: pd.DataFrame,
+    configs: Sequence[dict],
+    train: int,
+    test: int,
+    step: int = None,
+    expanding: bool = False,
+    symbol: str = "UNKNOWN",
+    objective: str = "sharpe_ratio",
+    initial_capital: float = 10000,
+    parallel: bool = True,
+) -> dict:
+    """
+    Optimize `configs` (Backtester arguments, e.g. from sweep.grid) on
+    every train fold and evaluate the winner on its test fold.
+
+    Returns per-fold parameters and out-of-sample metrics, and the test
+    folds' equity stitched into one curve starting at initial_capital.
+    """
+    configs = list(configs)
+    if not configs:
+        raise ValueError("No parameter configurations given")
+    folds = make_folds(len(df), train, test, step, expanding)
+    if not folds:
+        raise ValueError(f"History of {len(df)} bars is too short for train={train}, test={test}")
+
+    df = df.reset_index(drop=True)
+    indicators = compute_indicators(df["close"].to_numpy(dtype=np.float64))
+
+    if not parallel or BACKTEST_POOL_WORKERS <= 1 or len(folds) <= 1:
+        results = [_run_fold(df, indicators, fold, configs, symbol, objective) for fold in folds]
+    else:
+        shared = df.assign(**{_PREFIX + k: v for k, v in indicators.items()})
+        with SharedFrame(shared) as frame:
+            descriptor = frame.descriptor()
+            futures = [get_pool("backtest").submit(_fold_task, descriptor, fold, configs, symbol, objective) for fold in folds]
+            results = [future.result() for future in futures]
+
+    return _stitch(results, objective, initial_capital)
+
+
+def _stitch(results: List[dict], objective: str, initial_capital: float) -> dict:
+    """
+    Chain the test folds: each fold's growth path is scaled to the
+    capital the previous fold ended with.
+    """
+    capital = float(initial_capital)
+    equity, timestamps, folds = [], [], []
+    for result in results:
+        growth = result.pop("growth", [])
+        timestamps.extend(result.pop("timestamps", []))
+        equity.extend(capital * g for g in growth)
+        if growth:
+            capital *= growth[-1]
+        folds.append(result)
+
+    curve = pd.Series(equity, dtype=np.float64)
+    returns = curve.pct_change().fillna(0)
+    return {
+        "objective": objective,
+        "folds": folds,
+        "equity_curve": equity,
+        "timestamps": timestamps,
+        "metrics": {
+            "total_return": compute_total_return(curve),
+            "max_drawdown": compute_max_drawdown(curve),
+            "sharpe_ratio": compute_sharpe_ratio(returns),
+        },
+    }
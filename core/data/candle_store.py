@@ -0,0 +1,191 @@
+"""
+Candle Store
+------------
+Persistent, columnar OHLCV store keyed by (symbol, interval).
+
+Each column lives in its own flat binary file that is appended to in place
+and read back through a NumPy memory map, so repeat loads are local reads
+and history is no longer limited to the last exchange window.
+
+Layout:
+    <root>/<symbol>/<interval>/timestamp.i8
+    <root>/<symbol>/<interval>/open.f8
+    ...
+"""
+
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+CANDLE_STORE_DIR = os.getenv("CANDLE_STORE_DIR", "data/candles")
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+DTYPES = {
+    "timestamp": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+}
+
+
+class CandleStore:
+    def __init__(self, root: str = CANDLE_STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # Paths
+    # ---------------------------------------------------------
+    def _dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol.upper(), interval)
+
+    def _path(self, symbol: str, interval: str, column: str) -> str:
+        suffix = "i8" if column == "timestamp" else "f8"
+        return os.path.join(self._dir(symbol, interval), f"{column}.{suffix}")
+
+    # ---------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------
+    def count(self, symbol: str, interval: str) -> int:
+        """
+        Number of complete rows stored. A column that is longer than the
+        others (interrupted append) is ignored past the common length.
+        """
+        sizes = []
+        for col in COLUMNS:
+            path = self._path(symbol, interval, col)
+            if not os.path.exists(path):
+                return 0
+            sizes.append(os.path.getsize(path) // 8)
+        return min(sizes)
+
+    def _column(self, symbol: str, interval: str, column: str, rows: int) -> np.ndarray:
+        return np.memmap(
+            self._path(symbol, interval, column),
+            dtype=DTYPES[column],
+            mode="r",
+            shape=(rows,),
+        )
+
+    def first_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        rows = self.count(symbol, interval)
+        if rows == 0:
+            return None
+        return int(self._column(symbol, interval, "timestamp", rows)[0])
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        rows = self.count(symbol, interval)
+        if rows == 0:
+            return None
+        return int(self._column(symbol, interval, "timestamp", rows)[-1])
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        limit: Optional[int] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Read stored candles, oldest first.
+
+        start / end are inclusive epoch seconds; limit keeps the newest rows.
+        Holds the store lock, so a concurrent prepend() (which replaces the
+        column files one by one) never yields misaligned columns.
+        """
+        with self._lock:
+            rows = self.count(symbol, interval)
+            if rows == 0:
+                return pd.DataFrame({col: np.array([], dtype=DTYPES[col]) for col in COLUMNS})
+
+            ts = self._column(symbol, interval, "timestamp", rows)
+            lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+            hi = rows if end is None else int(np.searchsorted(ts, end, side="right"))
+            if limit is not None:
+                lo = max(lo, hi - limit)
+
+            return pd.DataFrame({
+                col: np.array(self._column(symbol, interval, col, rows)[lo:hi])
+                for col in COLUMNS
+            })
+
+    # ---------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------
+    def append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        Append candles newer than the last stored timestamp.
+        Returns the number of rows written.
+        """
+        if df is None or df.empty:
+            return 0
+
+        with self._lock:
+            return self._append_unlocked(symbol, interval, df)
+
+    def _append_unlocked(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        rows = self.count(symbol, interval)
+        last = self.last_timestamp(symbol, interval)
+
+        new = df.sort_values("timestamp").drop_duplicates("timestamp", keep="last")
+        if last is not None:
+            new = new[new["timestamp"] > last]
+        if new.empty:
+            return 0
+
+        os.makedirs(self._dir(symbol, interval), exist_ok=True)
+        for col in COLUMNS:
+            path = self._path(symbol, interval, col)
+            values = new[col].to_numpy(dtype=DTYPES[col]) if col in new else \
+                np.zeros(len(new), dtype=DTYPES[col])
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # Drop any partial tail left by an interrupted append
+                f.truncate(rows * 8)
+                f.seek(rows * 8)
+                f.write(values.tobytes())
+
+        return len(new)
+
+    def prepend(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        Backfill candles older than the first stored timestamp. Unlike
+        append() this rewrites every column file (each swapped in with
+        os.replace), so it is meant for one-off history backfills.
+        Returns the number of rows written.
+        """
+        if df is None or df.empty:
+            return 0
+
+        with self._lock:
+            rows = self.count(symbol, interval)
+            if rows == 0:
+                return self._append_unlocked(symbol, interval, df)
+            first = self.first_timestamp(symbol, interval)
+
+            new = df.sort_values("timestamp").drop_duplicates("timestamp", keep="last")
+            new = new[new["timestamp"] < first]
+            if new.empty:
+                return 0
+
+            for col in COLUMNS:
+                path = self._path(symbol, interval, col)
+                values = new[col].to_numpy(dtype=DTYPES[col]) if col in new else \
+                    np.zeros(len(new), dtype=DTYPES[col])
+                stored = np.fromfile(path, dtype=DTYPES[col], count=rows)
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(values.tobytes())
+                    f.write(stored.tobytes())
+                os.replace(tmp, path)
+
+            return len(new)
+
+
+# Shared instance
+candle_store = CandleStore()
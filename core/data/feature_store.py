@@ -0,0 +1,310 @@
+"""
+Feature Store
+-------------
+Persistent, columnar store of computed indicators keyed by
+(symbol, interval, feature_set_version), one row per closed candle.
+
+Rows are derived from the candle store: update() computes only the bars
+closed since the last stored row, continuing the EMA recursion from the
+stored values, so indicators are computed once per bar for every user,
+model and endpoint, and survive restarts. Stored rows equal
+compute_indicators() over the full stored candle history.
+
+Writes never run on a request path: schedule_update() hands them to one
+background thread, and an exclusive file lock per (symbol, interval)
+serializes writers across processes (API workers, model pool workers).
+
+Layout (same flat-file + memmap scheme as the candle store):
+    <root>/<symbol>/<interval>/<version>/timestamp.i8
+    <root>/<symbol>/<interval>/<version>/rsi.f8
+    ...
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.data.candle_store import CandleStore, candle_store
+from core.model.feature_engineering import (
+    FEATURE_SET_VERSION,
+    ROLLING_BARS,
+    STORED_INDICATORS,
+    extend_indicators,
+)
+from core.utils.time_utils import INTERVAL_SECONDS, now_ts
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "data/features")
+
+COLUMNS = ["timestamp"] + STORED_INDICATORS
+
+
+def _lock_file(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        return
+    # msvcrt.LK_LOCK gives up after ~10 s; writers can take longer
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FeatureStore:
+    def __init__(
+        self,
+        root: str = FEATURE_STORE_DIR,
+        candles: CandleStore = candle_store,
+        version: str = FEATURE_SET_VERSION,
+    ):
+        self.root = root
+        self.candles = candles
+        self.version = version
+        self._lock = threading.Lock()
+        # (symbol, interval) -> {column: read-only memmap}; a read only
+        # checks the file sizes and reuses the maps while they match
+        self._maps: Dict[tuple, Dict[str, np.ndarray]] = {}
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="features")
+        # (symbol, interval) -> reset first, for updates not yet started
+        self._pending: Dict[tuple, bool] = {}
+        self._pending_lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # Paths
+    # ---------------------------------------------------------
+    def _dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol.upper(), interval, self.version)
+
+    def _path(self, symbol: str, interval: str, column: str) -> str:
+        suffix = "i8" if column == "timestamp" else "f8"
+        return os.path.join(self._dir(symbol, interval), f"{column}.{suffix}")
+
+    @contextmanager
+    def _write_lock(self, symbol: str, interval: str):
+        """
+        Exclusive writer lock: the thread lock within this process, a
+        file lock across processes.
+        """
+        with self._lock:
+            os.makedirs(self._dir(symbol, interval), exist_ok=True)
+            with open(os.path.join(self._dir(symbol, interval), ".lock"), "wb") as f:
+                _lock_file(f)
+                try:
+                    yield
+                finally:
+                    _unlock_file(f)
+
+    # ---------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------
+    def count(self, symbol: str, interval: str) -> int:
+        """
+        Number of complete rows stored (see CandleStore.count).
+        """
+        sizes = []
+        for col in COLUMNS:
+            path = self._path(symbol, interval, col)
+            if not os.path.exists(path):
+                return 0
+            sizes.append(os.path.getsize(path) // 8)
+        return min(sizes)
+
+    def _column(self, symbol: str, interval: str, column: str, rows: int) -> np.ndarray:
+        return np.memmap(
+            self._path(symbol, interval, column),
+            dtype=np.int64 if column == "timestamp" else np.float64,
+            mode="r",
+            shape=(rows,),
+        )
+
+    def _open(self, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+        """
+        Cached memmaps, reopened whenever the row count on disk differs
+        from the cached length (rows appended or reset by another process).
+        """
+        key = (symbol.upper(), interval)
+        rows = self.count(symbol, interval)
+        maps = self._maps.get(key)
+        if maps is None or len(maps.get("timestamp", ())) != rows:
+            maps = {col: self._column(symbol, interval, col, rows) for col in COLUMNS} if rows else {}
+            self._maps[key] = maps
+        return maps
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        maps = self._open(symbol, interval)
+        if not maps:
+            return None
+        return int(maps["timestamp"][-1])
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        limit: Optional[int] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        update: bool = True,
+    ) -> dict:
+        """
+        Stored indicator arrays (keys: timestamp + STORED_INDICATORS),
+        oldest first, after bringing the store up to date with the candle
+        store. start / end are inclusive epoch seconds; limit keeps the
+        newest rows.
+        """
+        if update:
+            self.update(symbol, interval)
+
+        maps = self._open(symbol, interval)
+        if not maps:
+            return {col: np.array([], dtype=np.int64 if col == "timestamp" else np.float64) for col in COLUMNS}
+
+        ts = maps["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="right"))
+        if limit is not None:
+            lo = max(lo, hi - limit)
+
+        return {col: np.array(values[lo:hi]) for col, values in maps.items()}
+
+    def latest(self, symbol: str, interval: str, update: bool = True) -> dict:
+        """
+        The most recent stored row (empty arrays when nothing is stored).
+        """
+        return self.read(symbol, interval, limit=1, update=update)
+
+    def for_frame(self, symbol: str, interval: str, df: pd.DataFrame) -> Optional[dict]:
+        """
+        Stored indicators aligned row-for-row with `df`, or None unless
+        `df` is the stored candle history from its first row on: the EMA
+        recursions of stored rows start at the first stored candle, so
+        only then do they equal compute_indicators(df). Callers compute
+        the indicators themselves otherwise. Never writes.
+        """
+        if df.empty or "timestamp" not in df.columns:
+            return None
+        ts = df["timestamp"].to_numpy(dtype=np.int64)
+        maps = self._open(symbol, interval)
+        if not maps or int(maps["timestamp"][0]) != ts[0]:
+            return None
+        ind = self.read(symbol, interval, start=int(ts[0]), end=int(ts[-1]), update=False)
+        if not np.array_equal(ind["timestamp"], ts):
+            return None
+        if not np.array_equal(ind["close"], df["close"].to_numpy(dtype=np.float64)):
+            return None
+        return ind
+
+    # ---------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------
+    def reset(self, symbol: str, interval: str) -> None:
+        """
+        Drop the stored rows; the next update() recomputes them over the
+        whole candle history (needed after older candles were backfilled).
+        """
+        with self._write_lock(symbol, interval):
+            for col in COLUMNS:
+                path = self._path(symbol, interval, col)
+                if os.path.exists(path):
+                    os.remove(path)
+            self._maps.pop((symbol.upper(), interval), None)
+
+    def schedule_update(self, symbol: str, interval: str, reset: bool = False) -> None:
+        """
+        Run update() (after reset() when `reset`) on the background
+        writer; a (symbol, interval) already waiting there is not queued
+        twice.
+        """
+        key = (symbol.upper(), interval)
+        with self._pending_lock:
+            queued = key in self._pending
+            self._pending[key] = self._pending.get(key, False) or reset
+            if queued:
+                return
+
+        def run():
+            with self._pending_lock:
+                reset = self._pending.pop(key)
+            try:
+                if reset:
+                    self.reset(symbol, interval)
+                self.update(symbol, interval)
+            except Exception as e:
+                print(">>> Feature store update failed:", symbol, interval, "error:", e)
+
+        self._writer.submit(run)
+
+    def flush(self) -> None:
+        """
+        Wait until every scheduled update has been written.
+        """
+        self._writer.submit(lambda: None).result()
+
+    def update(self, symbol: str, interval: str) -> int:
+        """
+        Compute and append rows for candles stored since the last row.
+        Returns the number of rows written.
+        """
+        last = self.last_timestamp(symbol, interval)
+        step = INTERVAL_SECONDS.get(interval)
+        # The bar after `last` has not closed yet: nothing new can be stored
+        if last is not None and step and last + 2 * step > now_ts():
+            return 0
+
+        candle_last = self.candles.last_timestamp(symbol, interval)
+        if candle_last is None or (last is not None and candle_last <= last):
+            return 0
+
+        with self._write_lock(symbol, interval):
+            # Re-read from disk: another process may have appended
+            rows = self.count(symbol, interval)
+            last = int(self._column(symbol, interval, "timestamp", rows)[-1]) if rows else None
+
+            new = self.candles.read(symbol, interval, start=None if last is None else last + 1)
+            if new.empty:
+                return 0
+
+            previous = None
+            context = np.array([])
+            if rows:
+                tail = {col: self._column(symbol, interval, col, rows) for col in ("close", "ema12", "ema26", "macd_signal")}
+                previous = {k: float(v[-1]) for k, v in tail.items() if k != "close"}
+                context = np.array(tail["close"][-ROLLING_BARS:])
+
+            ind = extend_indicators(context, new["close"].to_numpy(dtype=np.float64), previous)
+            ind["timestamp"] = new["timestamp"].to_numpy(dtype=np.int64)
+
+            for col in COLUMNS:
+                values = ind[col].astype(np.int64 if col == "timestamp" else np.float64)
+                path = self._path(symbol, interval, col)
+                with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                    # Drop any partial tail left by an interrupted update
+                    f.truncate(rows * 8)
+                    f.seek(rows * 8)
+                    f.write(values.tobytes())
+
+            self._maps.pop((symbol.upper(), interval), None)
+            return len(new)
+
+
+# Shared instance
+feature_store = FeatureStore()
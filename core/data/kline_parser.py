@@ -0,0 +1,219 @@
+"""
+Kline Parser
+------------
+Decodes exchange candle payloads straight into typed NumPy columns.
+
+Payloads are decoded with orjson when available (falls back to json), and
+the numeric fields are converted column-wise into preallocated
+int64 / float64 arrays, without building a DataFrame or per-row dicts.
+The resulting Candles container can be handed to pandas, serialized
+column-wise, or written out as JSON records in one C-level call.
+"""
+
+import json
+from typing import Any, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+    _loads = json.loads
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class Candles:
+    """
+    Columnar candle container: one int64 timestamp column (epoch seconds)
+    and float64 OHLCV columns of equal length.
+    """
+
+    __slots__ = ("timestamp", "open", "high", "low", "close", "volume")
+
+    def __init__(self, timestamp, open, high, low, close, volume=None):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = (
+            np.zeros(len(self.timestamp)) if volume is None
+            else np.asarray(volume, dtype=np.float64)
+        )
+
+    @classmethod
+    def empty(cls) -> "Candles":
+        return cls(*(np.empty(0) for _ in range(6)))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Candles":
+        return cls(
+            df["timestamp"], df["open"], df["high"], df["low"], df["close"],
+            df["volume"] if "volume" in df.columns else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def sorted(self) -> "Candles":
+        """
+        Ascending by timestamp, dropping duplicate timestamps.
+        """
+        ts, idx = np.unique(self.timestamp, return_index=True)
+        if len(idx) == len(self) and np.all(idx[:-1] < idx[1:]):
+            return self
+        return Candles(ts, *(getattr(self, f)[idx] for f in FIELDS))
+
+    def _slice(self, sl: slice) -> "Candles":
+        return Candles(*(getattr(self, f)[sl] for f in ("timestamp",) + FIELDS))
+
+    def tail(self, n: int) -> "Candles":
+        return self._slice(slice(max(len(self) - n, 0), None))
+
+    def until(self, ts: int) -> "Candles":
+        """
+        Candles that opened at or before `ts`.
+        """
+        return self._slice(slice(None, int(np.searchsorted(self.timestamp, ts, side="right"))))
+
+    # ---------------------------------------------------------
+    # Output
+    # ---------------------------------------------------------
+    def to_columns(self, fields=("timestamp",) + FIELDS) -> dict:
+        return {f: getattr(self, f) for f in fields}
+
+    def to_frame(self, fields=("timestamp", "open", "high", "low", "close")) -> pd.DataFrame:
+        return pd.DataFrame(self.to_columns(fields), copy=False)
+
+    def to_records(self, fields=("timestamp", "open", "high", "low", "close")) -> list:
+        columns = [getattr(self, f).tolist() for f in fields]
+        return [dict(zip(fields, row)) for row in zip(*columns)]
+
+    def to_json_records(self, fields=("timestamp", "open", "high", "low", "close")) -> bytes:
+        """
+        JSON array of {field: value} objects, encoded in one C-level pass.
+        """
+        return self.to_frame(fields).to_json(orient="records", double_precision=15).encode()
+
+
+def concat(parts: list) -> Candles:
+    """
+    Merge candle pages into one ascending, de-duplicated container.
+    """
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return Candles.empty()
+    return Candles(*(
+        np.concatenate([getattr(p, f) for p in parts]) for f in ("timestamp",) + FIELDS
+    )).sorted()
+
+
+def _epoch_seconds(values: pd.Series) -> np.ndarray:
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        try:
+            return pd.to_numeric(values).to_numpy(dtype=np.int64)
+        except (TypeError, ValueError):
+            pass
+    dt = pd.to_datetime(values, utc=True).dt.tz_localize(None)
+    return dt.to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+
+def normalize_frame(df: pd.DataFrame) -> Candles:
+    """
+    Build Candles from a provider / model DataFrame in column operations:
+    the time column may be named time / timestamp / date (or be the
+    index) and hold datetimes, epochs or strings. Close-only frames get
+    open = previous close and high / low from open and close.
+    """
+    if not any(str(c).lower() in ("time", "timestamp", "date") for c in df.columns):
+        df = df.reset_index()
+    time_col = next((c for c in df.columns if str(c).lower() in ("time", "timestamp", "date")), None)
+    if time_col is None:
+        raise ValueError("No timestamp column found in market data")
+
+    ts = _epoch_seconds(df[time_col])
+    close = df["close"].to_numpy(dtype=np.float64)
+
+    if all(c in df.columns for c in ("open", "high", "low")):
+        open_ = df["open"].to_numpy(dtype=np.float64)
+        high = df["high"].to_numpy(dtype=np.float64)
+        low = df["low"].to_numpy(dtype=np.float64)
+    else:
+        open_ = np.r_[close[:1], close[:-1]]
+        high = np.maximum(open_, close)
+        low = np.minimum(open_, close)
+
+    volume = df["volume"] if "volume" in df.columns else None
+    return Candles(ts, open_, high, low, close, volume).sorted()
+
+
+# ---------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------
+def decode(payload: Union[bytes, str, list, dict]) -> Any:
+    if isinstance(payload, (bytes, bytearray, memoryview, str)):
+        return _loads(payload)
+    return payload
+
+
+def _clean(rows: list, width: int) -> list:
+    """
+    Drop malformed rows (wrong width or non-numeric fields).
+    """
+    good = []
+    for row in rows:
+        try:
+            if len(row) >= width:
+                [float(v) for v in row[:width]]
+                good.append(row[:width])
+        except (TypeError, ValueError):
+            continue
+    return good
+
+
+def _parse(rows: list, width: int, ts_col: int, cols: dict, ts_ms: bool) -> Candles:
+    if not rows:
+        return Candles.empty()
+
+    try:
+        block = np.array(rows, dtype=object)[:, :width].astype(np.float64)
+    except (TypeError, ValueError, IndexError):
+        rows = _clean(rows, width)
+        if not rows:
+            return Candles.empty()
+        block = np.array(rows, dtype=object).astype(np.float64)
+
+    ts = block[:, ts_col].astype(np.int64)
+    if ts_ms:
+        ts //= 1000
+
+    return Candles(ts, *(block[:, cols[f]] if f in cols else None for f in FIELDS)).sorted()
+
+
+def parse_binance_klines(payload) -> Candles:
+    """
+    Binance: [open_time_ms, open, high, low, close, volume, close_time_ms, ...]
+    """
+    return _parse(decode(payload), 6, 0, {"open": 1, "high": 2, "low": 3, "close": 4, "volume": 5}, True)
+
+
+def parse_coinbase_candles(payload) -> Candles:
+    """
+    Coinbase: [time, low, high, open, close, volume], newest first.
+    """
+    return _parse(decode(payload), 6, 0, {"low": 1, "high": 2, "open": 3, "close": 4, "volume": 5}, False)
+
+
+def parse_kraken_ohlc(payload) -> Candles:
+    """
+    Kraken: {"result": {<pair>: [[time, open, high, low, close, vwap, volume, count], ...], "last": ...}}
+    """
+    data = decode(payload)
+    result = data.get("result", {}) if isinstance(data, dict) else {}
+    rows = next((v for k, v in result.items() if k != "last"), [])
+    return _parse(rows, 7, 0, {"open": 1, "high": 2, "low": 3, "close": 4, "volume": 6}, False)
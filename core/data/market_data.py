@@ -1,16 +1,81 @@
-import requests
+import json
+import math
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+from core.data.candle_store import CandleStore, candle_store
+from core.data.kline_parser import (
+    Candles,
+    concat,
+    parse_binance_klines,
+    parse_coinbase_candles,
+    parse_kraken_ohlc,
+)
+from core.data.resample import StoreRollup, resample
+from core.utils.http_client import HttpClientPool, http_pool
+from core.utils.rate_limit import TokenBucket
+from core.utils.time_utils import INTERVAL_SECONDS, count_buckets, interval_seconds, iso_utc, now_ts, to_epoch
+
+MARKET_DATA_SOURCE = os.getenv("MARKET_DATA_SOURCE", "coinbase")
+
+# Replay captures: candles in CandleStore layout, plus optional
+# <root>/<SYMBOL>/book.jsonl level-1 snapshots
+REPLAY_DIR = os.getenv("REPLAY_DIR", "data/replay")
+REPLAY_SPEED = os.getenv("REPLAY_SPEED", "max")       # "max", "1" (real time), "10", ...
+REPLAY_START = os.getenv("REPLAY_START")              # epoch seconds / ISO; default: start of capture
+REPLAY_SPREAD_BPS = float(os.getenv("REPLAY_SPREAD_BPS", "1.0"))
+
 
 # ---------------------------------------------------------
 # Base Provider Interface
 # ---------------------------------------------------------
 class ExchangeProvider:
-    def get_ohlc(self, symbol: str, interval: str, limit: int = 200) -> pd.DataFrame:
+    def __init__(self, http: Optional[HttpClientPool] = None):
+        # Shared keep-alive pool unless one is injected
+        self.http = http or http_pool
+
+    def get_ohlc(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 200,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def get_ticker(self, symbol: str) -> dict:
+        raise NotImplementedError
+
+    def get_orderbook_top(self, symbol: str) -> tuple:
         raise NotImplementedError
 
 
+def page_windows(last_open: int, step: int, limit: int, page_size: int) -> list:
+    """
+    Split the `limit` candles ending at open time `last_open` into
+    provider-sized pages. Returns (first_open, last_open, count) per page,
+    newest page first. Times are in the same unit as `step`.
+    """
+    windows = []
+    for k in range(math.ceil(limit / page_size)):
+        count = min(page_size, limit - k * page_size)
+        page_end = last_open - k * page_size * step
+        windows.append((page_end - (count - 1) * step, page_end, count))
+    return windows
+
+
+def _last_open(step: int, end: Optional[int] = None) -> int:
+    """
+    Open time of the newest candle at or before `end` (default: now).
+    """
+    return ((now_ts() if end is None else end) // step) * step
+
+
 # ---------------------------------------------------------
 # Binance Provider
 # ---------------------------------------------------------
@@ -24,82 +89,78 @@ class BinanceProvider(ExchangeProvider):
         "1d": "1d",
     }
 
-    def get_ohlc(self, symbol: str, interval: str, limit: int = 200) -> pd.DataFrame:
+    URL = "https://api.binance.com/api/v3/klines"
+    PAGE_SIZE = 1000
+    MAX_CONCURRENCY = 8
+
+    # Request weight budget (Binance allows 6000 weight per minute per IP)
+    WEIGHT_PER_MINUTE = 6000
+    KLINES_WEIGHT = 2
+    rate_limiter = TokenBucket(rate=WEIGHT_PER_MINUTE / 60, capacity=WEIGHT_PER_MINUTE / 10)
+
+    def get_ohlc(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 200,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
         binance_symbol = symbol.replace("-", "")
 
-        url = "https://api.binance.com/api/v3/klines"
+        url = self.URL
         params = {
             "symbol": binance_symbol,
             "interval": self.INTERVAL_MAP.get(interval, "1m"),
             "limit": min(limit, 1000),
         }
+        if end is not None:
+            params["endTime"] = end * 1000
 
-        resp = requests.get(url, params=params)
+        resp = self.http.get(url, params=params)
         resp.raise_for_status()
-        data = resp.json()
 
-        df = pd.DataFrame(data, columns=[
-            "open_time", "open", "high", "low", "close", "volume",
-            "close_time", "qav", "num_trades", "taker_base",
-            "taker_quote", "ignore"
-        ])
+        return parse_binance_klines(resp.content).to_frame()
 
-        df["timestamp"] = df["open_time"] // 1000
-        df["open"] = df["open"].astype(float)
-        df["high"] = df["high"].astype(float)
-        df["low"] = df["low"].astype(float)
-        df["close"] = df["close"].astype(float)
+    def _fetch_page(self, params: dict) -> Candles:
+        self.rate_limiter.acquire(self.KLINES_WEIGHT)
+        resp = self.http.get(self.URL, params=params)
+        resp.raise_for_status()
+        return parse_binance_klines(resp.content)
 
-        return df[["timestamp", "open", "high", "low", "close"]]
+    def get_ohlc_paginated(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Fetch more than one page of klines.
 
-    def get_ohlc_paginated(self, symbol: str, interval: str, limit: int) -> pd.DataFrame:
+        Page time windows are computed up front from the interval and limit,
+        fetched concurrently under the shared weight budget, then merged
+        into one ascending, de-duplicated frame of at most `limit` rows.
+        """
         binance_symbol = symbol.replace("-", "")
-        url = "https://api.binance.com/api/v3/klines"
-
-        all_rows = []
-        remaining = limit
-        end_time = None
-
-        while remaining > 0:
-            batch = min(1000, remaining)
+        binance_interval = self.INTERVAL_MAP.get(interval, "1d")
+        step = interval_seconds(binance_interval)
 
-            params = {
+        pages = [
+            {
                 "symbol": binance_symbol,
-                "interval": self.INTERVAL_MAP.get(interval, "1d"),
-                "limit": batch,
+                "interval": binance_interval,
+                "startTime": first * 1000,
+                "endTime": last * 1000,
+                "limit": count,
             }
+            for first, last, count in page_windows(_last_open(step, end), step, limit, self.PAGE_SIZE)
+        ]
 
-            if end_time is not None:
-                params["endTime"] = end_time
+        workers = min(self.MAX_CONCURRENCY, len(pages))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self._fetch_page, pages))
 
-            resp = requests.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-
-            if not data:
-                break
-
-            all_rows.extend(data)
-
-            end_time = data[0][0] - 1
-            remaining -= batch
-
-        if not all_rows:
-            return pd.DataFrame(columns=["timestamp", "open", "high", "low", "close"])
-
-        df = pd.DataFrame(all_rows, columns=[
-            "open_time", "open", "high", "low", "close", "volume",
-            "close_time", "qav", "num_trades", "taker_base",
-            "taker_quote", "ignore"
-        ])
-
-        df["timestamp"] = df["open_time"] // 1000
-        df["open"] = df["open"].astype(float)
-        df["high"] = df["high"].astype(float)
-        df["low"] = df["low"].astype(float)
-        df["close"] = df["close"].astype(float)
-
-        return df[["timestamp", "open", "high", "low", "close"]]
+        return concat(results).tail(limit).to_frame()
 
 
 # ---------------------------------------------------------
@@ -115,23 +176,56 @@ class CoinbaseProvider(ExchangeProvider):
         "1d": 86400,
     }
 
-    def get_ohlc(self, symbol: str, interval: str, limit: int = 200) -> pd.DataFrame:
-        granularity = self.INTERVAL_MAP.get(interval, 60)
+    URL = "https://api.exchange.coinbase.com/products/{symbol}/candles"
+    PAGE_SIZE = 300
+    MAX_CONCURRENCY = 6
 
-        url = f"https://api.exchange.coinbase.com/products/{symbol}/candles"
-        params = {"granularity": granularity}
+    # Public endpoints allow ~10 requests per second per IP
+    rate_limiter = TokenBucket(rate=10, capacity=10)
 
-        resp = requests.get(url, params=params)
+    def _fetch_window(self, symbol: str, granularity: int, window: tuple) -> Candles:
+        first, last, _ = window
+        params = {
+            "granularity": granularity,
+            "start": iso_utc(first),
+            "end": iso_utc(last),
+        }
+        self.rate_limiter.acquire()
+        resp = self.http.get(self.URL.format(symbol=symbol), params=params)
         resp.raise_for_status()
-        data = resp.json()
-
-        df = pd.DataFrame(data, columns=[
-            "timestamp", "low", "high", "open", "close", "volume"
-        ])
-
-        df["timestamp"] = df["timestamp"].astype(int)
-
-        return df[["timestamp", "open", "high", "low", "close"]]
+        return parse_coinbase_candles(resp.content)
+
+    def get_candles(self, symbol: str, granularity: int, first: int, last: int) -> Candles:
+        """
+        Every candle with an open time in [first, last]. Ranges above one
+        Coinbase page (300 candles) are split into windows that are
+        fetched concurrently and stitched together.
+        """
+        if last < first:
+            return Candles.empty()
+        count = (last - first) // granularity + 1
+        windows = page_windows(last, granularity, count, self.PAGE_SIZE)
+
+        workers = min(self.MAX_CONCURRENCY, len(windows))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pages = list(pool.map(lambda w: self._fetch_window(symbol, granularity, w), windows))
+
+        return concat(pages)
+
+    def get_ohlc(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 200,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Fetch exactly `limit` candles ending at `end` (default: now).
+        """
+        granularity = self.INTERVAL_MAP.get(interval, 60)
+        last = _last_open(granularity, end)
+        first = last - (limit - 1) * granularity
+        return self.get_candles(symbol, granularity, first, last).tail(limit).to_frame()
 
 
 # ---------------------------------------------------------
@@ -147,51 +241,285 @@ class KrakenProvider(ExchangeProvider):
         "1d": 1440,
     }
 
-    def get_ohlc(self, symbol: str, interval: str, limit: int = 200) -> pd.DataFrame:
+    # Kraken only serves the most recent 720 candles per interval,
+    # whatever `since` is set to
+    MAX_CANDLES = 720
+
+    def get_ohlc(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 200,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Fetch up to `limit` candles ending at `end` (default: now), using
+        the `since` cursor so only the requested range is returned.
+        """
         kraken_symbol = symbol.replace("-", "")
+        minutes = self.INTERVAL_MAP.get(interval, 1)
+        step = minutes * 60
+
+        last_open = _last_open(step, end)
+        first_open = last_open - (min(limit, self.MAX_CANDLES) - 1) * step
 
         url = "https://api.kraken.com/0/public/OHLC"
         params = {
             "pair": kraken_symbol,
-            "interval": self.INTERVAL_MAP.get(interval, 1)
+            "interval": minutes,
+            # `since` is exclusive
+            "since": first_open - 1,
         }
 
-        resp = requests.get(url, params=params)
+        resp = self.http.get(url, params=params)
         resp.raise_for_status()
-        data = resp.json()
-
-        key = list(data["result"].keys())[0]
-        rows = data["result"][key]
 
-        df = pd.DataFrame(rows, columns=[
-            "timestamp", "open", "high", "low", "close",
-            "vwap", "volume", "count"
-        ])
+        return parse_kraken_ohlc(resp.content).until(last_open).tail(limit).to_frame()
 
-        df["timestamp"] = df["timestamp"].astype(int)
-        df["open"] = df["open"].astype(float)
-        df["high"] = df["high"].astype(float)
-        df["low"] = df["low"].astype(float)
-        df["close"] = df["close"].astype(float)
 
+# ---------------------------------------------------------
+# Replay Provider (offline, deterministic)
+# ---------------------------------------------------------
+class ReplayClock:
+    """
+    Simulated market time.
+
+    speed: 1.0 runs in real time, N > 1 accelerated by a factor N.
+           None ("as fast as possible") only moves when the consumer
+           calls advance() / seek(), so runs are fully deterministic.
+    end:   optional upper bound (the end of the capture); the clock stops
+           there instead of running past the recorded data.
+    """
+
+    def __init__(self, start: int, speed: Optional[float] = None, end: Optional[int] = None):
+        self.speed = speed
+        self.end = end
+        self._start = start
+        self._wall = time.monotonic()
+        self._lock = threading.Lock()
+
+    def now(self) -> int:
+        if not self.speed:
+            now = self._start
+        else:
+            now = int(self._start + (time.monotonic() - self._wall) * self.speed)
+        return now if self.end is None else min(now, self.end)
+
+    def finished(self) -> bool:
+        return self.end is not None and self.now() >= self.end
+
+    def seek(self, ts: int):
+        with self._lock:
+            self._start = int(ts) if self.end is None else min(int(ts), self.end)
+            self._wall = time.monotonic()
+
+    def advance(self, seconds: float):
+        with self._lock:
+            now = self.now() + int(seconds)
+            self._start = now if self.end is None else min(now, self.end)
+            self._wall = time.monotonic()
+
+
+def parse_replay_speed(value) -> Optional[float]:
+    if value is None or str(value).lower() in ("", "max", "0", "none"):
+        return None
+    return float(value)
+
+
+class ReplayProvider(ExchangeProvider):
+    """
+    Serves candles, tickers and level-1 books from recorded captures, with
+    no network access.
+
+    Layout under `root`:
+        <SYMBOL>/<interval>/*.i8|*.f8   candles (CandleStore format)
+        <SYMBOL>/book.jsonl             {"timestamp", "bids": [[p, s], ...], "asks": [...]}
+                                        or {"timestamp", "bid", "ask"} per line
+
+    Only candles that have closed by the replay clock are served. Without
+    a book capture, tickers are derived from the latest close with a fixed
+    spread of `spread_bps`.
+
+    The clock starts when the first recorded candle closes and stops at
+    the end of the capture. At speed None ("max") it moves one bar of the
+    finest recorded interval per candle request, so a bot polling for
+    candles walks through the capture bar by bar; seek() / advance() on
+    `clock` move it explicitly.
+    """
+
+    def __init__(
+        self,
+        root: str = REPLAY_DIR,
+        speed: Optional[float] = None,
+        start: Optional[int] = None,
+        spread_bps: float = REPLAY_SPREAD_BPS,
+    ):
+        super().__init__()
+        self.store = CandleStore(root)
+        self.root = root
+        self.spread_bps = spread_bps
+        self._books = {}
+
+        symbols = [d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d))] \
+            if os.path.isdir(root) else []
+        recorded = {
+            i for sym in symbols for i in os.listdir(os.path.join(root, sym))
+            if i in INTERVAL_SECONDS
+        }
+        self.INTERVAL_MAP = {i: i for i in INTERVAL_SECONDS if i in recorded}
+
+        counts = [(sym, i) for sym in symbols for i in self.INTERVAL_MAP if self.store.count(sym, i)]
+        # Bar step of the clock in "max" mode: the finest recorded interval
+        self.step = min((interval_seconds(i) for i in self.INTERVAL_MAP), default=60)
+
+        first = [self.store.first_timestamp(sym, i) + interval_seconds(i) for sym, i in counts]
+        ends = [self.store.last_timestamp(sym, i) + interval_seconds(i) for sym, i in counts]
+        if start is None:
+            # Default: the beginning of the capture (first closed candle)
+            start = min(first) if first else now_ts()
+        self.clock = ReplayClock(int(start), speed, end=max(ends) if ends else None)
+
+    # ---------------------------------------------------------
+    # Candles
+    # ---------------------------------------------------------
+    def get_ohlc(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 200,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        df = self._read(symbol, interval, limit, end)
+        if not self.clock.speed:
+            # The consumer has seen this bar: move on to the next one
+            self.clock.advance(self.step)
+        return df
+
+    def _read(self, symbol: str, interval: str, limit: int, end: Optional[int] = None) -> pd.DataFrame:
+        step = interval_seconds(interval)
+        # Newest candle that has closed by the replay clock
+        last_open = self.clock.now() // step * step - step
+        if end is not None:
+            last_open = min(last_open, _last_open(step, end))
+
+        df = self.store.read(symbol, interval, limit=limit, end=last_open)
         return df[["timestamp", "open", "high", "low", "close"]]
 
+    def _last_close(self, symbol: str) -> Optional[float]:
+        for interval in self.INTERVAL_MAP:
+            df = self._read(symbol, interval, limit=1)
+            if not df.empty:
+                return float(df["close"].iloc[-1])
+        return None
+
+    # ---------------------------------------------------------
+    # Books / tickers
+    # ---------------------------------------------------------
+    def _load_book(self, symbol: str) -> Optional[dict]:
+        if symbol in self._books:
+            return self._books[symbol]
+
+        path = os.path.join(self.root, symbol, "book.jsonl")
+        book = None
+        if os.path.exists(path):
+            rows = []
+            with open(path, "r") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    snap = json.loads(line)
+                    bid = snap["bids"][0] if "bids" in snap else (snap["bid"], snap.get("bid_size", 0.0))
+                    ask = snap["asks"][0] if "asks" in snap else (snap["ask"], snap.get("ask_size", 0.0))
+                    rows.append((to_epoch(snap["timestamp"]), *map(float, bid[:2]), *map(float, ask[:2])))
+            if rows:
+                arr = np.array(sorted(rows), dtype=np.float64)
+                book = {
+                    "timestamp": arr[:, 0].astype(np.int64),
+                    "bid": arr[:, 1], "bid_size": arr[:, 2],
+                    "ask": arr[:, 3], "ask_size": arr[:, 4],
+                }
+
+        self._books[symbol] = book
+        return book
+
+    def get_book(self, symbol: str) -> dict:
+        """
+        Level-1 book as of the replay clock.
+        """
+        now = self.clock.now()
+        book = self._load_book(symbol)
+        if book is not None:
+            i = int(np.searchsorted(book["timestamp"], now, side="right")) - 1
+            if i >= 0:
+                return {
+                    "timestamp": int(book["timestamp"][i]),
+                    "bids": [[float(book["bid"][i]), float(book["bid_size"][i])]],
+                    "asks": [[float(book["ask"][i]), float(book["ask_size"][i])]],
+                }
+
+        price = self._last_close(symbol)
+        if price is None:
+            raise ValueError(f"No replay data for {symbol}")
+        half = price * self.spread_bps / 20000
+        return {"timestamp": now, "bids": [[price - half, 0.0]], "asks": [[price + half, 0.0]]}
+
+    def get_orderbook_top(self, symbol: str) -> tuple:
+        book = self.get_book(symbol)
+        return book["bids"][0][0], book["asks"][0][0]
+
+    def get_ticker(self, symbol: str) -> dict:
+        book = self.get_book(symbol)
+        bid, ask = book["bids"][0][0], book["asks"][0][0]
+        price = self._last_close(symbol)
+        return {
+            "symbol": symbol,
+            "price": price if price is not None else (bid + ask) / 2,
+            "bid": bid,
+            "ask": ask,
+            "timestamp": self.clock.now(),
+        }
+
 
 # ---------------------------------------------------------
 # Main MarketData Orchestrator
 # ---------------------------------------------------------
+# Rollups over the Coinbase 1m candles the candle loader stores
+_coinbase_rollups = StoreRollup(candle_store)
+
+
 class MarketData:
-    def __init__(self, source: str = "coinbase"):
+    def __init__(
+        self,
+        source: Optional[str] = None,
+        http: Optional[HttpClientPool] = None,
+        rollups: Optional[StoreRollup] = None,
+    ):
+        self.http = http or http_pool
+        source = source or MARKET_DATA_SOURCE
+
         providers = {
-            "binance": BinanceProvider(),
-            "coinbase": CoinbaseProvider(),
-            "kraken": KrakenProvider(),
+            "binance": lambda: BinanceProvider(self.http),
+            "coinbase": lambda: CoinbaseProvider(self.http),
+            "kraken": lambda: KrakenProvider(self.http),
+            "replay": lambda: ReplayProvider(
+                speed=parse_replay_speed(REPLAY_SPEED),
+                start=to_epoch(REPLAY_START),
+            ),
         }
 
         if source not in providers:
             raise ValueError(f"Unknown market data source: {source}")
 
-        self.provider = providers[source]
+        self.source = source
+        self.provider = providers[source]()
+        # Stored 1m bars only stand in for the exchange they came from
+        self.rollups = rollups or (_coinbase_rollups if source == "coinbase" else None)
+
+    def get_ticker(self, symbol: str) -> dict:
+        return self.provider.get_ticker(symbol)
+
+    def get_orderbook_top(self, symbol: str) -> tuple:
+        return self.provider.get_orderbook_top(symbol)
 
     def get_historical_data(
         self,
@@ -201,9 +529,76 @@ class MarketData:
         end: Optional[str] = None,
         limit: int = 200,
     ) -> pd.DataFrame:
-
-        # Force Binance for long-range daily data
-        if interval == "1d" and limit > 1000:
-            return BinanceProvider().get_ohlc_paginated(symbol, interval, limit)
-
-        return self.provider.get_ohlc(symbol, interval, limit)
+        """
+        Candles for [start, end], or the `limit` candles ending at `end`
+        (default: now). start / end accept epoch seconds or ISO strings.
+        """
+        end_ts = to_epoch(end)
+        start_ts = to_epoch(start)
+
+        if start_ts is not None:
+            if end_ts is None:
+                end_ts = now_ts()
+            limit = count_buckets(start_ts, end_ts, interval)
+
+        if interval not in self.provider.INTERVAL_MAP:
+            return self._get_rolled_up(symbol, interval, limit, end_ts)
+
+        return self._fetch(symbol, interval, limit, end_ts)
+
+    def _fetch(self, symbol: str, interval: str, limit: int, end: Optional[int]) -> pd.DataFrame:
+        if isinstance(self.provider, BinanceProvider) and limit > BinanceProvider.PAGE_SIZE:
+            return self.provider.get_ohlc_paginated(symbol, interval, limit, end=end)
+
+        cap = getattr(self.provider, "MAX_CANDLES", None)
+        if cap is not None and limit > cap:
+            raise ValueError(
+                f"{self.source} serves at most {cap} {interval} candles, {limit} requested"
+            )
+
+        return self.provider.get_ohlc(symbol, interval, limit, end=end)
+
+    def _get_rolled_up(self, symbol: str, interval: str, limit: int, end: Optional[int]) -> pd.DataFrame:
+        """
+        Serve an interval the provider does not offer (e.g. 4h on Coinbase,
+        6h on Binance) from the stored 1m bars when they cover the request;
+        otherwise by rolling up the largest native interval that divides it.
+        """
+        if self.rollups is not None:
+            df = self.rollups.read(symbol, interval, limit, end)
+            if df is not None:
+                return df
+
+        target = 31 * 86400 if interval == "1M" else interval_seconds(interval)
+        bases = [
+            i for i in self.provider.INTERVAL_MAP
+            if target % interval_seconds(i) == 0 or (interval == "1M" and i == "1d")
+        ]
+        if not bases:
+            raise ValueError(f"Interval {interval} not available from this provider")
+
+        base = max(bases, key=interval_seconds)
+        ratio = target // interval_seconds(base)
+
+        # One extra bucket so the oldest returned bar is complete
+        df = self._fetch(symbol, base, (limit + 1) * ratio, end)
+        return resample(df, interval, base=base).tail(limit).reset_index(drop=True)
+
+
+# Shared replay market, built on first use when MARKET_DATA_SOURCE=replay
+_replay_market: Optional[MarketData] = None
+_replay_lock = threading.Lock()
+
+
+def replay_market() -> Optional[MarketData]:
+    """
+    The process-wide replay MarketData (one clock for every code path),
+    or None when running against live exchanges.
+    """
+    global _replay_market
+    if MARKET_DATA_SOURCE != "replay":
+        return None
+    with _replay_lock:
+        if _replay_market is None:
+            _replay_market = MarketData("replay")
+    return _replay_market
@@ -0,0 +1,238 @@
+"""
+Resampling
+----------
+Derives higher-interval bars (5m / 15m / 1h / 4h / 6h / 1d ...) from base
+bars with vectorized NumPy reductions, either in one batch (resample) or
+incrementally as new base bars arrive (RollupBuilder). StoreRollup
+serves any interval from the 1m bars of a candle store that way.
+
+One base fetch can then serve every chart timeframe, and any interval
+works on any provider.
+"""
+
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.data.candle_store import CandleStore
+from core.utils.time_utils import bucket_end, bucket_start, bucket_starts, interval_seconds, now_ts, shift_bucket
+
+ROLLUP_INTERVALS = ("5m", "15m", "1h", "4h", "6h", "1d")
+OHLCV = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# Closed rollup bars kept per (symbol, interval) by StoreRollup
+ROLLUP_CACHE_BARS = 5000
+
+
+def _columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    cols = {"timestamp": df["timestamp"].to_numpy(dtype=np.int64)}
+    for c in OHLCV[1:]:
+        if c in df.columns:
+            cols[c] = df[c].to_numpy(dtype=np.float64)
+    return cols
+
+
+def _reduce(cols: Dict[str, np.ndarray], interval: str) -> Dict[str, np.ndarray]:
+    ts = cols["timestamp"]
+    buckets = bucket_starts(ts, interval)
+
+    # First row of each bucket (input is sorted by timestamp)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    lasts = np.r_[starts[1:], len(ts)] - 1
+
+    out = {
+        "timestamp": buckets[starts],
+        "open": cols["open"][starts],
+        "high": np.maximum.reduceat(cols["high"], starts),
+        "low": np.minimum.reduceat(cols["low"], starts),
+        "close": cols["close"][lasts],
+    }
+    if "volume" in cols:
+        out["volume"] = np.add.reduceat(cols["volume"], starts)
+
+    # Timestamp of the last base bar in each bucket, for completeness checks
+    out["_last"] = ts[lasts]
+    return out
+
+
+def resample(
+    df: pd.DataFrame,
+    interval: str,
+    base: str = "1m",
+    complete_only: bool = False,
+) -> pd.DataFrame:
+    """
+    Roll base bars (ascending, OHLC[V]) up to `interval`.
+
+    With complete_only, a trailing bucket whose base bars do not yet reach
+    the end of the interval is dropped.
+    """
+    columns = [c for c in OHLCV if c in df.columns]
+    if df.empty:
+        return df[columns].iloc[0:0].reset_index(drop=True)
+
+    if not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp")
+    out = _reduce(_columns(df), interval)
+
+    if complete_only:
+        step = interval_seconds(base)
+        if out["_last"][-1] + step < bucket_end(int(out["timestamp"][-1]), interval):
+            out = {k: v[:-1] for k, v in out.items()}
+
+    return pd.DataFrame({c: out[c] for c in columns})
+
+
+class RollupBuilder:
+    """
+    Incrementally maintains higher-interval bars from a stream of base
+    bars. update() returns the bars that closed; the still-open bar of
+    each interval is kept as partial state.
+    """
+
+    def __init__(
+        self,
+        intervals: Iterable[str] = ROLLUP_INTERVALS,
+        base: str = "1m",
+        store: Optional[CandleStore] = None,
+        symbol: Optional[str] = None,
+    ):
+        if store is not None and symbol is None:
+            raise ValueError("symbol is required when persisting rollups")
+
+        self.intervals = tuple(intervals)
+        self.base = base
+        self.base_seconds = interval_seconds(base)
+        self.store = store
+        self.symbol = symbol
+        self._partial: Dict[str, Optional[dict]] = {i: None for i in self.intervals}
+
+    def current(self, interval: str) -> Optional[dict]:
+        return self._partial[interval]
+
+    def update(self, bars: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Feed new base bars (ascending, newer than anything seen before).
+        Returns the closed bars, only for intervals where a bar closed.
+        """
+        if bars.empty:
+            return {}
+
+        if not bars["timestamp"].is_monotonic_increasing:
+            bars = bars.sort_values("timestamp")
+        cols = _columns(bars)
+        cols.setdefault("volume", np.zeros(len(bars)))
+
+        closed_by_interval = {}
+        for interval in self.intervals:
+            out = _reduce(cols, interval)
+
+            partial = self._partial[interval]
+            if partial is not None:
+                if out["timestamp"][0] == partial["timestamp"]:
+                    out["open"][0] = partial["open"]
+                    out["high"][0] = max(out["high"][0], partial["high"])
+                    out["low"][0] = min(out["low"][0], partial["low"])
+                    out["volume"][0] += partial["volume"]
+                else:
+                    out = {k: np.r_[partial[k], v] for k, v in out.items()}
+
+            # Every bucket but the newest is complete; the newest only once
+            # its last base bar reaches the end of the interval
+            last_ts = int(out["timestamp"][-1])
+            if out["_last"][-1] + self.base_seconds >= bucket_end(last_ts, interval):
+                self._partial[interval] = None
+                n_closed = len(out["timestamp"])
+            else:
+                self._partial[interval] = {k: v[-1].item() for k, v in out.items()}
+                n_closed = len(out["timestamp"]) - 1
+
+            if n_closed == 0:
+                continue
+
+            frame = pd.DataFrame({k: out[k][:n_closed] for k in OHLCV})
+            if self.store is not None:
+                self.store.append(self.symbol, interval, frame)
+            closed_by_interval[interval] = frame
+
+        return closed_by_interval
+
+
+class StoreRollup:
+    """
+    Higher-interval bars built from the base bars of a candle store.
+
+    The first request for a (symbol, interval) rolls up the stored range
+    once; later requests feed only the base bars stored since into a
+    RollupBuilder, so every base bar is reduced once. read() returns None
+    when the store does not cover the request (history older than the
+    first stored bar, or a store that is not up to date), and callers
+    fetch from the exchange instead.
+    """
+
+    def __init__(self, store: CandleStore, base: str = "1m", max_bars: int = ROLLUP_CACHE_BARS):
+        self.store = store
+        self.base = base
+        self.base_seconds = interval_seconds(base)
+        self.max_bars = max_bars
+        self._state: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def read(self, symbol: str, interval: str, limit: int, end: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        The newest `limit` bars opening at or before `end` (default: now);
+        the last one is still open when its interval has not ended.
+        """
+        first_stored = self.store.first_timestamp(symbol, self.base)
+        last_stored = self.store.last_timestamp(symbol, self.base)
+        if first_stored is None:
+            return None
+
+        # Newest base bar the request covers; the one still open is never stored
+        now = now_ts()
+        step = self.base_seconds
+        needed = (now if end is None else min(end, now)) // step * step
+        if needed + step > now:
+            needed -= step
+        if last_stored < needed:
+            return None
+        first = shift_bucket(bucket_start(needed, interval), interval, -(limit - 1))
+        if first_stored > first:
+            return None
+
+        if end is not None:
+            df = self.store.read(symbol, self.base, start=first, end=needed)
+            return resample(df, interval, base=self.base).tail(limit).reset_index(drop=True)
+
+        with self._lock:
+            return self._incremental(symbol, interval, limit, first)
+
+    def _incremental(self, symbol: str, interval: str, limit: int, first: int) -> pd.DataFrame:
+        key = (symbol.upper(), interval)
+        state = self._state.get(key)
+        if state is None or state["first"] > first:
+            state = {
+                "builder": RollupBuilder([interval], self.base),
+                "closed": pd.DataFrame(columns=OHLCV),
+                "first": first,
+                "fed": first - self.base_seconds,
+            }
+            self._state[key] = state
+
+        new = self.store.read(symbol, self.base, start=state["fed"] + self.base_seconds)
+        if not new.empty:
+            closed = state["builder"].update(new).get(interval)
+            if closed is not None:
+                keep = max(self.max_bars, limit)
+                frame = closed if state["closed"].empty else pd.concat([state["closed"], closed])
+                state["closed"] = frame.tail(keep).reset_index(drop=True)
+                state["first"] = max(state["first"], int(state["closed"]["timestamp"].iloc[0]))
+            state["fed"] = int(new["timestamp"].iloc[-1])
+
+        df = state["closed"]
+        partial = state["builder"].current(interval)
+        if partial is not None:
+            df = pd.concat([df, pd.DataFrame([{k: partial[k] for k in OHLCV}])], ignore_index=True)
+        return df.tail(limit).reset_index(drop=True)
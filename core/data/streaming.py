@@ -0,0 +1,368 @@
+"""
+Streaming Bars
+--------------
+Builds live OHLCV bars from a trade stream, for every interval at once.
+
+- TradeSource: pluggable async iterator of trades
+    * BinanceTradeSource: exchange websocket (production)
+    * FileReplaySource:   recorded trades from a CSV/JSONL file (tests, replay)
+- BarAggregator: rolling bars for one symbol; O(1) work per trade per interval
+- StreamIngestor: drives a source through per-symbol aggregators and
+  publishes "bar closed" events to subscribers (and optionally the
+  candle store), replacing repeated HTTP candle downloads. A bar closes
+  on the first trade after its interval or, on quiet symbols, when the
+  source clock passes its end (plus STREAM_FLUSH_GRACE for late trades).
+
+start_stream() runs the ingestor for STREAM_SYMBOLS at API startup.
+"""
+
+import asyncio
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+import aiohttp
+import pandas as pd
+
+from core.data.candle_store import CandleStore
+from core.utils.http_client import http_pool
+from core.utils.time_utils import ALL_INTERVALS, bucket_end, bucket_start
+
+STREAM_SYMBOLS = [s for s in os.getenv("STREAM_SYMBOLS", "").split(",") if s]
+STREAM_DIR = os.getenv("STREAM_DIR", "data/stream")
+# Seconds a bar stays open past its interval for trades still in flight
+STREAM_FLUSH_GRACE = float(os.getenv("STREAM_FLUSH_GRACE", "2"))
+
+
+# ---------------------------------------------------------
+# Events
+# ---------------------------------------------------------
+@dataclass(slots=True)
+class Trade:
+    symbol: str
+    timestamp: float     # epoch seconds
+    price: float
+    size: float
+
+
+@dataclass(slots=True)
+class Bar:
+    symbol: str
+    interval: str
+    timestamp: int       # open time, epoch seconds
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    trades: int
+    closed: bool = False
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# ---------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------
+class _BarState:
+    __slots__ = ("interval", "open_time", "close_time", "bar")
+
+    def __init__(self, interval: str):
+        self.interval = interval
+        self.open_time = None
+        self.close_time = None
+        self.bar: Optional[Bar] = None
+
+
+class BarAggregator:
+    def __init__(self, symbol: str, intervals: Iterable[str] = ALL_INTERVALS):
+        self.symbol = symbol
+        self._states = [_BarState(i) for i in intervals]
+
+    def _open(self, state: _BarState, ts: float, price: float, size: float):
+        state.open_time = bucket_start(ts, state.interval)
+        state.close_time = bucket_end(state.open_time, state.interval)
+        state.bar = Bar(
+            symbol=self.symbol,
+            interval=state.interval,
+            timestamp=state.open_time,
+            open=price,
+            high=price,
+            low=price,
+            close=price,
+            volume=size,
+            trades=1,
+        )
+
+    def update(self, ts: float, price: float, size: float = 0.0) -> List[Bar]:
+        """
+        Apply one trade. Returns the bars it closed (oldest interval first).
+        Trades older than the current bar are ignored.
+        """
+        closed = []
+        for state in self._states:
+            bar = state.bar
+
+            if state.close_time is not None and ts < state.close_time:
+                if bar is None or ts < state.open_time:
+                    # Older than the current bar, or late for a flushed one
+                    continue
+                # Same bar: constant-time update
+                if price > bar.high:
+                    bar.high = price
+                elif price < bar.low:
+                    bar.low = price
+                bar.close = price
+                bar.volume += size
+                bar.trades += 1
+                continue
+
+            if bar is not None:
+                bar.closed = True
+                closed.append(bar)
+            self._open(state, ts, price, size)
+
+        return closed
+
+    def flush(self, now: float) -> List[Bar]:
+        """
+        Close bars whose interval has ended without a newer trade. Trades
+        for a flushed bar that arrive later are ignored.
+        """
+        closed = []
+        for state in self._states:
+            if state.bar is not None and now >= state.close_time:
+                state.bar.closed = True
+                closed.append(state.bar)
+                state.bar = None
+        return closed
+
+    def current(self, interval: str) -> Optional[Bar]:
+        for state in self._states:
+            if state.interval == interval:
+                return state.bar
+        raise ValueError(f"Interval not tracked: {interval}")
+
+
+# ---------------------------------------------------------
+# Trade sources
+# ---------------------------------------------------------
+class TradeSource:
+    def __aiter__(self) -> AsyncIterator[Trade]:
+        raise NotImplementedError
+
+    def now(self) -> float:
+        """
+        Current time on the stream's clock (wall time for live feeds).
+        """
+        return time.time()
+
+
+class BinanceTradeSource(TradeSource):
+    URL = "wss://stream.binance.com:9443/stream?streams={streams}"
+
+    def __init__(self, symbols: List[str], session: Optional[aiohttp.ClientSession] = None):
+        self.symbols = symbols
+        self.session = session
+        # BTCEUR -> BTC-EUR, to report trades under our own labels
+        self._labels = {s.replace("-", "").upper(): s for s in symbols}
+
+    async def __aiter__(self) -> AsyncIterator[Trade]:
+        session = self.session or http_pool.async_session
+        streams = "/".join(f"{s.replace('-', '').lower()}@trade" for s in self.symbols)
+
+        async with session.ws_connect(self.URL.format(streams=streams), heartbeat=30) as ws:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        break
+                    continue
+
+                data = json.loads(msg.data).get("data", {})
+                if data.get("e") != "trade":
+                    continue
+
+                yield Trade(
+                    symbol=self._labels.get(data["s"], data["s"]),
+                    timestamp=data["T"] / 1000,
+                    price=float(data["p"]),
+                    size=float(data["q"]),
+                )
+
+
+class FileReplaySource(TradeSource):
+    """
+    Replays trades from a CSV (timestamp,price,size[,symbol] with header)
+    or JSONL file.
+
+    speed: None replays as fast as possible, 1.0 in real time,
+           N > 1 accelerated by a factor N.
+    """
+
+    def __init__(self, path: str, symbol: str = "BTC-EUR", speed: Optional[float] = None):
+        self.path = path
+        self.symbol = symbol
+        self.speed = speed
+        self._last_ts = None
+        self._last_wall = None
+
+    def now(self) -> float:
+        """
+        Replay time: the last trade's timestamp, advanced at `speed`
+        while waiting for the next one.
+        """
+        if self._last_ts is None:
+            return float("-inf")
+        if not self.speed:
+            return self._last_ts
+        return self._last_ts + (time.monotonic() - self._last_wall) * self.speed
+
+    def _rows(self) -> Iterable[dict]:
+        with open(self.path, "r") as f:
+            if self.path.endswith(".jsonl"):
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                yield from csv.DictReader(f)
+
+    async def __aiter__(self) -> AsyncIterator[Trade]:
+        prev_ts = None
+        for row in self._rows():
+            trade = Trade(
+                symbol=row.get("symbol") or self.symbol,
+                timestamp=float(row["timestamp"]),
+                price=float(row["price"]),
+                size=float(row.get("size", 0.0)),
+            )
+
+            if self.speed and prev_ts is not None and trade.timestamp > prev_ts:
+                await asyncio.sleep((trade.timestamp - prev_ts) / self.speed)
+            prev_ts = trade.timestamp
+            self._last_ts, self._last_wall = trade.timestamp, time.monotonic()
+
+            yield trade
+
+
+# ---------------------------------------------------------
+# Ingestion
+# ---------------------------------------------------------
+class StreamIngestor:
+    def __init__(
+        self,
+        source: TradeSource,
+        intervals: Iterable[str] = ALL_INTERVALS,
+        store: Optional[CandleStore] = None,
+        grace: float = STREAM_FLUSH_GRACE,
+        flush_every: float = 1.0,
+    ):
+        self.source = source
+        self.intervals = tuple(intervals)
+        self.store = store
+        self.grace = grace
+        self.flush_every = flush_every
+        self.aggregators: Dict[str, BarAggregator] = {}
+        self._subscribers: List[Callable[[Bar], None]] = []
+        self.running = False
+
+    def subscribe(self, callback: Callable[[Bar], None]):
+        """
+        Register a callback invoked with every closed bar.
+        """
+        self._subscribers.append(callback)
+
+    def _publish(self, bars: List[Bar]):
+        for bar in bars:
+            if self.store is not None:
+                self.store.append(bar.symbol, bar.interval, pd.DataFrame([{
+                    "timestamp": bar.timestamp,
+                    "open": bar.open,
+                    "high": bar.high,
+                    "low": bar.low,
+                    "close": bar.close,
+                    "volume": bar.volume,
+                }]))
+            for callback in self._subscribers:
+                callback(bar)
+
+    def on_trade(self, trade: Trade) -> List[Bar]:
+        agg = self.aggregators.get(trade.symbol)
+        if agg is None:
+            agg = self.aggregators[trade.symbol] = BarAggregator(trade.symbol, self.intervals)
+
+        closed = agg.update(trade.timestamp, trade.price, trade.size)
+        if closed:
+            self._publish(closed)
+        return closed
+
+    def flush(self, now: Optional[float] = None) -> List[Bar]:
+        """
+        Close and publish every bar whose interval ended more than `grace`
+        seconds before `now` (default: the source clock).
+        """
+        now = self.source.now() if now is None else now
+        closed = []
+        for agg in self.aggregators.values():
+            closed.extend(agg.flush(now - self.grace))
+        if closed:
+            self._publish(closed)
+        return closed
+
+    def current_bar(self, symbol: str, interval: str) -> Optional[Bar]:
+        agg = self.aggregators.get(symbol)
+        return agg.current(interval) if agg else None
+
+    async def _flush_loop(self):
+        while self.running:
+            await asyncio.sleep(self.flush_every)
+            self.flush()
+
+    async def run(self):
+        self.running = True
+        flusher = asyncio.create_task(self._flush_loop())
+        try:
+            async for trade in self.source:
+                if not self.running:
+                    break
+                self.on_trade(trade)
+        finally:
+            self.running = False
+            flusher.cancel()
+
+    def stop(self):
+        self.running = False
+
+
+# ---------------------------------------------------------
+# API startup
+# ---------------------------------------------------------
+# Ingestor started by start_stream(); consumers subscribe() to it
+stream_ingestor: Optional[StreamIngestor] = None
+
+
+async def _keep_stream(ingestor: StreamIngestor):
+    while True:
+        try:
+            await ingestor.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[stream] feed error {e}, reconnecting")
+        await asyncio.sleep(1)
+
+
+def start_stream(symbols: Iterable[str] = STREAM_SYMBOLS, root: str = STREAM_DIR) -> list:
+    """
+    Launch the self-reconnecting trade stream for `symbols` (none: no
+    stream), persisting closed bars under `root`.
+    """
+    global stream_ingestor
+    symbols = list(symbols)
+    if not symbols:
+        return []
+    stream_ingestor = StreamIngestor(BinanceTradeSource(symbols), store=CandleStore(root))
+    return [asyncio.create_task(_keep_stream(stream_ingestor))]
@@ -0,0 +1,112 @@
+"""
+Moving Averages
+---------------
+Incremental SMA, EMA and MACD that consume one bar at a time.
+
+Each indicator keeps O(1) state (a ring buffer for windowed ones),
+exposes its current `value` (None until warmed up) and supports
+snapshot() / restore() so live state can be persisted and resumed.
+Values match the pandas rolling / ewm(adjust=False) equivalents.
+"""
+
+from typing import Optional
+
+from core.utils.math_utils import RingBuffer
+
+
+class SMA:
+    def __init__(self, period: int):
+        self.period = period
+        self._buf = RingBuffer(period)
+        self._sum = 0.0
+        self._since_resum = 0
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> Optional[float]:
+        evicted = self._buf.append(x)
+        self._sum += x - (evicted or 0.0)
+
+        # Re-sum once per window so floating-point drift stays bounded
+        self._since_resum += 1
+        if self._since_resum >= self.period:
+            self._sum = sum(self._buf.values())
+            self._since_resum = 0
+
+        if self._buf.full:
+            self.value = self._sum / self.period
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {"period": self.period, "buffer": self._buf.snapshot()}
+
+    def restore(self, state: dict) -> "SMA":
+        self.period = state["period"]
+        self._buf = RingBuffer.from_snapshot(state["buffer"])
+        self._sum = sum(self._buf.values())
+        self._since_resum = 0
+        self.value = self._sum / self.period if self._buf.full else None
+        return self
+
+
+class EMA:
+    """
+    Recursive EMA seeded with the first value, as ewm(span, adjust=False).
+    """
+
+    def __init__(self, span: int):
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {"span": self.span, "value": self.value}
+
+    def restore(self, state: dict) -> "EMA":
+        self.__init__(state["span"])
+        self.value = state["value"]
+        return self
+
+
+class MACD:
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value: Optional[float] = None
+
+    @property
+    def signal_value(self) -> Optional[float]:
+        return self.signal.value
+
+    @property
+    def histogram(self) -> Optional[float]:
+        if self.value is None:
+            return None
+        return self.value - self.signal.value
+
+    def update(self, x: float) -> float:
+        self.value = self.fast.update(x) - self.slow.update(x)
+        self.signal.update(self.value)
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {
+            "fast": self.fast.snapshot(),
+            "slow": self.slow.snapshot(),
+            "signal": self.signal.snapshot(),
+            "value": self.value,
+        }
+
+    def restore(self, state: dict) -> "MACD":
+        self.fast.restore(state["fast"])
+        self.slow.restore(state["slow"])
+        self.signal.restore(state["signal"])
+        self.value = state["value"]
+        return self
@@ -1,11 +1,22 @@
 """
 RSI Indicator
 -------------
-Computes Relative Strength Index for a price series.
+Computes Relative Strength Index for a price series, in batch
+(compute_rsi) or one close at a time (IncrementalRSI).
+
+RSI is undefined (NaN) while the average loss is zero, as in
+core.model.feature_engineering.compute_indicators.
 """
 
+import math
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
+from core.utils.math_utils import RingBuffer
+
+
 def compute_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
     """
     Compute RSI values.
@@ -17,7 +28,78 @@ def compute_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
     avg_gain = gain.rolling(period).mean()
     avg_loss = loss.rolling(period).mean()
 
-    rs = avg_gain / avg_loss.replace(0, 1e-10)
+    rs = avg_gain / avg_loss.replace(0, np.nan)
     rsi = 100 - (100 / (1 + rs))
 
     return rsi
+
+
+class IncrementalRSI:
+    """
+    RSI updated one close at a time.
+
+    method="sma" averages gains / losses over the last `period` deltas
+    (same values as compute_rsi); method="wilder" seeds with that average
+    and then smooths with alpha = 1 / period.
+    """
+
+    def __init__(self, period: int = 14, method: str = "sma"):
+        if method not in ("sma", "wilder"):
+            raise ValueError(f"Unknown RSI method: {method}")
+        self.period = period
+        self.method = method
+        self._prev: Optional[float] = None
+        self._gains = RingBuffer(period)
+        self._losses = RingBuffer(period)
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def update(self, close: float) -> Optional[float]:
+        prev, self._prev = self._prev, close
+        if prev is None:
+            return None
+
+        delta = close - prev
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.method == "wilder" and self.avg_gain is not None:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        else:
+            self._gains.append(gain)
+            self._losses.append(loss)
+            if not self._gains.full:
+                return None
+            # Windows are short; re-summing keeps values exact
+            self.avg_gain = sum(self._gains.values()) / self.period
+            self.avg_loss = sum(self._losses.values()) / self.period
+
+        if self.avg_loss == 0:
+            self.value = math.nan
+        else:
+            self.value = 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {
+            "period": self.period,
+            "method": self.method,
+            "prev": self._prev,
+            "gains": self._gains.snapshot(),
+            "losses": self._losses.snapshot(),
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "value": self.value,
+        }
+
+    def restore(self, state: dict) -> "IncrementalRSI":
+        self.__init__(state["period"], state["method"])
+        self._prev = state["prev"]
+        self._gains = RingBuffer.from_snapshot(state["gains"])
+        self._losses = RingBuffer.from_snapshot(state["losses"])
+        self.avg_gain = state["avg_gain"]
+        self.avg_loss = state["avg_loss"]
+        self.value = state["value"]
+        return self
@@ -0,0 +1,140 @@
+"""
+Volatility
+----------
+Incremental rolling standard deviation, Bollinger bands and return
+volatility that consume one bar at a time.
+
+Rolling variance is maintained with a sliding Welford update over a ring
+buffer (O(1) per bar) and recomputed from the buffer once per window to
+bound floating-point drift. Values match pandas rolling(...).std().
+"""
+
+import math
+from typing import Optional
+
+from core.utils.math_utils import RingBuffer
+
+
+class RollingStd:
+    """
+    Sample (ddof=1) standard deviation and mean over the last `period` values.
+    """
+
+    def __init__(self, period: int):
+        if period < 2:
+            raise ValueError("RollingStd period must be >= 2")
+        self.period = period
+        self._buf = RingBuffer(period)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._since_resync = 0
+        self.mean: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def _resync(self):
+        values = self._buf.values()
+        self._mean = sum(values) / len(values)
+        self._m2 = sum((v - self._mean) ** 2 for v in values)
+        self._since_resync = 0
+
+    def update(self, x: float) -> Optional[float]:
+        evicted = self._buf.append(x)
+        n = len(self._buf)
+
+        if evicted is None:
+            # Growing window: standard Welford step
+            delta = x - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (x - self._mean)
+        else:
+            old_mean = self._mean
+            self._mean += (x - evicted) / n
+            self._m2 += (x - evicted) * (x - self._mean + evicted - old_mean)
+
+        self._since_resync += 1
+        if self._since_resync >= self.period:
+            self._resync()
+
+        if not self._buf.full:
+            return None
+
+        self.mean = self._mean
+        self.value = math.sqrt(max(self._m2, 0.0) / (n - 1))
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {"period": self.period, "buffer": self._buf.snapshot()}
+
+    def restore(self, state: dict) -> "RollingStd":
+        self.__init__(state["period"])
+        self._buf = RingBuffer.from_snapshot(state["buffer"])
+        if len(self._buf):
+            self._resync()
+        if self._buf.full:
+            self.mean = self._mean
+            self.value = math.sqrt(max(self._m2, 0.0) / (self.period - 1))
+        return self
+
+
+class BollingerBands:
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.num_std = num_std
+        self.std = RollingStd(period)
+        self.upper: Optional[float] = None
+        self.lower: Optional[float] = None
+
+    @property
+    def mid(self) -> Optional[float]:
+        return self.std.mean
+
+    def update(self, close: float) -> Optional[tuple]:
+        std = self.std.update(close)
+        if std is None:
+            return None
+        self.upper = self.std.mean + self.num_std * std
+        self.lower = self.std.mean - self.num_std * std
+        return self.upper, self.lower, self.std.mean
+
+    def snapshot(self) -> dict:
+        return {"num_std": self.num_std, "std": self.std.snapshot()}
+
+    def restore(self, state: dict) -> "BollingerBands":
+        self.num_std = state["num_std"]
+        self.std.restore(state["std"])
+        if self.std.value is not None:
+            self.upper = self.std.mean + self.num_std * self.std.value
+            self.lower = self.std.mean - self.num_std * self.std.value
+        else:
+            self.upper = self.lower = None
+        return self
+
+
+class ReturnVolatility:
+    """
+    Rolling std of simple returns, as close.pct_change().rolling(period).std().
+    """
+
+    def __init__(self, period: int = 20):
+        self._prev: Optional[float] = None
+        self.std = RollingStd(period)
+        self.last_return: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.std.value
+
+    def update(self, close: float) -> Optional[float]:
+        prev, self._prev = self._prev, close
+        if prev is None:
+            return None
+        self.last_return = close / prev - 1
+        return self.std.update(self.last_return)
+
+    def snapshot(self) -> dict:
+        return {"prev": self._prev, "last_return": self.last_return, "std": self.std.snapshot()}
+
+    def restore(self, state: dict) -> "ReturnVolatility":
+        self._prev = state["prev"]
+        self.last_return = state["last_return"]
+        self.std.restore(state["std"])
+        return self
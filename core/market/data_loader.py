@@ -1,9 +1,25 @@
-import requests
 import pandas as pd
-from datetime import datetime
+from typing import Dict, Tuple
+
+from core.data.candle_store import candle_store
+from core.data.feature_store import feature_store
+from core.data.market_data import CoinbaseProvider, replay_market
+from core.utils.cache import quote_cache
+from core.utils.http_client import http_pool
+from core.utils.time_utils import granularity_to_interval, now_ts
 
 COINBASE_SPOT_URL = "https://api.coinbase.com/v2/prices/{symbol}/spot"
-COINBASE_CANDLES_URL = "https://api.exchange.coinbase.com/products/{symbol}/candles"
+
+_coinbase = CoinbaseProvider()
+
+# (symbol, interval) -> oldest open time already requested for a
+# backfill, so history Coinbase does not have is not asked for again
+_backfilled: Dict[Tuple[str, str], int] = {}
+
+# (symbol, interval) -> newest open time already requested. Coinbase
+# omits minutes without trades, so the last stored candle can stay
+# behind the last closed one on illiquid pairs without anything missing
+_covered: Dict[Tuple[str, str], int] = {}
 
 
 def load_price(symbol: str) -> float:
@@ -11,44 +27,86 @@ def load_price(symbol: str) -> float:
     Loads the latest spot price from Coinbase.
     Example symbol: BTC-EUR
     """
-    url = COINBASE_SPOT_URL.format(symbol=symbol)
-    data = requests.get(url).json()
+    replay = replay_market()
+    if replay is not None:
+        return float(replay.get_ticker(symbol)["price"])
 
-    return float(data["data"]["amount"])
+    def fetch():
+        url = COINBASE_SPOT_URL.format(symbol=symbol)
+        data = http_pool.get(url).json()
+        return float(data["data"]["amount"])
+
+    return quote_cache.get_or_fetch(("spot", symbol), fetch)
+
+
+def _fetch_candles(symbol: str, granularity: int, first: int, last: int) -> pd.DataFrame:
+    """
+    Fetch every Coinbase candle with an open time in [first, last],
+    oldest first, paginated 300 candles per request.
+    """
+    candles = _coinbase.get_candles(symbol, granularity, first, last)
+    df = candles.to_frame(("timestamp", "open", "high", "low", "close", "volume"))
+    return df[(df["timestamp"] >= first) & (df["timestamp"] <= last)]
 
 
 def load_historical_data(
     symbol: str,
     granularity: int = 60,  # 1-minute candles
-    limit: int = 300        # Coinbase returns up to 300 candles
+    limit: int = 300
 ) -> pd.DataFrame:
     """
-    Loads historical OHLCV candles from Coinbase.
-    Output format matches your frontend expectations.
+    Loads historical OHLCV candles, oldest first.
+
+    Closed candles are served from the local candle store; Coinbase is only
+    asked for candles newer than the last stored timestamp (all of them,
+    so the store has no gaps), for older history while the store holds
+    fewer than `limit` candles, and not at all while no new candle has
+    closed since the previous call.
     """
+    interval = granularity_to_interval(granularity)
 
-    url = COINBASE_CANDLES_URL.format(symbol=symbol)
-    params = {"granularity": granularity}
+    replay = replay_market()
+    if replay is not None:
+        df = replay.get_historical_data(symbol, interval, limit=limit)
+        if df.empty:
+            raise ValueError(f"No candle data returned for {symbol}")
+        return df
 
-    raw = requests.get(url, params=params).json()
+    # Open time of the most recent fully closed candle
+    last_closed = (now_ts() // granularity - 1) * granularity
+    last_stored = candle_store.last_timestamp(symbol, interval)
+    key = (symbol, interval)
+    covered = max(last_stored if last_stored is not None else -1, _covered.get(key, -1))
 
-    if not isinstance(raw, list) or len(raw) == 0:
-        raise ValueError(f"No candle data returned for {symbol}")
+    first_needed = last_closed - (limit - 1) * granularity
+
+    if last_stored is None:
+        if covered < last_closed:
+            candle_store.append(symbol, interval, _fetch_candles(symbol, granularity, first_needed, last_closed))
+            _backfilled[key] = first_needed
+            _covered[key] = last_closed
+    else:
+        if covered < last_closed:
+            fresh = _fetch_candles(symbol, granularity, covered + granularity, last_closed)
+            candle_store.append(symbol, interval, fresh)
+            _covered[key] = last_closed
 
-    # Coinbase format: [ time, low, high, open, close, volume ]
-    df = pd.DataFrame(
-        raw,
-        columns=["timestamp", "low", "high", "open", "close", "volume"]
-    )
+        # Store shorter than `limit`: backfill the older history once
+        first_stored = candle_store.first_timestamp(symbol, interval)
+        attempted = _backfilled.get(key, first_stored)
+        if candle_store.count(symbol, interval) < limit and first_needed < attempted:
+            older = _fetch_candles(symbol, granularity, first_needed, first_stored - granularity)
+            if candle_store.prepend(symbol, interval, older):
+                # Stored indicators started at the old first candle
+                feature_store.schedule_update(symbol, interval, reset=True)
+            _backfilled[key] = first_needed
 
-    # Coinbase returns newest → oldest, so reverse
-    df = df.iloc[::-1].reset_index(drop=True)
+    # New closed candles: extend the stored indicators off the request path
+    feature_store.schedule_update(symbol, interval)
 
-    # Convert timestamp to int (seconds)
-    df["timestamp"] = df["timestamp"].astype(int)
+    df = candle_store.read(symbol, interval, limit=limit)
 
-    # Ensure numeric types
-    for col in ["open", "high", "low", "close", "volume"]:
-        df[col] = df[col].astype(float)
+    if df.empty:
+        raise ValueError(f"No candle data returned for {symbol}")
 
     return df
@@ -0,0 +1,417 @@
+"""
+Order Book
+----------
+In-memory L2 order books maintained from snapshot + diff updates.
+
+Each side keeps its price levels in a sorted list with the best level at
+the end, so best bid / ask is O(1) and a level update is a bisect plus a
+list insert / delete. Cumulative size and notional from the best level
+are rebuilt lazily (once per update batch) into NumPy arrays, after which
+depth-within-N-bps and volume-weighted fill prices are O(log n) lookups.
+
+OrderBookManager holds the books for many symbols in one process, and
+run_binance_depth() keeps one in sync with the Binance depth stream.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+from core.utils.http_client import http_pool
+
+Level = Tuple[float, float]      # (price, size)
+
+# Symbols to keep live books for, e.g. "BTC-EUR,ETH-EUR" (empty: none)
+ORDER_BOOK_SYMBOLS = [s for s in os.getenv("ORDER_BOOK_SYMBOLS", "").split(",") if s]
+
+
+# ---------------------------------------------------------
+# One side of the book
+# ---------------------------------------------------------
+class BookSide:
+    """
+    Price levels of one side. Levels are stored by sort key, ascending,
+    with the best level last: bids use the price, asks the negated price.
+    """
+
+    __slots__ = ("is_bid", "_keys", "_sizes", "_cum", "_dirty")
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._keys: List[float] = []
+        self._sizes: List[float] = []
+        self._cum = None
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, price: float) -> float:
+        return price if self.is_bid else -price
+
+    def clear(self):
+        self._keys.clear()
+        self._sizes.clear()
+        self._dirty = True
+
+    def set(self, price: float, size: float):
+        """
+        Set the size at a price level; size 0 removes the level.
+        """
+        key = self._key(price)
+        i = bisect_left(self._keys, key)
+        found = i < len(self._keys) and self._keys[i] == key
+
+        if size <= 0:
+            if found:
+                del self._keys[i]
+                del self._sizes[i]
+                self._dirty = True
+            return
+
+        if found:
+            self._sizes[i] = size
+        else:
+            self._keys.insert(i, key)
+            self._sizes.insert(i, size)
+        self._dirty = True
+
+    def best(self) -> Optional[Level]:
+        if not self._keys:
+            return None
+        return abs(self._keys[-1]), self._sizes[-1]
+
+    def levels(self, n: Optional[int] = None) -> List[Level]:
+        """
+        Levels best first.
+        """
+        keys, sizes = self._keys[::-1], self._sizes[::-1]
+        if n is not None:
+            keys, sizes = keys[:n], sizes[:n]
+        return [(abs(k), s) for k, s in zip(keys, sizes)]
+
+    def _cumulative(self) -> tuple:
+        """
+        (prices, cumulative size, cumulative notional), best level first.
+        """
+        if self._dirty:
+            prices = np.abs(np.array(self._keys[::-1], dtype=np.float64))
+            sizes = np.array(self._sizes[::-1], dtype=np.float64)
+            self._cum = (prices, np.cumsum(sizes), np.cumsum(sizes * prices))
+            self._dirty = False
+        return self._cum
+
+    def depth(self, limit_price: float) -> Tuple[float, float]:
+        """
+        Total (size, notional) of the levels at or better than `limit_price`.
+        """
+        prices, cum_size, cum_notional = self._cumulative()
+        if self.is_bid:
+            # Bids best first are descending
+            n = int(np.searchsorted(-prices, -limit_price, side="right"))
+        else:
+            n = int(np.searchsorted(prices, limit_price, side="right"))
+        if n == 0:
+            return 0.0, 0.0
+        return float(cum_size[n - 1]), float(cum_notional[n - 1])
+
+    def fill(self, size: Optional[float] = None, notional: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """
+        Walk the side with a market order of `size` (base) or `notional`
+        (quote). Returns (volume-weighted price, filled size), or None if
+        the side is too thin to fill it.
+        """
+        prices, cum_size, cum_notional = self._cumulative()
+        if len(prices) == 0:
+            return None
+
+        cum, amount = (cum_size, size) if size is not None else (cum_notional, notional)
+        if amount is None or amount <= 0:
+            raise ValueError("fill() needs a positive size or notional")
+
+        i = int(np.searchsorted(cum, amount, side="left"))
+        if i >= len(prices):
+            return None
+
+        prev_size = cum_size[i - 1] if i else 0.0
+        prev_notional = cum_notional[i - 1] if i else 0.0
+        if size is not None:
+            filled = size
+            paid = prev_notional + (size - prev_size) * prices[i]
+        else:
+            filled = prev_size + (notional - prev_notional) / prices[i]
+            paid = notional
+        return float(paid / filled), float(filled)
+
+
+# ---------------------------------------------------------
+# Book
+# ---------------------------------------------------------
+class OrderBook:
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.sequence: Optional[int] = None
+        self.updated_at: Optional[float] = None
+        self.synced = False
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # Updates
+    # ---------------------------------------------------------
+    def apply_snapshot(self, bids: Iterable, asks: Iterable, sequence: Optional[int] = None):
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            for price, size, *_ in bids:
+                self.bids.set(float(price), float(size))
+            for price, size, *_ in asks:
+                self.asks.set(float(price), float(size))
+            self.sequence = sequence
+            self.updated_at = time.time()
+            self.synced = True
+
+    def apply_update(
+        self,
+        bids: Iterable,
+        asks: Iterable,
+        sequence: Optional[int] = None,
+        first_sequence: Optional[int] = None,
+    ) -> bool:
+        """
+        Apply a diff of (price, size) levels; size 0 removes a level.
+
+        Updates at or below the current sequence are ignored. If
+        `first_sequence` shows a gap after the current sequence, the book
+        is marked out of sync and must be re-snapshotted. Returns True if
+        the update was applied.
+        """
+        with self._lock:
+            if not self.synced:
+                return False
+            if sequence is not None and self.sequence is not None:
+                if sequence <= self.sequence:
+                    return False
+                if first_sequence is not None and first_sequence > self.sequence + 1:
+                    self.synced = False
+                    return False
+
+            for price, size, *_ in bids:
+                self.bids.set(float(price), float(size))
+            for price, size, *_ in asks:
+                self.asks.set(float(price), float(size))
+            if sequence is not None:
+                self.sequence = sequence
+            self.updated_at = time.time()
+            return True
+
+    # ---------------------------------------------------------
+    # Queries
+    # ---------------------------------------------------------
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return best[0] if best else None
+
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return best[0] if best else None
+
+    def top(self) -> Tuple[Optional[float], Optional[float]]:
+        return self.best_bid(), self.best_ask()
+
+    def mid(self) -> Optional[float]:
+        bid, ask = self.top()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def spread(self) -> Optional[float]:
+        bid, ask = self.top()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def spread_pct(self) -> Optional[float]:
+        bid, ask = self.top()
+        if not bid or ask is None:
+            return None
+        return (ask - bid) / bid * 100
+
+    def depth(self, side: str, bps: float) -> Tuple[float, float]:
+        """
+        (size, notional) resting within `bps` of the best price on a side
+        ("bid" / "ask").
+        """
+        book_side = self.bids if side == "bid" else self.asks
+        best = book_side.best()
+        if best is None:
+            return 0.0, 0.0
+        offset = best[0] * bps / 10000
+        return book_side.depth(best[0] - offset if side == "bid" else best[0] + offset)
+
+    def vwap(self, side: str, size: Optional[float] = None, notional: Optional[float] = None):
+        """
+        Volume-weighted fill price of a market order ("buy" walks the asks,
+        "sell" the bids), by base `size` or quote `notional`.
+        Returns None if the book cannot fill it.
+        """
+        book_side = self.asks if side == "buy" else self.bids
+        result = book_side.fill(size=size, notional=notional)
+        return result[0] if result else None
+
+    def slippage_pct(self, side: str, size: Optional[float] = None, notional: Optional[float] = None):
+        """
+        Fill price of a market order relative to the best price, in %.
+        """
+        best = self.best_ask() if side == "buy" else self.best_bid()
+        price = self.vwap(side, size=size, notional=notional)
+        if best is None or price is None:
+            return None
+        return abs(price - best) / best * 100
+
+    def snapshot(self, levels: int = 10) -> dict:
+        return {
+            "symbol": self.symbol,
+            "sequence": self.sequence,
+            "timestamp": self.updated_at,
+            "bids": self.bids.levels(levels),
+            "asks": self.asks.levels(levels),
+        }
+
+
+# ---------------------------------------------------------
+# Many books
+# ---------------------------------------------------------
+class OrderBookManager:
+    def __init__(self, max_age: float = 5.0):
+        # Books not updated within max_age seconds are treated as stale
+        self.max_age = max_age
+        self._books: Dict[str, OrderBook] = {}
+        self._lock = threading.Lock()
+
+    def book(self, symbol: str) -> OrderBook:
+        book = self._books.get(symbol)
+        if book is None:
+            with self._lock:
+                book = self._books.setdefault(symbol, OrderBook(symbol))
+        return book
+
+    def symbols(self) -> List[str]:
+        return list(self._books)
+
+    def fresh(self, symbol: str) -> Optional[OrderBook]:
+        """
+        The book for `symbol` if it is in sync and recently updated.
+        """
+        book = self._books.get(symbol)
+        if book is None or not book.synced or book.updated_at is None:
+            return None
+        if time.time() - book.updated_at > self.max_age:
+            return None
+        return book
+
+    def apply_snapshot(self, symbol: str, bids, asks, sequence: Optional[int] = None):
+        self.book(symbol).apply_snapshot(bids, asks, sequence)
+
+    def apply_update(self, symbol: str, bids, asks, sequence=None, first_sequence=None) -> bool:
+        return self.book(symbol).apply_update(bids, asks, sequence, first_sequence)
+
+    def get_top(self, symbol: str) -> Tuple[Optional[float], Optional[float]]:
+        book = self.fresh(symbol)
+        return book.top() if book else (None, None)
+
+    async def get_orderbook_top(self, symbol: str) -> Tuple[Optional[float], Optional[float]]:
+        # RiskManager MarketDataService interface
+        return self.get_top(symbol)
+
+
+# ---------------------------------------------------------
+# Binance depth feed
+# ---------------------------------------------------------
+BINANCE_DEPTH_URL = "https://api.binance.com/api/v3/depth"
+BINANCE_DEPTH_WS = "wss://stream.binance.com:9443/ws/{stream}@depth@100ms"
+
+
+async def run_binance_depth(
+    manager: OrderBookManager,
+    symbol: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    snapshot_limit: int = 1000,
+):
+    """
+    Keep manager.book(symbol) in sync with the Binance diff depth stream:
+    buffer diffs, fetch a REST snapshot, drop diffs it already covers and
+    apply the rest. Re-snapshots whenever a sequence gap is detected.
+    """
+    session = session or http_pool.async_session
+    stream = symbol.replace("-", "").lower()
+    book = manager.book(symbol)
+
+    async with session.ws_connect(BINANCE_DEPTH_WS.format(stream=stream), heartbeat=30) as ws:
+        while True:
+            buffered = []
+            snapshot_task = asyncio.ensure_future(session.get(
+                BINANCE_DEPTH_URL,
+                params={"symbol": stream.upper(), "limit": snapshot_limit},
+            ))
+
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        return
+                    continue
+
+                event = json.loads(msg.data)
+
+                if snapshot_task is not None:
+                    buffered.append(event)
+                    if not snapshot_task.done():
+                        continue
+                    resp = snapshot_task.result()
+                    resp.raise_for_status()
+                    snap = await resp.json()
+                    snapshot_task = None
+
+                    book.apply_snapshot(snap["bids"], snap["asks"], snap["lastUpdateId"])
+                    for e in buffered:
+                        if e["u"] <= book.sequence:
+                            continue
+                        book.apply_update(e["b"], e["a"], e["u"], e["U"])
+                    buffered = []
+                else:
+                    book.apply_update(event["b"], event["a"], event["u"], event["U"])
+
+                if not book.synced:
+                    print(f"[order_book] {symbol}: sequence gap, re-syncing")
+                    break
+
+
+async def _keep_depth(manager: OrderBookManager, symbol: str):
+    while True:
+        try:
+            await run_binance_depth(manager, symbol)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            manager.book(symbol).synced = False
+            print(f"[order_book] {symbol}: feed error {e}, reconnecting")
+        await asyncio.sleep(1)
+
+
+def start_depth_feeds(manager: OrderBookManager, symbols: Iterable[str] = ORDER_BOOK_SYMBOLS) -> list:
+    """
+    Launch one self-reconnecting depth feed task per symbol.
+    """
+    return [asyncio.create_task(_keep_depth(manager, s)) for s in symbols]
+
+
+# Shared instance
+order_books = OrderBookManager()
@@ -0,0 +1,85 @@
+"""
+Model Interface
+---------------
+Every forecast model implements predict_batch():
+
+    predict_batch(features: ndarray[n_symbols, n_features]) -> ndarray[n_symbols, horizon]
+
+Rows of `features` follow FEATURE_NAMES (see feature_engineering). One
+call scores a whole watchlist, or every bar of a history at once. The
+single-frame predict(df) used by the API is derived from it, so a new
+model only has to implement the batch path.
+
+Models become available to predict(), compare and rank by registering
+them with the model registry (register_model).
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.model.feature_engineering import (
+    FEATURE_NAMES,
+    compute_indicators,
+    feature_vector,
+    features_from_indicators,
+)
+
+HORIZON = 10
+
+
+class Model:
+    name: str = "model"
+    horizon: int = HORIZON
+    # False for models that need the raw frame (predict_batch unavailable)
+    batched: bool = True
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def predict(self, df: pd.DataFrame, features: Optional[dict] = None) -> list:
+        """
+        Forecast path for one candle frame. Pass `features` when they are
+        already computed to skip the indicator pass.
+        """
+        if features is None:
+            features = features_from_indicators(compute_indicators(df["close"]))
+        return self.predict_batch(feature_vector(features)[None, :])[0].tolist()
+
+    def __call__(self, df: pd.DataFrame) -> list:
+        return self.predict(df)
+
+
+class DriftModel(Model):
+    """
+    Constant per-bar drift from the last price:
+    forecast[i] = price * (1 + drift * i), i = 1 .. horizon.
+    """
+
+    def __init__(self, name: str, drift: float, horizon: int = HORIZON):
+        self.name = name
+        self.drift = drift
+        self.horizon = horizon
+        self._steps = np.arange(1, horizon + 1)
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        price = features[:, FEATURE_NAMES.index("price")]
+        return price[:, None] * (1 + self.drift * self._steps)
+
+
+class FrameModel(Model):
+    """
+    Adapter for plain model(df) -> list callables. predict_batch is not
+    available since the callable needs the full frame, not features.
+    """
+
+    batched = False
+
+    def __init__(self, name: str, fn: Callable[[pd.DataFrame], list], horizon: int = HORIZON):
+        self.name = name
+        self.fn = fn
+        self.horizon = horizon
+
+    def predict(self, df: pd.DataFrame, features: Optional[dict] = None) -> list:
+        return [float(p) for p in self.fn(df)]
@@ -5,6 +5,7 @@ Transforms raw market data into model‑ready features.
 This module is imported by the Predictor and Backtester.
 """
 
+import numpy as np
 import pandas as pd
 from core.indicators.rsi import compute_rsi
 
@@ -51,3 +52,214 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     df = df.dropna()
 
     return df
+
+
+# ---------------------------------------------------------
+# Fused Indicator Pass
+# ---------------------------------------------------------
+
+def _rolling(values: np.ndarray, window: int):
+    """
+    Rolling (mean, sample std) over the last axis with pandas semantics:
+    NaN until a full window of non-NaN values is available.
+    """
+    n = values.shape[-1]
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    if n >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=-1)
+        mean[..., window - 1:] = windows.mean(axis=-1)
+        std[..., window - 1:] = windows.std(axis=-1, ddof=1)
+    return mean, std
+
+
+def _ema(values: np.ndarray, span: int, start: float = None) -> np.ndarray:
+    """
+    Recursive EMA over the last axis, identical to
+    Series.ewm(span, adjust=False).mean(). For 1-D input, `start` is the
+    EMA value before the first element (continues an earlier pass).
+    """
+    alpha = 2.0 / (span + 1)
+    if values.ndim > 1:
+        # One vectorized step per bar across all rows (symbols), on a
+        # bar-major copy so every step touches contiguous memory
+        scaled = np.ascontiguousarray(np.moveaxis(alpha * values, -1, 0))
+        out = np.empty(scaled.shape)
+        if len(scaled):
+            out[0] = values[..., 0]
+        decay = 1 - alpha
+        for t in range(1, len(scaled)):
+            np.add(scaled[t], decay * out[t - 1], out=out[t])
+        return np.moveaxis(out, 0, -1)
+
+    out = []
+    ema = start
+    for v in values.tolist():
+        ema = v if ema is None else alpha * v + (1 - alpha) * ema
+        out.append(ema)
+    return np.array(out, dtype=np.float64)
+
+
+def compute_indicators(close) -> dict:
+    """
+    Every indicator used by predict(), computed once over the close
+    series into NumPy arrays (NaN where the window is not yet full).
+
+    `close` is one series [n_bars] or a matrix [n_symbols, n_bars] of
+    aligned series; each row of a matrix gives exactly the indicators of
+    that series on its own.
+    """
+    close = np.asarray(close, dtype=np.float64)
+
+    ret = np.full(close.shape, np.nan)
+    ret[..., 1:] = close[..., 1:] / close[..., :-1] - 1
+    _, volatility = _rolling(ret, 5)
+    sma, _ = _rolling(close, 10)
+
+    delta = np.full(close.shape, np.nan)
+    delta[..., 1:] = np.diff(close, axis=-1)
+    gain, _ = _rolling(np.maximum(delta, 0), 14)
+    loss, _ = _rolling(-np.minimum(delta, 0), 14)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / np.where(loss == 0, np.nan, loss)
+    rsi = 100 - (100 / (1 + rs))
+
+    ema12 = _ema(close, 12)
+    ema26 = _ema(close, 26)
+    macd = ema12 - ema26
+    macd_signal = _ema(macd, 9)
+
+    bb_mid, bb_std = _rolling(close, 20)
+
+    return {
+        "close": close,
+        "return": ret,
+        "volatility": volatility,
+        "sma": sma,
+        "rsi": rsi,
+        "ema12": ema12,
+        "ema26": ema26,
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "bb_mid": bb_mid,
+        "bb_std": bb_std,
+        "bb_upper": bb_mid + 2 * bb_std,
+        "bb_lower": bb_mid - 2 * bb_std,
+    }
+
+
+# Bars the rolling indicators look back from the last bar: the longest
+# window (Bollinger, 20) plus one for the return / delta lag
+ROLLING_BARS = 21
+
+
+def compute_latest_indicators(close) -> dict:
+    """
+    compute_indicators() trimmed to the last ROLLING_BARS bars, for
+    callers that only need the latest values (e.g. screening a
+    watchlist). Rolling windows are computed on the tail only; the EMAs
+    still run over the full history they depend on.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    ind = compute_indicators(close[..., -ROLLING_BARS:])
+
+    ema12 = _ema(close, 12)
+    ema26 = _ema(close, 26)
+    macd = ema12 - ema26
+    macd_signal = _ema(macd, 9)
+    for name, values in (("ema12", ema12), ("ema26", ema26), ("macd", macd), ("macd_signal", macd_signal)):
+        ind[name] = values[..., -ROLLING_BARS:]
+    return ind
+
+
+# Bump when an indicator definition changes: stored features of another
+# version are never mixed in (see core.data.feature_store)
+FEATURE_SET_VERSION = "v1"
+
+# Indicator arrays persisted per bar; the EMAs are kept so later bars can
+# continue the recursion
+STORED_INDICATORS = [
+    "close", "return", "volatility", "sma", "rsi", "ema12", "ema26",
+    "macd", "macd_signal", "bb_mid", "bb_upper", "bb_lower",
+]
+
+
+def extend_indicators(context: np.ndarray, close: np.ndarray, previous: dict = None) -> dict:
+    """
+    Indicators for new bars `close` that follow an earlier pass, without
+    recomputing the history. `context` holds the (up to) ROLLING_BARS
+    closes before them and `previous` the last EMA values (ema12, ema26,
+    macd_signal) of that pass. The result matches compute_indicators()
+    over the full history, restricted to the new bars.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if previous is None:
+        return compute_indicators(close)
+
+    context = np.asarray(context, dtype=np.float64)[-ROLLING_BARS:]
+    ind = {k: v[len(context):] for k, v in compute_indicators(np.concatenate([context, close])).items()}
+
+    ema12 = _ema(close, 12, previous["ema12"])
+    ema26 = _ema(close, 26, previous["ema26"])
+    macd = ema12 - ema26
+    ind.update(ema12=ema12, ema26=ema26, macd=macd, macd_signal=_ema(macd, 9, previous["macd_signal"]))
+    return ind
+
+
+def _last(values: np.ndarray) -> float:
+    value = float(values[-1])
+    return 0.0 if np.isnan(value) else value
+
+
+# ---------------------------------------------------------
+# Latest-Value Features
+# ---------------------------------------------------------
+
+# Column order of feature vectors passed to Model.predict_batch()
+FEATURE_NAMES = [
+    "return", "volatility", "sma", "price", "rsi",
+    "macd", "macd_signal", "bb_upper", "bb_lower", "bb_mid",
+]
+
+
+def features_from_indicators(ind: dict) -> dict:
+    return {
+        "return": _last(ind["return"]),
+        "volatility": _last(ind["volatility"]),
+        "sma": _last(ind["sma"]),
+        "price": _last(ind["close"]),
+        "rsi": _last(ind["rsi"]),
+        "macd": float(ind["macd"][-1]),
+        "macd_signal": float(ind["macd_signal"][-1]),
+        "bb_upper": _last(ind["bb_upper"]),
+        "bb_lower": _last(ind["bb_lower"]),
+        "bb_mid": _last(ind["bb_mid"]),
+    }
+
+
+def feature_vector(features: dict) -> np.ndarray:
+    return np.array([features[k] for k in FEATURE_NAMES], dtype=np.float64)
+
+
+def latest_features(ind: dict) -> np.ndarray:
+    """
+    Feature matrix [n_symbols, n_features] from the last bar of a
+    [n_symbols, n_bars] indicator pass: row i equals
+    feature_vector(features_from_indicators()) of symbol i.
+    """
+    columns = {k: ind[k][..., -1] for k in ("return", "volatility", "sma", "rsi", "bb_upper", "bb_lower", "bb_mid")}
+    columns = {k: np.nan_to_num(v, nan=0.0) for k, v in columns.items()}
+    columns.update(price=np.nan_to_num(ind["close"][..., -1], nan=0.0),
+                   macd=ind["macd"][..., -1], macd_signal=ind["macd_signal"][..., -1])
+    return np.column_stack([columns[k] for k in FEATURE_NAMES])
+
+
+def feature_rows(ind: dict) -> np.ndarray:
+    """
+    Feature matrix [n_bars, n_features] for every bar of an indicator
+    pass: row t holds what features_from_indicators() would return for
+    the history ending at t.
+    """
+    columns = {k: ind[k] for k in ("return", "volatility", "sma", "rsi", "bb_upper", "bb_lower", "bb_mid")}
+    columns.update(price=ind["close"], macd=ind["macd"], macd_signal=ind["macd_signal"])
+    return np.nan_to_num(np.column_stack([columns[k] for k in FEATURE_NAMES]), nan=0.0)
@@ -0,0 +1,96 @@
+"""
+Model Loader
+------------
+Deserializes model artifacts from disk and adapts them to the Model
+interface (core.model.base).
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.model.base import HORIZON, Model
+from core.model.feature_engineering import FEATURE_NAMES
+
+try:
+    import joblib
+except ImportError:  # pragma: no cover - optional dependency
+    joblib = None
+
+ARTIFACT_EXTENSIONS = (".pkl", ".pickle", ".joblib")
+
+# Per-bar drift of a classifier artifact at full conviction (P(BUY) = 1)
+CLASSIFIER_STEP = 0.002
+
+
+def sha256_file(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_artifact(path: str) -> Any:
+    if path.endswith(".joblib"):
+        if joblib is None:
+            raise ImportError("joblib is required to load .joblib models")
+        return joblib.load(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ArtifactModel(Model):
+    """
+    A deserialized artifact plus its identity.
+
+    Objects with predict_batch(features) are used as batched models;
+    objects with only a predict(df) method are called on the frame.
+    Classifier dicts such as {"predict_proba": [p_buy, p_sell, p_hold]}
+    forecast a drift proportional to p_buy - p_sell.
+    """
+
+    def __init__(self, name: str, version: str, obj: Any, nbytes: int, horizon: int = HORIZON):
+        self.name = name
+        self.version = version
+        self.obj = obj
+        self.horizon = horizon
+        # Memory accounting for the warm-model LRU (approximated by the
+        # artifact size on disk)
+        self.nbytes = nbytes
+
+    @property
+    def _classifier(self) -> bool:
+        return isinstance(self.obj, dict) and "predict_proba" in self.obj
+
+    @property
+    def batched(self) -> bool:
+        return hasattr(self.obj, "predict_batch") or self._classifier
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        if hasattr(self.obj, "predict_batch"):
+            return np.asarray(self.obj.predict_batch(features), dtype=np.float64)
+
+        if self._classifier:
+            p_buy, p_sell = self.obj["predict_proba"][:2]
+            drift = (p_buy - p_sell) * CLASSIFIER_STEP
+            price = features[:, FEATURE_NAMES.index("price")]
+            return price[:, None] * (1 + drift * np.arange(1, self.horizon + 1))
+
+        raise ValueError(f"Model artifact {self.name} has no batched predict interface")
+
+    def predict(self, df: pd.DataFrame, features: Optional[dict] = None) -> list:
+        if not self.batched and hasattr(self.obj, "predict"):
+            return [float(p) for p in self.obj.predict(df)]
+        if not self.batched:
+            raise ValueError(f"Model artifact {self.name} has no usable predict interface")
+        return super().predict(df, features)
+
+
+def load_model(name: str, path: str, version: str) -> ArtifactModel:
+    print(f">>> Loading model {name} ({version[:12]}) from {path}")
+    return ArtifactModel(name, version, load_artifact(path), os.path.getsize(path))
@@ -0,0 +1,181 @@
+"""
+Model Registry
+--------------
+Single lookup point for every model predict() can use.
+
+- Built-in models are Model instances (core.model.base) registered under
+  their name with register_model(); plain model(df) callables are wrapped.
+- Artifacts in MODELS_DIR (*.pkl / *.joblib) are discovered by file name
+  and versioned by the SHA-256 of their content.
+- Artifacts are deserialized lazily on first use and kept warm in an LRU
+  bounded by MODEL_CACHE_MB, so switching or A/B-ing models costs no
+  deserialization per request. A changed file gets a new version and
+  replaces the warm instance.
+- preload() warms selected artifacts in a background thread at startup.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from core.model.base import FrameModel, Model
+from core.model.model_loader import ARTIFACT_EXTENSIONS, load_model, sha256_file
+from core.utils.cache import LRUCache
+
+MODELS_DIR = os.getenv("MODELS_DIR", "models")
+MODEL_CACHE_MB = float(os.getenv("MODEL_CACHE_MB", "512"))
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "*")     # comma-separated names, "*" = all artifacts
+
+
+@dataclass
+class ArtifactInfo:
+    name: str
+    path: str
+    version: str          # sha256 of the file content
+    size_bytes: int
+    mtime: float
+
+
+class ModelRegistry:
+    def __init__(self, models_dir: str = MODELS_DIR, cache_mb: float = MODEL_CACHE_MB):
+        self.models_dir = models_dir
+        self._builtins: Dict[str, Model] = {}
+        self._artifacts: Dict[str, ArtifactInfo] = {}
+        self._lock = threading.Lock()
+        self._warm = LRUCache(max_bytes=int(cache_mb * 1024 * 1024), max_entries=1000)
+        self.discover()
+
+    # ---------------------------------------------------------
+    # Registration / discovery
+    # ---------------------------------------------------------
+    def register(self, name: str, model: Union[Model, Callable]):
+        """
+        Register an in-code model under `name`. Model instances get the
+        batched path; plain model(df) -> list callables are wrapped.
+        """
+        if not isinstance(model, Model):
+            model = FrameModel(name, model)
+        self._builtins[name] = model
+
+    def _scan(self, path: str, name: str) -> ArtifactInfo:
+        stat = os.stat(path)
+        known = self._artifacts.get(name)
+        if known and known.path == path and known.mtime == stat.st_mtime and known.size_bytes == stat.st_size:
+            return known
+        return ArtifactInfo(name, path, sha256_file(path), stat.st_size, stat.st_mtime)
+
+    def discover(self) -> List[ArtifactInfo]:
+        """
+        (Re)scan MODELS_DIR. Unchanged files are not re-hashed.
+        """
+        found = {}
+        if os.path.isdir(self.models_dir):
+            for entry in sorted(os.listdir(self.models_dir)):
+                name, ext = os.path.splitext(entry)
+                if ext in ARTIFACT_EXTENSIONS:
+                    found[name] = self._scan(os.path.join(self.models_dir, entry), name)
+
+        with self._lock:
+            self._artifacts = found
+        return list(found.values())
+
+    def names(self) -> List[str]:
+        return list(self._builtins) + [n for n in self._artifacts if n not in self._builtins]
+
+    def artifact(self, name: str) -> Optional[ArtifactInfo]:
+        info = self._artifacts.get(name)
+        if info is None:
+            return None
+        # Cheap stat per lookup; re-hash only if the file changed
+        try:
+            current = self._scan(info.path, name)
+        except FileNotFoundError:
+            return info
+        if current is not info:
+            with self._lock:
+                self._artifacts[name] = current
+        return current
+
+    # ---------------------------------------------------------
+    # Lookup
+    # ---------------------------------------------------------
+    def get(self, name: str) -> Model:
+        """
+        The model for `name`, loading an artifact on first use.
+        """
+        if name in self._builtins:
+            return self._builtins[name]
+
+        info = self.artifact(name)
+        if info is None:
+            raise ValueError(f"Unknown model: {name}")
+
+        # Versioned key: a new file version replaces the warm instance
+        return self._warm.get_or_fetch(
+            (name, info.version),
+            lambda: load_model(name, info.path, info.version),
+        )
+
+    def version(self, name: str) -> str:
+        if name in self._builtins:
+            return "builtin"
+        info = self.artifact(name)
+        if info is None:
+            raise ValueError(f"Unknown model: {name}")
+        return info.version[:12]
+
+    # ---------------------------------------------------------
+    # Warm-up
+    # ---------------------------------------------------------
+    def preload(self, names: Iterable[str] = None, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Load artifacts ahead of the first request. names=None or ["*"]
+        loads every discovered artifact; an empty list loads nothing.
+        """
+        names = ["*"] if names is None else list(names)
+        if "*" in names:
+            names = list(self._artifacts)
+
+        def run():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f">>> Preload failed for model {name}: {e}")
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> dict:
+        return {
+            "builtin": {name: type(m).__name__ for name, m in self._builtins.items()},
+            "artifacts": {
+                name: {"version": info.version[:12], "size_bytes": info.size_bytes, "path": info.path}
+                for name, info in self._artifacts.items()
+            },
+            "warm": self._warm.stats(),
+        }
+
+
+# Shared instance
+model_registry = ModelRegistry()
+
+
+def register_model(model: Union[Model, type], name: Optional[str] = None):
+    """
+    Registration hook for the shared registry. Takes a Model instance, or
+    decorates a Model subclass (instantiated without arguments):
+
+        @register_model
+        class MyModel(Model):
+            name = "my_model"
+            def predict_batch(self, features): ...
+    """
+    instance = model() if isinstance(model, type) else model
+    model_registry.register(name or instance.name, instance)
+    return model
@@ -0,0 +1,190 @@
+"""
+Parallel Model Execution
+------------------------
+Fans compare / rank work for several models out over a bounded process
+pool. The candle frame is placed in shared memory once per request and
+attached by each worker, and each model's result is awaited with its own
+timeout, so one slow model cannot stall the response.
+
+Pools are created on first use and reused across requests. Model
+compare / rank and backtest sweeps / walk-forward get separate pools
+(MODEL_POOL_WORKERS / BACKTEST_POOL_WORKERS), so a long sweep cannot
+starve ranking. A running task cannot be cancelled, so a timeout
+recycles the model pool: its workers are killed and the next request
+starts a fresh one. Models the spawned workers do not know (registered
+at runtime with register_model) run in-process instead.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from core.model.evaluation import walk_forward_evaluate
+from core.model.model_registry import model_registry
+from core.model.predictor import predict
+from core.utils.shared_arrays import SharedFrame, attach_frame
+
+MODEL_POOL_WORKERS = int(os.getenv("MODEL_POOL_WORKERS", str(os.cpu_count() or 1)))
+BACKTEST_POOL_WORKERS = int(os.getenv("BACKTEST_POOL_WORKERS", str(MODEL_POOL_WORKERS)))
+MODEL_TIMEOUT = float(os.getenv("MODEL_TIMEOUT", "30"))
+
+POOL_WORKERS = {"models": MODEL_POOL_WORKERS, "backtest": BACKTEST_POOL_WORKERS}
+
+_pools: Dict[str, ProcessPoolExecutor] = {}
+# Model names a fresh worker of the model pool can resolve
+_worker_models: Optional[set] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(name: str = "models") -> ProcessPoolExecutor:
+    with _pool_lock:
+        pool = _pools.get(name)
+        # A worker that died (killed, crashed) breaks the whole executor
+        if pool is None or getattr(pool, "_broken", False):
+            # spawn: the API process runs threads, which fork does not copy safely
+            pool = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS[name],
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pools[name] = pool
+    return pool
+
+
+def recycle_pool(name: str = "models"):
+    """
+    Kill the workers of pool `name` and drop it; the next get_pool()
+    starts a fresh one. Tasks of other requests running in that pool
+    fail with BrokenProcessPool and are reported as errors.
+    """
+    global _worker_models
+    with _pool_lock:
+        pool = _pools.pop(name, None)
+        if name == "models":
+            _worker_models = None
+    if pool is None:
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool():
+    global _worker_models
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        _worker_models = None
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+
+# ---------------------------------------------------------
+# Worker tasks (module level so they can be pickled)
+# ---------------------------------------------------------
+def _with_frame(descriptor, fn: Callable[[pd.DataFrame], dict]) -> dict:
+    shm, df = attach_frame(descriptor)
+    try:
+        return fn(df)
+    finally:
+        del df
+        shm.close()
+
+
+def _compare_task(descriptor, symbol: str, model: str) -> dict:
+    return _with_frame(descriptor, lambda df: predict(symbol, model, df=df))
+
+
+def _rank_task(descriptor, model: str) -> dict:
+    return _with_frame(descriptor, lambda df: walk_forward_evaluate(df, [model])[0])
+
+
+def _names_task() -> List[str]:
+    return model_registry.names()
+
+
+def worker_models() -> set:
+    """
+    Models a spawned worker resolves: built-ins registered at import time
+    and artifacts in MODELS_DIR. Asked once per process.
+    """
+    global _worker_models
+    if _worker_models is None:
+        _worker_models = set(get_pool().submit(_names_task).result(timeout=MODEL_TIMEOUT))
+    return _worker_models
+
+
+# ---------------------------------------------------------
+# Fan-out / gather
+# ---------------------------------------------------------
+def run_models(
+    df: pd.DataFrame,
+    models: List[str],
+    task: Callable,
+    *args,
+    local: Callable[[str], dict],
+    timeout: float = MODEL_TIMEOUT,
+) -> Dict[str, dict]:
+    """
+    Run task(descriptor, *args, model) for every model in the pool, and
+    local(model) in this process for models the workers do not know.
+    Returns model -> result, or {"error": ...} on failure / timeout.
+    """
+    known = worker_models()
+    remote = [m for m in models if m in known]
+    results: Dict[str, dict] = {}
+    timed_out = False
+
+    if remote:
+        pool = get_pool()
+        with SharedFrame(df) as frame:
+            descriptor = frame.descriptor()
+            submitted = time.monotonic()
+            futures = {m: pool.submit(task, descriptor, *args, m) for m in remote}
+
+            for model, future in futures.items():
+                # Every model gets `timeout` seconds from submission
+                remaining = max(0.0, submitted + timeout - time.monotonic())
+                try:
+                    results[model] = future.result(timeout=remaining)
+                except TimeoutError:
+                    timed_out = True
+                    print(">>> Model timed out:", model)
+                    results[model] = {"error": f"timeout after {timeout:.0f}s"}
+                except Exception as e:
+                    print(">>> Parallel run failed for model:", model, "error:", e)
+                    results[model] = {"error": str(e)}
+
+            if timed_out:
+                # Still running in a worker: only killing it frees the slot
+                recycle_pool("models")
+
+    for model in models:
+        if model in results:
+            continue
+        try:
+            results[model] = local(model)
+        except Exception as e:
+            print(">>> In-process run failed for model:", model, "error:", e)
+            results[model] = {"error": str(e)}
+
+    return {m: results[m] for m in models}
+
+
+def compare_parallel(symbol: str, df: pd.DataFrame, models: List[str], timeout: float = MODEL_TIMEOUT) -> dict:
+    return run_models(
+        df, models, _compare_task, symbol,
+        local=lambda m: predict(symbol, m, df=df), timeout=timeout,
+    )
+
+
+def rank_parallel(df: pd.DataFrame, models: List[str], timeout: float = MODEL_TIMEOUT) -> List[dict]:
+    results = run_models(
+        df, models, _rank_task,
+        local=lambda m: walk_forward_evaluate(df, [m])[0], timeout=timeout,
+    )
+    return [r if "model" in r else {"model": m, **r} for m, r in results.items()]
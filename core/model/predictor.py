@@ -6,48 +6,19 @@ Dual‑mode predict() to avoid repeated yfinance calls during ranking.
 
 import numpy as np
 import pandas as pd
-import math
+from core.indicators.moving_averages import MACD, SMA
+from core.indicators.rsi import IncrementalRSI
+from core.indicators.volatility import BollingerBands, ReturnVolatility
+from core.data.feature_store import feature_store
 from core.market.data_loader import load_historical_data
+from core.model.base import DriftModel
+from core.model.feature_engineering import FEATURE_NAMES, compute_indicators, feature_rows, features_from_indicators
+from core.model.model_registry import model_registry, register_model
+from core.utils.cache import prediction_cache
+from core.utils.time_utils import INTERVAL_SECONDS, now_ts
 
-
-# ---------------------------------------------------------
-# Technical Indicators
-# ---------------------------------------------------------
-
-def compute_rsi(series: pd.Series, period: int = 14) -> float:
-    delta = series.diff()
-    gain = delta.clip(lower=0).rolling(period).mean()
-    loss = -delta.clip(upper=0).rolling(period).mean()
-
-    rs = gain / loss.replace(0, np.nan)
-    rsi = 100 - (100 / (1 + rs))
-
-    value = rsi.iloc[-1]
-    return float(value) if not np.isnan(value) else 0.0
-
-
-def compute_macd(series: pd.Series):
-    ema12 = series.ewm(span=12, adjust=False).mean()
-    ema26 = series.ewm(span=26, adjust=False).mean()
-
-    macd = ema12 - ema26
-    signal = macd.ewm(span=9, adjust=False).mean()
-
-    return float(macd.iloc[-1]), float(signal.iloc[-1])
-
-
-def compute_bollinger(series: pd.Series, period: int = 20, num_std: float = 2.0):
-    sma = series.rolling(period).mean()
-    std = series.rolling(period).std()
-
-    upper = sma + num_std * std
-    lower = sma - num_std * std
-
-    return (
-        float(upper.iloc[-1]) if not np.isnan(upper.iloc[-1]) else 0.0,
-        float(lower.iloc[-1]) if not np.isnan(lower.iloc[-1]) else 0.0,
-        float(sma.iloc[-1]) if not np.isnan(sma.iloc[-1]) else 0.0,
-    )
+# History predict() works on
+PREDICT_BARS = 200
 
 
 # ---------------------------------------------------------
@@ -55,90 +26,115 @@ def compute_bollinger(series: pd.Series, period: int = 20, num_std: float = 2.0)
 # ---------------------------------------------------------
 
 def compute_features(df: pd.DataFrame) -> dict:
-    df = df.copy()
+    return features_from_indicators(compute_indicators(df["close"]))
 
-    df["return"] = df["close"].pct_change()
-    df["volatility"] = df["return"].rolling(5).std()
-    df["sma"] = df["close"].rolling(10).mean()
 
-    rsi = compute_rsi(df["close"])
-    macd, macd_signal = compute_macd(df["close"])
-    bb_upper, bb_lower, bb_mid = compute_bollinger(df["close"])
+class IncrementalFeatures:
+    """
+    Streaming counterpart of compute_features(): consumes one close at a
+    time in O(1) and returns the same feature dict.
 
-    df = df.fillna(0)
-    latest = df.iloc[-1]
+    EMAs here run over the whole stream rather than restarting at the
+    200-bar window predict() uses, so MACD can differ from the batch
+    value by the (vanishing) weight of bars older than the window.
+    """
 
-    return {
-        "return": float(latest["return"]),
-        "volatility": float(latest["volatility"]),
-        "sma": float(latest["sma"]),
-        "price": float(latest["close"]),
-        "rsi": float(rsi),
-        "macd": float(macd),
-        "macd_signal": float(macd_signal),
-        "bb_upper": float(bb_upper),
-        "bb_lower": float(bb_lower),
-        "bb_mid": float(bb_mid),
-    }
+    def __init__(self):
+        self.sma = SMA(10)
+        self.vol = ReturnVolatility(5)
+        self.rsi = IncrementalRSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.bb = BollingerBands(20, 2.0)
+        self.price = None
+
+    def update(self, close: float) -> dict:
+        close = float(close)
+        self.price = close
+        self.sma.update(close)
+        self.vol.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bb.update(close)
+        return self.features()
+
+    def features(self) -> dict:
+        # RSI is undefined (NaN; 0.0 in predict) while the average loss is zero
+        rsi = self.rsi.value if self.rsi.avg_loss else None
+        return {
+            "return": self.vol.last_return or 0.0,
+            "volatility": self.vol.value or 0.0,
+            "sma": self.sma.value or 0.0,
+            "price": self.price,
+            "rsi": rsi or 0.0,
+            "macd": self.macd.value,
+            "macd_signal": self.macd.signal_value,
+            "bb_upper": self.bb.upper or 0.0,
+            "bb_lower": self.bb.lower or 0.0,
+            "bb_mid": self.bb.mid or 0.0,
+        }
+
+    def snapshot(self) -> dict:
+        return {
+            "price": self.price,
+            "sma": self.sma.snapshot(),
+            "vol": self.vol.snapshot(),
+            "rsi": self.rsi.snapshot(),
+            "macd": self.macd.snapshot(),
+            "bb": self.bb.snapshot(),
+        }
+
+    def restore(self, state: dict) -> "IncrementalFeatures":
+        self.price = state["price"]
+        self.sma.restore(state["sma"])
+        self.vol.restore(state["vol"])
+        self.rsi.restore(state["rsi"])
+        self.macd.restore(state["macd"])
+        self.bb.restore(state["bb"])
+        return self
 
 
 # ---------------------------------------------------------
 # Feature Series (Step 4)
 # ---------------------------------------------------------
 
-def compute_feature_series(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+SERIES_FIELDS = ["rsi", "macd", "macd_signal", "sma", "bb_upper", "bb_lower", "bb_mid", "volatility"]
 
-    df["return"] = df["close"].pct_change()
-    df["volatility"] = df["return"].rolling(5).std()
-    df["sma"] = df["close"].rolling(10).mean()
 
-    delta = df["close"].diff()
-    gain = delta.clip(lower=0).rolling(14).mean()
-    loss = -delta.clip(upper=0).rolling(14).mean()
-    rs = gain / loss.replace(0, np.nan)
-    df["rsi"] = 100 - (100 / (1 + rs))
-
-    df["ema12"] = df["close"].ewm(span=12, adjust=False).mean()
-    df["ema26"] = df["close"].ewm(span=26, adjust=False).mean()
-    df["macd"] = df["ema12"] - df["ema26"]
-    df["macd_signal"] = df["macd"].ewm(span=9, adjust=False).mean()
+def compute_feature_series(df: pd.DataFrame) -> pd.DataFrame:
+    ind = compute_indicators(df["close"])
+    columns = {k: v for k, v in ind.items() if k != "close"}
+    return df.assign(**columns).fillna(0)
 
-    df["bb_mid"] = df["close"].rolling(20).mean()
-    df["bb_std"] = df["close"].rolling(20).std()
-    df["bb_upper"] = df["bb_mid"] + 2 * df["bb_std"]
-    df["bb_lower"] = df["bb_mid"] - 2 * df["bb_std"]
 
-    return df.fillna(0)
+def series_from_indicators(ind: dict) -> dict:
+    return {
+        k: np.round(np.nan_to_num(ind[k], nan=0.0), 4).tolist()
+        for k in SERIES_FIELDS
+    }
 
 
 def extract_feature_series(df: pd.DataFrame) -> dict:
-    return {
-        "rsi": df["rsi"].round(4).tolist(),
-        "macd": df["macd"].round(4).tolist(),
-        "macd_signal": df["macd_signal"].round(4).tolist(),
-        "sma": df["sma"].round(4).tolist(),
-        "bb_upper": df["bb_upper"].round(4).tolist(),
-        "bb_lower": df["bb_lower"].round(4).tolist(),
-        "bb_mid": df["bb_mid"].round(4).tolist(),
-        "volatility": df["volatility"].round(4).tolist(),
-    }
+    return {k: df[k].round(4).tolist() for k in SERIES_FIELDS}
 
 
 # ---------------------------------------------------------
 # Signal Generation
 # ---------------------------------------------------------
 
-def generate_signal(features: dict):
+RSI_LOW = 30.0
+RSI_HIGH = 70.0
+
+
+def generate_signal(features: dict, rsi_low: float = RSI_LOW, rsi_high: float = RSI_HIGH):
     price = features["price"]
     sma = features["sma"]
     rsi = features["rsi"]
     macd = features["macd"]
     macd_signal = features["macd_signal"]
 
-    if rsi < 30:
+    if rsi < rsi_low:
         return "BUY", 0.70
-    if rsi > 70:
+    if rsi > rsi_high:
         return "SELL", 0.70
 
     if macd > macd_signal:
@@ -154,33 +150,87 @@ def generate_signal(features: dict):
     return "HOLD", 0.50
 
 
+def generate_signal_series(features: dict, rsi_low: float = RSI_LOW, rsi_high: float = RSI_HIGH):
+    """
+    generate_signal() over whole feature arrays (bars, symbols, or both)
+    with the same rule precedence. Returns aligned (signal, confidence)
+    arrays of the broadcast feature shape.
+    """
+    price = np.asarray(features["price"], dtype=np.float64)
+    sma = np.asarray(features["sma"], dtype=np.float64)
+    rsi = np.asarray(features["rsi"], dtype=np.float64)
+    macd = np.asarray(features["macd"], dtype=np.float64)
+    macd_signal = np.asarray(features["macd_signal"], dtype=np.float64)
+
+    # First matching rule wins, as in the if-chain above
+    conditions = [
+        rsi < rsi_low,
+        rsi > rsi_high,
+        macd > macd_signal,
+        macd < macd_signal,
+        price > sma,
+        price < sma,
+    ]
+    signal = np.select(conditions, ["BUY", "SELL", "BUY", "SELL", "BUY", "SELL"], default="HOLD")
+    confidence = np.select(conditions, [0.70, 0.70, 0.60, 0.60, 0.55, 0.55], default=0.50)
+    return signal, confidence
+
+
+def signals_from_indicators(ind: dict, rsi_low: float = RSI_LOW, rsi_high: float = RSI_HIGH):
+    """
+    Signal and confidence for every bar of an indicator pass: element t
+    equals generate_signal() on the features of the history ending at t.
+    """
+    return generate_signal_series(dict(zip(FEATURE_NAMES, feature_rows(ind).T)), rsi_low, rsi_high)
+
+
 # ---------------------------------------------------------
 # Model Implementations
 # ---------------------------------------------------------
 
+# Per-bar drift of each built-in model's forecast path (HORIZON bars)
+MODEL_DRIFT = {
+    "baseline": 0.002,
+    "lstm": 0.003,
+    "xgboost": 0.0015,
+    "transformer": 0.0025,
+    "ensemble": 0.0022,
+}
+
+for _name, _drift in MODEL_DRIFT.items():
+    register_model(DriftModel(_name, _drift))
+
+
+def _drift_predict(df, model):
+    return model_registry.get(model).predict(df)
+
+
 def baseline_predict(df):
-    last = float(df["close"].iloc[-1])
-    return [last * (1 + 0.002 * i) for i in range(1, 11)]
+    return _drift_predict(df, "baseline")
 
 
 def lstm_predict(df):
-    last = float(df["close"].iloc[-1])
-    return [last * (1 + 0.003 * i) for i in range(1, 11)]
+    return _drift_predict(df, "lstm")
 
 
 def xgboost_predict(df):
-    last = float(df["close"].iloc[-1])
-    return [last * (1 + 0.0015 * i) for i in range(1, 11)]
+    return _drift_predict(df, "xgboost")
 
 
 def transformer_predict(df):
-    last = float(df["close"].iloc[-1])
-    return [last * (1 + 0.0025 * i) for i in range(1, 11)]
+    return _drift_predict(df, "transformer")
 
 
 def ensemble_predict(df):
-    last = float(df["close"].iloc[-1])
-    return [last * (1 + 0.0022 * i) for i in range(1, 11)]
+    return _drift_predict(df, "ensemble")
+
+
+def predict_batch(model: str, features: np.ndarray) -> np.ndarray:
+    """
+    Forecast paths [n_symbols, horizon] for a feature matrix whose rows
+    follow FEATURE_NAMES, in one call to the model.
+    """
+    return model_registry.get(model).predict_batch(np.asarray(features, dtype=np.float64))
 
 
 # ---------------------------------------------------------
@@ -188,23 +238,24 @@ def ensemble_predict(df):
 # ---------------------------------------------------------
 
 def compute_equity_curve(prices, signal):
-    df = pd.DataFrame({"price": prices})
-    df["return"] = df["price"].pct_change().fillna(0)
+    prices = np.asarray(prices, dtype=np.float64)
+    returns = np.zeros(len(prices))
+    returns[1:] = prices[1:] / prices[:-1] - 1
 
     if signal == "BUY":
-        df["strategy_return"] = df["return"]
+        strategy_return = returns
     elif signal == "SELL":
-        df["strategy_return"] = -df["return"]
+        strategy_return = -returns
     else:
-        df["strategy_return"] = 0
+        strategy_return = np.zeros(len(prices))
 
-    df["equity"] = (1 + df["strategy_return"]).cumprod()
-    df["drawdown"] = df["equity"] / df["equity"].cummax() - 1
+    equity = np.cumprod(1 + strategy_return)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
 
     return {
-        "equity_curve": df["equity"].round(4).tolist(),
-        "drawdown": df["drawdown"].round(4).tolist(),
-        "max_drawdown": float(df["drawdown"].min()),
+        "equity_curve": np.round(equity, 4).tolist(),
+        "drawdown": np.round(drawdown, 4).tolist(),
+        "max_drawdown": float(drawdown.min()),
     }
 
 
@@ -212,7 +263,7 @@ def compute_equity_curve(prices, signal):
 # DUAL‑MODE PREDICT (Normal + Ranking)
 # ---------------------------------------------------------
 
-def predict(symbol: str, model: str = "baseline", df: pd.DataFrame = None) -> dict:
+def predict(symbol: str, model: str = "baseline", df: pd.DataFrame = None, interval: str = "1m") -> dict:
     """
     Dual‑mode:
     - Normal mode: df=None → load data automatically
@@ -222,28 +273,24 @@ def predict(symbol: str, model: str = "baseline", df: pd.DataFrame = None) -> di
     if df is None:
         df = load_historical_data(symbol)
 
-    df = df.tail(200)
+    df = df.tail(PREDICT_BARS)
 
-    features = compute_features(df)
-    df_series = compute_feature_series(df)
-    feature_series = extract_feature_series(df_series)
+    # Only a frame that is the whole stored history matches the stored
+    # rows exactly; anything else gets one fused pass over df, so the
+    # result depends on df alone
+    indicators = feature_store.for_frame(symbol, interval, df)
+    if indicators is None:
+        indicators = compute_indicators(df["close"])
+    features = features_from_indicators(indicators)
+    feature_series = series_from_indicators(indicators)
+    signal_series, confidence_series = signals_from_indicators(indicators)
 
     signal, confidence = generate_signal(features)
 
     actual_prices = df["close"].astype(float).tolist()
 
-    if model == "baseline":
-        predicted_prices = baseline_predict(df)
-    elif model == "lstm":
-        predicted_prices = lstm_predict(df)
-    elif model == "xgboost":
-        predicted_prices = xgboost_predict(df)
-    elif model == "transformer":
-        predicted_prices = transformer_predict(df)
-    elif model == "ensemble":
-        predicted_prices = ensemble_predict(df)
-    else:
-        raise ValueError(f"Unknown model: {model}")
+    # Built-ins and discovered artifacts (loaded once, kept warm)
+    predicted_prices = model_registry.get(model).predict(df, features=features)
 
     upper_band = [p * 1.02 for p in predicted_prices]
     lower_band = [p * 0.98 for p in predicted_prices]
@@ -255,6 +302,7 @@ def predict(symbol: str, model: str = "baseline", df: pd.DataFrame = None) -> di
     return {
         "symbol": symbol,
         "model": model,
+        "model_version": model_registry.version(model),
         "actual_prices": actual_prices,
         "predicted_prices": predicted_prices,
         "upper_band": upper_band,
@@ -263,6 +311,10 @@ def predict(symbol: str, model: str = "baseline", df: pd.DataFrame = None) -> di
         "confidence": float(confidence),
         "features_used": features,
         "feature_series": feature_series,
+        "signal_series": {
+            "signal": signal_series.tolist(),
+            "confidence": confidence_series.tolist(),
+        },
         "feature_importance": feature_importance,
         "equity_curve": equity["equity_curve"],
         "drawdown": equity["drawdown"],
@@ -270,17 +322,69 @@ def predict(symbol: str, model: str = "baseline", df: pd.DataFrame = None) -> di
     }
 
 
+def prediction_key(symbol: str, model: str, interval: str, df: pd.DataFrame) -> tuple:
+    """
+    Cache key of a prediction over the frame predict() sees (the last
+    PREDICT_BARS rows): the number of rows and a hash of the closes, so a
+    different window or a revised close never reuses another frame's
+    prediction, then the open time of the last candle as the version
+    (see LRUCache: a new bar drops the previous bar's entries).
+    """
+    close = df["close"].tail(PREDICT_BARS).to_numpy(dtype=np.float64)
+    return (symbol, model, interval, len(close), hash(close.tobytes()), int(df["timestamp"].iloc[-1]))
+
+
+def is_cacheable(df: pd.DataFrame, interval: str) -> bool:
+    """
+    Only frames whose last candle has closed are cached: the close of a
+    still-open candle keeps changing.
+    """
+    if df.empty or "timestamp" not in df.columns:
+        return False
+    step = INTERVAL_SECONDS.get(interval)
+    return step is not None and int(df["timestamp"].iloc[-1]) + step <= now_ts()
+
+
+def cached_predict(symbol: str, model: str = "baseline", df: pd.DataFrame = None, interval: str = "1m") -> dict:
+    """
+    predict() through the shared prediction cache. Concurrent requests
+    for the same frame share one computation. The returned dict is shared
+    between callers and must not be mutated.
+    """
+    if df is None:
+        df = load_historical_data(symbol)
+    if not is_cacheable(df, interval):
+        return predict(symbol, model, df=df, interval=interval)
+
+    key = prediction_key(symbol, model, interval, df)
+    return prediction_cache.get_or_fetch(key, lambda: predict(symbol, model, df=df, interval=interval))
+
+
 # ---------------------------------------------------------
 # Model Comparison
 # ---------------------------------------------------------
 
-def compare_models(symbol: str, models: list[str]) -> dict:
+def compare_models(symbol: str, models: list[str], parallel: bool = False) -> dict:
     df = load_historical_data(symbol)
 
+    if parallel:
+        from core.model.parallel import compare_parallel
+
+        # Only models without a cached prediction for this bar go to the pool
+        cacheable = is_cacheable(df, "1m")
+        results = {m: prediction_cache.get(prediction_key(symbol, m, "1m", df)) if cacheable else None for m in models}
+        missing = [m for m, r in results.items() if r is None]
+        if missing:
+            for m, r in compare_parallel(symbol, df, missing).items():
+                if cacheable and "error" not in r:
+                    prediction_cache.put(prediction_key(symbol, m, "1m", df), r)
+                results[m] = r
+        return {"symbol": symbol, "models": results}
+
     results = {}
     for m in models:
         try:
-            results[m] = predict(symbol, m, df=df)
+            results[m] = cached_predict(symbol, m, df=df)
         except Exception as e:
             print(">>> Compare failed for model:", m, "error:", e)
             results[m] = {"error": str(e)}
@@ -293,51 +397,32 @@ def compare_models(symbol: str, models: list[str]) -> dict:
 # ---------------------------------------------------------
 
 def evaluate_model_from_df(df: pd.DataFrame, symbol: str, model: str) -> dict:
-    print(">>> Evaluating model:", model)
-
-    df = df.tail(210)
-
-    actual_returns = df["close"].pct_change().shift(-1).dropna().tolist()
-    predicted_returns = []
-
-    closes = df["close"].tolist()
-
-    for i in range(len(closes) - 1):
-        try:
-            pred = predict(symbol, model, df=df)["predicted_prices"][0]
-            last = float(closes[i])
-            predicted_returns.append((pred - last) / last)
-        except Exception as e:
-            print(">>> Prediction failed inside evaluation:", model, "error:", e)
-            predicted_returns.append(0.0)
-
-    n = min(len(actual_returns), len(predicted_returns))
-    if n == 0:
-        return {"model": model, "rmse": 999, "mae": 999, "max_drawdown": 0}
-
-    rmse = math.sqrt(sum((p - a) ** 2 for p, a in zip(predicted_returns, actual_returns)) / n)
-    mae = sum(abs(p - a) for p, a in zip(predicted_returns, actual_returns)) / n
+    """
+    Walk-forward score of one model over every step of `df`
+    (see core.model.evaluation).
+    """
+    from core.model.evaluation import walk_forward_evaluate
 
-    try:
-        dd = predict(symbol, model, df=df)["max_drawdown"]
-    except Exception as e:
-        print(">>> Drawdown failed for model:", model, "error:", e)
-        dd = 0.0
+    result = walk_forward_evaluate(df, [model])[0]
+    if "error" in result:
+        raise ValueError(result["error"])
+    return result
 
-    return {"model": model, "rmse": rmse, "mae": mae, "max_drawdown": dd}
 
+def rank_models(symbol: str, models: list[str], parallel: bool = False) -> dict:
+    from core.model.evaluation import walk_forward_evaluate
 
-def rank_models(symbol: str, models: list[str]) -> dict:
     print(">>> Ranking models:", models)
 
     df = load_historical_data(symbol)
 
-    evaluations = []
-    for m in models:
-        try:
-            evaluations.append(evaluate_model_from_df(df, symbol, m))
-        except Exception as e:
-            print(">>> Evaluation failed for model:", m, "error:", e)
+    if parallel:
+        from core.model.parallel import rank_parallel
+        evaluations = rank_parallel(df, models)
+    else:
+        # Features are built once and shared by every model
+        evaluations = walk_forward_evaluate(df, models)
+    evaluations = [e for e in evaluations if "error" not in e]
 
     ranked = sorted(evaluations, key=lambda x: (x["rmse"], abs(x["max_drawdown"])))
 
@@ -353,8 +438,8 @@ class Predictor:
     def predict(self, symbol: str, model: str = "baseline"):
         return predict(symbol, model)
 
-    def compare(self, symbol: str, models: list[str]):
-        return compare_models(symbol, models)
+    def compare(self, symbol: str, models: list[str], parallel: bool = False):
+        return compare_models(symbol, models, parallel=parallel)
 
-    def rank(self, symbol: str, models: list[str]):
-        return rank_models(symbol, models)
+    def rank(self, symbol: str, models: list[str], parallel: bool = False):
+        return rank_models(symbol, models, parallel=parallel)
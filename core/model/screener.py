@@ -0,0 +1,175 @@
+"""
+Multi-Symbol Screener
+---------------------
+Signals for a whole watchlist in one pass.
+
+Candles of every symbol are loaded concurrently (closed candles come
+from the local candle store) and aligned on a common timestamp grid into
+one close matrix [n_symbols, n_bars]. Latest-bar indicators are read
+from the feature store (or computed once over the matrix for symbols it
+does not cover), the generate_signal() rules are applied to all symbols
+at once, and the selected model scores the watchlist in one
+predict_batch() call.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.data.feature_store import feature_store
+from core.market.data_loader import load_historical_data
+from core.model.feature_engineering import FEATURE_NAMES, compute_latest_indicators, latest_features
+from core.model.model_registry import model_registry
+from core.model.predictor import generate_signal_series
+from core.utils.time_utils import granularity_to_interval
+
+SCREEN_SYMBOLS = [s for s in os.getenv("SCREEN_SYMBOLS", "BTC-EUR,ETH-EUR,SOL-EUR,XRP-EUR,ADA-EUR").split(",") if s]
+SCREEN_WORKERS = int(os.getenv("SCREEN_WORKERS", "8"))
+
+# Same history length predict() works on
+SCREEN_BARS = 200
+
+_COL = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Reused across refreshes; loads mostly hit the candle store, so
+# per-request thread start-up would dominate
+_loader = ThreadPoolExecutor(max_workers=SCREEN_WORKERS, thread_name_prefix="screen")
+
+
+# ---------------------------------------------------------
+# Aligned candle matrix
+# ---------------------------------------------------------
+def _fill_gaps(matrix: np.ndarray) -> np.ndarray:
+    """
+    Forward-fill NaN along each row (a missing candle keeps the previous
+    close); leading NaN take the first available close.
+    """
+    valid = ~np.isnan(matrix)
+    idx = np.where(valid, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], idx]
+
+    first = valid.argmax(axis=1)
+    leading = np.arange(matrix.shape[1]) < first[:, None]
+    return np.where(leading, matrix[np.arange(matrix.shape[0]), first][:, None], filled)
+
+
+def load_close_matrix(
+    symbols: List[str],
+    granularity: int = 60,
+    limit: int = SCREEN_BARS,
+) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, Dict[str, str]]:
+    """
+    Load candles for all symbols concurrently and align their closes on
+    the union of the last `limit` candle timestamps.
+
+    Returns (symbols, timestamps, close[n_symbols, n_bars], bars, errors)
+    where bars counts the real (not filled) candles per symbol and errors
+    maps symbols that could not be loaded to the reason.
+    """
+    def load(symbol):
+        try:
+            return symbol, load_historical_data(symbol, granularity=granularity, limit=limit), None
+        except Exception as e:
+            return symbol, None, str(e)
+
+    loaded = list(_loader.map(load, symbols))
+
+    errors = {symbol: error for symbol, _, error in loaded if error}
+    frames = [(symbol, df) for symbol, df, error in loaded if not error]
+    if not frames:
+        return [], np.empty(0, dtype=np.int64), np.empty((0, 0)), np.empty(0, dtype=np.int64), errors
+
+    timestamps = np.unique(np.concatenate([df["timestamp"].to_numpy(dtype=np.int64) for _, df in frames]))[-limit:]
+    matrix = np.full((len(frames), len(timestamps)), np.nan)
+    for row, (_, df) in enumerate(frames):
+        ts = df["timestamp"].to_numpy(dtype=np.int64)
+        keep = ts >= timestamps[0]
+        matrix[row, np.searchsorted(timestamps, ts[keep])] = df["close"].to_numpy(dtype=np.float64)[keep]
+
+    bars = (~np.isnan(matrix)).sum(axis=1)
+    for row in np.flatnonzero(bars == 0):
+        errors[frames[row][0]] = "no candles in the screening window"
+
+    present = bars > 0
+    names = [symbol for (symbol, _), ok in zip(frames, present) if ok]
+    return names, timestamps, _fill_gaps(matrix[present]), bars[present], errors
+
+
+# ---------------------------------------------------------
+# Screener
+# ---------------------------------------------------------
+def _latest_features(names: List[str], interval: str, last: int, close: np.ndarray) -> np.ndarray:
+    """
+    Latest feature rows: stored rows from the feature store for symbols
+    whose history ends on the grid's last bar, one matrix pass for the
+    rest (replayed data, gaps at the last bar, rows the background
+    writer has not stored yet).
+    """
+    features = np.empty((len(names), len(FEATURE_NAMES)))
+    missing = []
+    for i, symbol in enumerate(names):
+        stored = feature_store.latest(symbol, interval, update=False)
+        if len(stored["timestamp"]) and stored["timestamp"][-1] == last:
+            features[i] = latest_features(stored)[0]
+        else:
+            missing.append(i)
+
+    if missing:
+        features[missing] = latest_features(compute_latest_indicators(close[missing]))
+    return features
+
+
+SCREEN_FIELDS = ["price", "return", "volatility", "rsi", "macd", "macd_signal", "sma"]
+
+
+def screen(
+    symbols: List[str] = None,
+    model: str = "baseline",
+    granularity: int = 60,
+    limit: int = SCREEN_BARS,
+    sort_by: str = "confidence",
+) -> dict:
+    """
+    Signal, confidence, forecast return and key features for every
+    symbol, sorted by `sort_by` (descending).
+    """
+    symbols = list(symbols or SCREEN_SYMBOLS)
+    names, timestamps, close, bars, errors = load_close_matrix(symbols, granularity, limit)
+
+    rows = []
+    if names:
+        features = _latest_features(names, granularity_to_interval(granularity), timestamps[-1], close)
+        signal, confidence = generate_signal_series(dict(zip(FEATURE_NAMES, features.T)))
+
+        scorer = model_registry.get(model)
+        if not scorer.batched:
+            raise ValueError(f"Model {model} has no batched predict and cannot screen")
+        forecast = scorer.predict_batch(features)
+        price = features[:, _COL["price"]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            expected = np.nan_to_num(forecast[:, -1] / price - 1, nan=0.0, posinf=0.0, neginf=0.0)
+
+        for i, symbol in enumerate(names):
+            row = {
+                "symbol": symbol,
+                "signal": str(signal[i]),
+                "confidence": float(confidence[i]),
+                "expected_return": float(expected[i]),
+                "bars": int(bars[i]),
+            }
+            row.update({k: float(features[i, _COL[k]]) for k in SCREEN_FIELDS})
+            rows.append(row)
+
+    if rows and sort_by not in rows[0]:
+        raise ValueError(f"Cannot sort by: {sort_by}")
+    rows.sort(key=lambda r: r[sort_by], reverse=True)
+
+    return {
+        "model": model,
+        "timestamp": int(timestamps[-1]) if len(timestamps) else None,
+        "rows": rows,
+        "errors": errors,
+    }
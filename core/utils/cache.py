@@ -0,0 +1,337 @@
+"""
+Cache Utilities
+---------------
+Short-lived quote cache with single-flight deduplication, and a
+size-bounded LRU for computed results (predictions).
+
+Concurrent misses on the same key share one upstream fetch: the first
+caller fetches, the others wait for its result. Works for both threaded
+(sync FastAPI handlers) and asyncio callers.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+QUOTE_CACHE_TTL = float(os.getenv("QUOTE_CACHE_TTL", "2.0"))
+PREDICTION_CACHE_MB = float(os.getenv("PREDICTION_CACHE_MB", "64"))
+PREDICTION_CACHE_ENTRIES = int(os.getenv("PREDICTION_CACHE_ENTRIES", "10000"))
+
+
+class TTLCache:
+    def __init__(self, ttl: float = QUOTE_CACHE_TTL):
+        self.ttl = ttl
+        self._data: Dict[Hashable, tuple] = {}          # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self._inflight_async: Dict[Hashable, asyncio.Future] = {}
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fetches = 0
+        self.errors = 0
+        self.fetch_time_total = 0.0
+        self.fetch_time_max = 0.0
+
+    # ---------------------------------------------------------
+    # Helpers
+    # ---------------------------------------------------------
+    def _lookup(self, key: Hashable):
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    def _store(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def _record_fetch(self, started: float, ok: bool):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.fetches += 1
+            self.fetch_time_total += elapsed
+            self.fetch_time_max = max(self.fetch_time_max, elapsed)
+            if not ok:
+                self.errors += 1
+
+    def invalidate(self, key: Hashable = None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    # ---------------------------------------------------------
+    # Sync API
+    # ---------------------------------------------------------
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, or call fetch() once for all
+        concurrent callers that miss on the same key.
+        """
+        while True:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    self.hits += 1
+                    return value
+
+                event = self._inflight.get(key)
+                if event is None:
+                    self.misses += 1
+                    event = threading.Event()
+                    self._inflight[key] = event
+                    leader = True
+                else:
+                    self.coalesced += 1
+                    leader = False
+
+            if not leader:
+                event.wait()
+                with self._lock:
+                    found, value = self._lookup(key)
+                if found:
+                    return value
+                # Leader failed: retry (one of the waiters becomes leader)
+                continue
+
+            started = time.perf_counter()
+            try:
+                value = fetch()
+            except Exception:
+                self._record_fetch(started, ok=False)
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+                raise
+
+            self._record_fetch(started, ok=True)
+            with self._lock:
+                self._store(key, value)
+                self._inflight.pop(key, None)
+            event.set()
+            return value
+
+    # ---------------------------------------------------------
+    # Async API
+    # ---------------------------------------------------------
+    async def aget_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async counterpart of get_or_fetch(); waiters await the leader's
+        future, and an upstream error is raised in every waiter.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+
+            future = self._inflight_async.get(key)
+            if future is None:
+                self.misses += 1
+                future = asyncio.get_running_loop().create_future()
+                self._inflight_async[key] = future
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Leader was cancelled: retry (one of the waiters becomes leader)
+                return await self.aget_or_fetch(key, fetch)
+
+        started = time.perf_counter()
+        try:
+            value = await fetch()
+        except Exception as e:
+            self._record_fetch(started, ok=False)
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future does not warn
+            future.exception()
+            raise
+        else:
+            self._record_fetch(started, ok=True)
+            with self._lock:
+                self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight_async.pop(key, None)
+            # Leader left without a result (cancelled): release the waiters
+            if not future.done():
+                future.cancel()
+
+    # ---------------------------------------------------------
+    # Metrics
+    # ---------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "ttl": self.ttl,
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                "fetches": self.fetches,
+                "errors": self.errors,
+                "avg_fetch_ms": 1000 * self.fetch_time_total / self.fetches if self.fetches else 0.0,
+                "max_fetch_ms": 1000 * self.fetch_time_max,
+            }
+
+
+def approx_size(obj: Any) -> int:
+    """
+    Rough deep size in bytes of a JSON-like value (dicts, lists, scalars,
+    NumPy arrays).
+    """
+    nbytes = getattr(obj, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(approx_size(v) for v in obj)
+    return size
+
+
+class LRUCache(TTLCache):
+    """
+    Least-recently-used cache bounded by entry count and approximate
+    memory, with the same single-flight get_or_fetch() as TTLCache.
+    Entries do not expire by time.
+
+    Keys are tuples whose last element is a version (e.g. the open time
+    of the last candle) and whose first `group_size` elements (default:
+    all but the version) name the series it versions. Storing a key with
+    a new version drops every entry of the series stored under another
+    version, so results invalidate as soon as a new bar arrives; entries
+    sharing a version (e.g. differently sized windows) coexist.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = int(PREDICTION_CACHE_MB * 1024 * 1024),
+        max_entries: int = PREDICTION_CACHE_ENTRIES,
+        group_size: int = None,
+    ):
+        super().__init__(ttl=float("inf"))
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.group_size = group_size
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()   # key -> (size, value)
+        self._versions: Dict[Hashable, tuple] = {}                   # series -> (version, {keys})
+        self.bytes = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # ---------------------------------------------------------
+    # Storage hooks (called under self._lock)
+    # ---------------------------------------------------------
+    def _lookup(self, key: Hashable):
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        self._data.move_to_end(key)
+        return True, entry[1]
+
+    def _series(self, key: tuple) -> tuple:
+        return key[:-1] if self.group_size is None else key[:self.group_size]
+
+    def _drop(self, key: Hashable):
+        size, _ = self._data.pop(key)
+        self.bytes -= size
+        if isinstance(key, tuple):
+            entry = self._versions.get(self._series(key))
+            if entry is not None:
+                entry[1].discard(key)
+                if not entry[1]:
+                    del self._versions[self._series(key)]
+
+    def _store(self, key: Hashable, value: Any):
+        if key in self._data:
+            self._drop(key)
+
+        if isinstance(key, tuple):
+            series = self._series(key)
+            entry = self._versions.get(series)
+            if entry is not None and entry[0] != key[-1]:
+                for previous in list(entry[1]):
+                    self._drop(previous)
+                    self.invalidations += 1
+                entry = None
+            if entry is None:
+                entry = self._versions[series] = (key[-1], set())
+            entry[1].add(key)
+
+        size = approx_size(value)
+        if size > self.max_bytes:
+            return
+        self._data[key] = (size, value)
+        self.bytes += size
+
+        while self.bytes > self.max_bytes or len(self._data) > self.max_entries:
+            self._drop(next(iter(self._data)))
+            self.evictions += 1
+
+    # ---------------------------------------------------------
+    # Direct access
+    # ---------------------------------------------------------
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._store(key, value)
+
+    def invalidate(self, key: Hashable = None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+                self._versions.clear()
+                self.bytes = 0
+            elif key in self._data:
+                self._drop(key)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.pop("ttl")
+        with self._lock:
+            stats.update({
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            })
+        return stats
+
+
+# Shared instance for price / ticker / order book lookups
+quote_cache = TTLCache()
+
+# Shared instance for model predictions, keyed by (symbol, model,
+# interval, rows, close hash, last candle timestamp); a new last candle
+# drops every cached prediction of that (symbol, model, interval)
+prediction_cache = LRUCache(group_size=3)
@@ -0,0 +1,116 @@
+"""
+HTTP Client Pool
+----------------
+One app-scoped, keep-alive connection pool for all upstream exchange calls.
+
+- Async callers (routers) share one aiohttp.ClientSession, created at
+  FastAPI startup and closed at shutdown.
+- Sync callers (providers, loaders) share one requests.Session with a
+  pooled adapter, so connections are reused across calls and threads.
+
+Both sides use the same connection limits and timeouts.
+"""
+
+import os
+from typing import Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "20"))
+HTTP_KEEPALIVE = float(os.getenv("HTTP_KEEPALIVE", "30"))
+
+
+class HttpClientPool:
+    def __init__(
+        self,
+        timeout: float = HTTP_TIMEOUT,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_per_host: int = HTTP_MAX_PER_HOST,
+        keepalive: float = HTTP_KEEPALIVE,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.keepalive = keepalive
+
+        self._session: Optional[requests.Session] = None
+        self._async_session: Optional[aiohttp.ClientSession] = None
+
+    # ---------------------------------------------------------
+    # Sync (requests)
+    # ---------------------------------------------------------
+    def session(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.max_connections // self.max_per_host or 1,
+                pool_maxsize=self.max_per_host,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET through the shared session with the pool's default timeout.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session().get(url, **kwargs)
+
+    # ---------------------------------------------------------
+    # Async (aiohttp)
+    # ---------------------------------------------------------
+    def _new_async_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=self.keepalive,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    @property
+    def async_session(self) -> aiohttp.ClientSession:
+        """
+        The shared aiohttp session. Created lazily when startup() was not
+        called (e.g. scripts), so it must be accessed inside a running loop.
+        """
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = self._new_async_session()
+        return self._async_session
+
+    # ---------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------
+    async def startup(self):
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = self._new_async_session()
+        self.session()
+
+    async def shutdown(self):
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+        if self._session is not None:
+            self._session.close()
+        self._session = None
+
+
+# Shared instance
+http_pool = HttpClientPool()
+
+
+# ---------------------------------------------------------
+# Dependency: shared async session
+# ---------------------------------------------------------
+async def get_http_session() -> aiohttp.ClientSession:
+    return http_pool.async_session
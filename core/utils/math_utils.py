@@ -0,0 +1,63 @@
+"""
+Math Utilities
+--------------
+Small numeric building blocks shared by the incremental indicators.
+"""
+
+from typing import List, Optional
+
+
+class RingBuffer:
+    """
+    Fixed-size FIFO of floats backed by a preallocated list.
+    append() is O(1) and returns the value it evicted once full.
+    """
+
+    __slots__ = ("size", "_data", "_head", "_count")
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("RingBuffer size must be >= 1")
+        self.size = size
+        self._data = [0.0] * size
+        self._head = 0          # index of the oldest value
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.size
+
+    def append(self, value: float) -> Optional[float]:
+        if self._count < self.size:
+            self._data[(self._head + self._count) % self.size] = value
+            self._count += 1
+            return None
+
+        evicted = self._data[self._head]
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.size
+        return evicted
+
+    def oldest(self) -> Optional[float]:
+        return self._data[self._head] if self._count else None
+
+    def values(self) -> List[float]:
+        """
+        Contents, oldest first.
+        """
+        if self._count < self.size:
+            return self._data[:self._count]
+        return self._data[self._head:] + self._data[:self._head]
+
+    def snapshot(self) -> dict:
+        return {"size": self.size, "values": self.values()}
+
+    @classmethod
+    def from_snapshot(cls, state: dict) -> "RingBuffer":
+        buf = cls(state["size"])
+        for value in state["values"]:
+            buf.append(value)
+        return buf
@@ -0,0 +1,55 @@
+"""
+Rate Limiting
+-------------
+Token bucket shared by concurrent upstream requests.
+
+A bucket refills at `rate` tokens per second up to `capacity`. Each request
+takes the number of tokens matching its cost (e.g. Binance request weight)
+and blocks until enough tokens are available.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens: float) -> float:
+        """
+        Take tokens if available. Returns 0 on success, otherwise the
+        number of seconds to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        if tokens > self.capacity:
+            raise ValueError("Requested tokens exceed bucket capacity")
+        while True:
+            wait = self._take(tokens)
+            if wait == 0.0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        if tokens > self.capacity:
+            raise ValueError("Requested tokens exceed bucket capacity")
+        while True:
+            wait = self._take(tokens)
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
@@ -0,0 +1,58 @@
+"""
+Shared Arrays
+-------------
+Hands a numeric DataFrame to worker processes through one shared memory
+block instead of pickling it into every task.
+
+The parent creates a SharedFrame and passes its (small, picklable)
+descriptor to each task; workers attach a zero-copy read-only view with
+attach_frame(). The parent unlinks the block once all tasks are done.
+"""
+
+from multiprocessing import shared_memory
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SharedFrame:
+    def __init__(self, df: pd.DataFrame):
+        numeric = df.select_dtypes(include=[np.number])
+        self.columns = list(numeric.columns)
+        values = numeric.to_numpy(dtype=np.float64)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self.shape = values.shape
+        np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)[:] = values
+
+    def descriptor(self) -> Tuple[str, tuple, list]:
+        return self.shm.name, self.shape, self.columns
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_frame(descriptor: Tuple[str, tuple, list]) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    """
+    Attach to a SharedFrame from a worker. Returns the memory handle
+    (close it when done) and a DataFrame viewing the shared block.
+    """
+    name, shape, columns = descriptor
+    # Pool workers share the parent's resource tracker, so attaching
+    # does not hand ownership over: the parent still unlinks the block
+    shm = shared_memory.SharedMemory(name=name)
+
+    values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    values.flags.writeable = False
+    df = pd.DataFrame(values, columns=columns, copy=False)
+    if "timestamp" in df.columns:
+        df["timestamp"] = df["timestamp"].astype(np.int64)
+    return shm, df
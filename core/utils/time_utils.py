@@ -0,0 +1,151 @@
+"""
+Time Utilities
+--------------
+Interval labels, their length in seconds and candle bucket alignment.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+import numpy as np
+
+# Fixed-length intervals, keyed by the labels used across the providers
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "3m": 180,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "2h": 7200,
+    "4h": 14400,
+    "6h": 21600,
+    "8h": 28800,
+    "12h": 43200,
+    "1d": 86400,
+    "3d": 259200,
+    "1w": 604800,
+}
+
+# Every bar interval we serve, including calendar months
+ALL_INTERVALS = tuple(INTERVAL_SECONDS) + ("1M",)
+
+# The epoch fell on a Thursday; weekly bars open on Monday 00:00 UTC
+_WEEK_OFFSET = 4 * 86400
+
+
+def interval_seconds(interval: str) -> int:
+    """
+    Length of a fixed interval in seconds, e.g. "5m" -> 300.
+    """
+    if interval not in INTERVAL_SECONDS:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return INTERVAL_SECONDS[interval]
+
+
+def bucket_start(ts: float, interval: str) -> int:
+    """
+    Open time (epoch seconds) of the `interval` bar containing `ts`.
+    """
+    if interval == "1M":
+        dt = datetime.fromtimestamp(int(ts), tz=timezone.utc)
+        return int(datetime(dt.year, dt.month, 1, tzinfo=timezone.utc).timestamp())
+
+    step = interval_seconds(interval)
+    if interval == "1w":
+        return int((ts - _WEEK_OFFSET) // step * step + _WEEK_OFFSET)
+    return int(ts // step * step)
+
+
+def bucket_starts(ts: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Vectorized bucket_start() over an array of epoch seconds.
+    """
+    ts = np.asarray(ts, dtype=np.int64)
+    if interval == "1M":
+        months = ts.astype("datetime64[s]").astype("datetime64[M]")
+        return months.astype("datetime64[s]").astype(np.int64)
+
+    step = interval_seconds(interval)
+    if interval == "1w":
+        return (ts - _WEEK_OFFSET) // step * step + _WEEK_OFFSET
+    return ts // step * step
+
+
+def bucket_end(open_time: int, interval: str) -> int:
+    """
+    Open time of the bar following the one that opened at `open_time`.
+    """
+    return shift_bucket(open_time, interval, 1)
+
+
+def shift_bucket(open_time: int, interval: str, bars: int) -> int:
+    """
+    Open time of the bar `bars` bars after (negative: before) the one
+    that opened at `open_time`.
+    """
+    if interval == "1M":
+        dt = datetime.fromtimestamp(open_time, tz=timezone.utc)
+        months = dt.year * 12 + dt.month - 1 + bars
+        return int(datetime(months // 12, months % 12 + 1, 1, tzinfo=timezone.utc).timestamp())
+    return open_time + bars * interval_seconds(interval)
+
+
+def count_buckets(first: int, last: int, interval: str) -> int:
+    """
+    Number of `interval` bars from the one containing `first` to the one
+    containing `last`, both included.
+    """
+    a, b = bucket_start(first, interval), bucket_start(last, interval)
+    if interval == "1M":
+        da = datetime.fromtimestamp(a, tz=timezone.utc)
+        db = datetime.fromtimestamp(b, tz=timezone.utc)
+        return (db.year - da.year) * 12 + db.month - da.month + 1
+    return (b - a) // interval_seconds(interval) + 1
+
+
+def granularity_to_interval(granularity: int) -> str:
+    """
+    Map a Coinbase granularity (seconds) back to its interval label.
+    """
+    for label, seconds in INTERVAL_SECONDS.items():
+        if seconds == granularity:
+            return label
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+
+def now_ts() -> int:
+    """
+    Current UTC time in epoch seconds.
+    """
+    return int(time.time())
+
+
+def to_epoch(value: Optional[Union[int, float, str, datetime]]) -> Optional[int]:
+    """
+    Normalize an epoch (s or ms), numeric string, ISO string or datetime
+    to epoch seconds. None passes through.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return to_epoch(dt)
+    value = int(value)
+    # Millisecond timestamps
+    return value // 1000 if value > 10**11 else value
+
+
+def iso_utc(ts: int) -> str:
+    """
+    Epoch seconds -> ISO 8601 string in UTC.
+    """
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
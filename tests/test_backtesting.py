@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _candles(n, seed=0, vol=0.003):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, vol, n)))
+    return pd.DataFrame({
+        "timestamp": 1_600_000_000 + 60 * np.arange(n),
+        "open": close, "high": close, "low": close, "close": close,
+        "volume": 1.0,
+    })
+
+
+# ---------------------------------------------------------
+# Walk-forward
+# ---------------------------------------------------------
+def test_make_folds_rolling_and_expanding():
+    from core.backtesting.walk_forward import make_folds
+
+    rolling = make_folds(10, 4, 2)
+    assert [f["train"] for f in rolling] == [(0, 4), (2, 6), (4, 8)]
+    assert [f["test"] for f in rolling] == [(4, 6), (6, 8), (8, 10)]
+    assert [f["train"][0] for f in make_folds(10, 4, 2, expanding=True)] == [0, 0, 0]
+
+
+def test_walk_forward_endpoint_loads_requested_bars(monkeypatch):
+    from backend.routers import backtest
+
+    loaded = {}
+
+    def load(symbol, granularity=60, limit=300):
+        loaded["limit"] = limit
+        return _candles(limit)
+
+    monkeypatch.setattr(backtest, "load_historical_data", load)
+    result = backtest.walk_forward_backtest(
+        symbol="TEST-EUR", bars=2000, train=1000, test=500, expanding=False,
+        rsi_low="30", rsi_high="70", risk_pct="2", objective="sharpe_ratio",
+    )
+
+    assert loaded["limit"] == 2000
+    assert "error" not in result
+    assert len(result["folds"]) == 2
+    assert len(result["equity_curve"]) == 1000
+
+    too_short = backtest.walk_forward_backtest(
+        symbol="TEST-EUR", bars=1000, train=1000, test=500, expanding=False,
+        rsi_low="30", rsi_high="70", risk_pct="2", objective="sharpe_ratio",
+    )
+    assert "exceeds" in too_short["error"]
+
+
+def test_sweep_rejects_oversized_requests(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend.routers import backtest
+    from core.backtesting.sweep import SWEEP_MAX_CONFIGS
+
+    def load(symbol, granularity=60, limit=300):
+        raise AssertionError("history loaded for a rejected sweep")
+
+    monkeypatch.setattr(backtest, "load_historical_data", load)
+    monkeypatch.setattr(backtest, "SWEEP_MAX_CONFIGS", 8)
+    app = FastAPI()
+    app.include_router(backtest.router)
+    client = TestClient(app)
+
+    # 3 x 3 x 1 = 9 configurations
+    wide = {"rsi_low": "25,30,35", "rsi_high": "65,70,75", "risk_pct": "1"}
+    response = client.get("/sweep", params=wide)
+    assert response.status_code == 422
+    assert "9 configurations" in response.json()["detail"]
+    assert client.get("/walk_forward", params=wide).status_code == 422
+
+    # The samples bound is fixed when the route is declared
+    assert client.get("/sweep", params={"samples": SWEEP_MAX_CONFIGS + 1}).status_code == 422
+    assert client.get("/sweep", params={"samples": -1}).status_code == 422
+
+
+# ---------------------------------------------------------
+# Event-driven simulator
+# ---------------------------------------------------------
+def _bars(rows):
+    return pd.DataFrame(rows, columns=["timestamp", "open", "high", "low", "close"])
+
+
+def test_on_bar_orders_do_not_fill_inside_their_bar():
+    from core.backtesting.simulator import Simulator, Strategy
+
+    class BuyOnFirstBar(Strategy):
+        def on_bar(self, sim, bar):
+            if bar.start == 0:
+                assert sim.now == 60
+                sim.submit("X", "BUY", 1)
+
+    sim = Simulator(BuyOnFirstBar(), cash=1000)
+    sim.add_bars("X", _bars([(0, 100, 111, 99, 110), (60, 111, 112, 110, 111)]))
+    # Ticks inside the first bar, then the first tick after its close
+    sim.add_ticks("X", [10, 30, 50, 60, 70], [100, 101, 102, 111, 112])
+    result = sim.run()
+
+    assert [(f["time"], f["price"]) for f in result["fills"]] == [(60, 111)]
+
+
+def test_bar_orders_fill_at_next_open_and_limits_at_limit():
+    from core.backtesting.simulator import LIMIT, Simulator, Strategy
+
+    class Orders(Strategy):
+        def on_bar(self, sim, bar):
+            if bar.start == 0:
+                sim.submit("X", "BUY", 2)
+                sim.submit("X", "SELL", 1, type=LIMIT, limit=105)
+
+    sim = Simulator(Orders(), cash=1000)
+    sim.add_bars("X", _bars([(0, 100, 101, 99, 100), (60, 102, 103, 101, 102), (120, 103, 106, 102, 104)]))
+    result = sim.run()
+
+    assert [(f["side"], f["price"], f["qty"]) for f in result["fills"]] == [("BUY", 102, 2), ("SELL", 105, 1)]
+    assert result["positions"] == {"X": 1}
+    assert result["cash"] == 1000 - 2 * 102 + 105
+    assert result["equity_times"] == [60, 120, 180]
+
+
+@pytest.mark.parametrize("latency,price", [(0.0, 102), (10.0, 103)])
+def test_latency_moves_bar_fill_to_next_bar(latency, price):
+    from core.backtesting.simulator import FixedLatency, Simulator, Strategy
+
+    class BuyOnFirstBar(Strategy):
+        def on_bar(self, sim, bar):
+            if bar.start == 0:
+                sim.submit("X", "BUY", 1)
+
+    sim = Simulator(BuyOnFirstBar(), cash=1000, latency=FixedLatency(latency))
+    sim.add_bars("X", _bars([(0, 100, 101, 99, 100), (60, 102, 103, 101, 102), (120, 103, 106, 102, 104)]))
+    result = sim.run()
+
+    # An order reaching the book at 70 cannot trade at the 60 open
+    assert [f["price"] for f in result["fills"]] == [price]
+
+
+def test_signal_strategy_fills_at_next_open():
+    from core.backtesting.simulator import PercentFee, SignalStrategy, Simulator
+
+    df = _candles(600, seed=4)
+    strategy = SignalStrategy(df, "X")
+    sim = Simulator(strategy, fee=PercentFee(0.0))
+    sim.add_bars("X", df)
+    result = sim.run()
+
+    assert len(result["equity_curve"]) == len(df)
+    # Every fill happens at the open of the bar after its signal
+    opens = dict(zip(df["timestamp"] + 60, df["open"]))
+    assert all(f["price"] == opens[f["time"]] for f in result["fills"])
+
+
+# ---------------------------------------------------------
+# Backtester: vectorized mode
+# ---------------------------------------------------------
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+@pytest.mark.parametrize("rsi_low,rsi_high,risk_pct", [(30, 70, 2.0), (40, 60, 1.0), (45, 55, 5.0)])
+def test_vectorized_backtest_matches_loop(seed, rsi_low, rsi_high, risk_pct):
+    from core.backtesting.backtester import Backtester
+
+    df = _candles(600, seed=seed)
+    params = {"rsi_low": rsi_low, "rsi_high": rsi_high, "risk_pct": risk_pct}
+
+    loop = Backtester(**params).run(df, "X", vectorized=False)
+    fast = Backtester(**params).run(df, "X", vectorized=True)
+
+    assert loop["trades"], "thresholds should produce trades"
+    assert fast["trades"] == loop["trades"]
+    assert fast["equity_curve"] == loop["equity_curve"]
+    assert fast["results"] == loop["results"]
+    assert fast["metrics"] == loop["metrics"]
+
+
+def test_vectorized_backtest_short_history():
+    from core.backtesting.backtester import WARMUP_BARS, Backtester
+
+    df = _candles(WARMUP_BARS + 3)
+    assert Backtester().run(df, "X", vectorized=True) == Backtester().run(df, "X", vectorized=False)
+
+
+# ---------------------------------------------------------
+# Monte Carlo
+# ---------------------------------------------------------
+def test_monte_carlo_identity_path_matches_backtest_metrics():
+    from core.backtesting.backtester import Backtester
+    from core.backtesting.monte_carlo import monte_carlo
+
+    result = Backtester().run(_candles(600, seed=3, vol=0.01), symbol="TEST-EUR")
+    mc = monte_carlo(result, paths=100, seed=0)
+
+    assert mc["source"] == "returns"
+    for name, value in mc["observed"].items():
+        assert value == pytest.approx(result["metrics"][name], rel=1e-9, abs=1e-12)
+
+
+def test_monte_carlo_rejects_zero_paths():
+    from core.backtesting.monte_carlo import monte_carlo
+
+    with pytest.raises(ValueError):
+        monte_carlo({"equity_curve": [1.0, 1.1, 1.2], "trades": []}, paths=0)
+
+
+def test_monte_carlo_endpoint_validates_paths():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend.routers import backtest
+
+    app = FastAPI()
+    app.include_router(backtest.router)
+    client = TestClient(app)
+    assert client.get("/monte_carlo", params={"paths": 0}).status_code == 422
+    assert client.get("/monte_carlo", params={"paths": backtest.MC_MAX_PATHS + 1}).status_code == 422
+    assert client.get("/monte_carlo", params={"source": "bars"}).status_code == 422
+    assert client.get("/monte_carlo", params={"confidence": 1}).status_code == 422
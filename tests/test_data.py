@@ -0,0 +1,570 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data.candle_store import CandleStore
+from core.data.feature_store import FeatureStore
+from core.data.kline_parser import Candles
+from core.market import data_loader
+from core.utils.cache import TTLCache
+
+NOW = 1_700_000_000 // 60 * 60 + 30      # half-way through a 1m candle
+LAST_CLOSED = NOW // 60 * 60 - 60
+
+
+def _close(ts):
+    return 100 + (np.asarray(ts) // 60 % 1000) / 10
+
+
+def _frame(first, last):
+    ts = np.arange(first, last + 1, 60)
+    c = _close(ts)
+    return pd.DataFrame({"timestamp": ts, "open": c, "high": c, "low": c, "close": c, "volume": 1.0})
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    """
+    data_loader against temporary stores and a fake Coinbase that serves
+    every minute up to the still-open candle. Returns the fetched windows.
+    """
+    candles = CandleStore(str(tmp_path / "candles"))
+    monkeypatch.setattr(data_loader, "candle_store", candles)
+    monkeypatch.setattr(data_loader, "feature_store", FeatureStore(str(tmp_path / "features"), candles))
+    monkeypatch.setattr(data_loader, "now_ts", lambda: NOW)
+    monkeypatch.setattr(data_loader, "_backfilled", {})
+    monkeypatch.setattr(data_loader, "_covered", {})
+
+    windows = []
+
+    def fetch_window(symbol, granularity, window):
+        first, last, count = window
+        assert count <= 300
+        windows.append(window)
+        ts = np.arange(first, min(last, NOW // 60 * 60) + 1, granularity)
+        c = _close(ts)
+        return Candles(ts, c, c, c, c, np.ones(len(ts)))
+
+    monkeypatch.setattr(data_loader._coinbase, "_fetch_window", fetch_window)
+    return candles, windows
+
+
+def _assert_contiguous(df):
+    assert np.all(np.diff(df["timestamp"].to_numpy()) == 60)
+
+
+def test_cold_store_fetches_limit_closed_candles(loader):
+    candles, windows = loader
+
+    df = data_loader.load_historical_data("BTC-EUR", limit=1000)
+
+    assert len(df) == 1000
+    assert df["timestamp"].iloc[-1] == LAST_CLOSED
+    _assert_contiguous(df)
+    assert len(windows) == 4
+    np.testing.assert_array_equal(df["close"], _close(df["timestamp"]))
+
+
+def test_stale_store_is_filled_without_gaps(loader):
+    candles, windows = loader
+    stale = LAST_CLOSED - 1000 * 60
+    candles.append("BTC-EUR", "1m", _frame(stale - 299 * 60, stale))
+
+    df = data_loader.load_historical_data("BTC-EUR", limit=300)
+    assert len(df) == 300
+    assert df["timestamp"].iloc[-1] == LAST_CLOSED
+    _assert_contiguous(df)
+
+    full = candles.read("BTC-EUR", "1m")
+    assert len(full) == 1300
+    _assert_contiguous(full)
+
+
+def test_short_store_is_backfilled_to_limit(loader):
+    candles, windows = loader
+    candles.append("BTC-EUR", "1m", _frame(LAST_CLOSED - 99 * 60, LAST_CLOSED))
+
+    df = data_loader.load_historical_data("BTC-EUR", limit=5000)
+    assert len(df) == 5000
+    _assert_contiguous(df)
+
+    # Backfilled once: the next call is served from the store
+    fetched = len(windows)
+    data_loader.load_historical_data("BTC-EUR", limit=5000)
+    assert len(windows) == fetched
+
+
+def test_backfill_resets_feature_store(loader):
+    candles, _ = loader
+    candles.append("BTC-EUR", "1m", _frame(LAST_CLOSED - 99 * 60, LAST_CLOSED))
+    features = data_loader.feature_store
+    assert len(features.read("BTC-EUR", "1m", update=True)["timestamp"]) == 100
+
+    data_loader.load_historical_data("BTC-EUR", limit=400)
+    features.flush()
+
+    stored = features.read("BTC-EUR", "1m")
+    assert len(stored["timestamp"]) == 400
+    assert stored["timestamp"][0] == candles.first_timestamp("BTC-EUR", "1m")
+
+
+def test_quiet_minutes_are_not_refetched(loader, monkeypatch):
+    candles, windows = loader
+    fetch = data_loader._coinbase._fetch_window
+
+    # Illiquid pair: no trades (so no candles) in the last 5 minutes
+    def quiet(symbol, granularity, window):
+        page = fetch(symbol, granularity, window)
+        return page.until(LAST_CLOSED - 5 * 60)
+
+    monkeypatch.setattr(data_loader._coinbase, "_fetch_window", quiet)
+    data_loader.load_historical_data("BTC-EUR", limit=300)
+    fetched = len(windows)
+
+    df = data_loader.load_historical_data("BTC-EUR", limit=300)
+    assert len(windows) == fetched
+    assert df["timestamp"].iloc[-1] == LAST_CLOSED - 5 * 60
+
+
+def test_candle_store_read_during_prepend_is_aligned(tmp_path):
+    import threading
+
+    store = CandleStore(str(tmp_path))
+    store.append("ETH-EUR", "1m", _frame(600_000, 1_200_000))
+    done = threading.Event()
+    bad = []
+
+    def reader():
+        while not done.is_set():
+            df = store.read("ETH-EUR", "1m")
+            if not np.array_equal(df["close"], _close(df["timestamp"])):
+                bad.append(len(df))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for k in range(1, 20):
+        store.prepend("ETH-EUR", "1m", _frame(600_000 - k * 6000, 600_000))
+    done.set()
+    thread.join()
+    assert not bad
+
+
+def test_candle_store_prepend_keeps_order(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append("ETH-EUR", "1m", _frame(6000, 9000))
+    assert store.prepend("ETH-EUR", "1m", _frame(0, 6000)) == 100
+
+    df = store.read("ETH-EUR", "1m")
+    assert df["timestamp"].iloc[0] == 0 and df["timestamp"].iloc[-1] == 9000
+    _assert_contiguous(df)
+
+
+# ---------------------------------------------------------
+# Replay
+# ---------------------------------------------------------
+def test_replay_walks_through_the_capture(tmp_path):
+    from core.data.market_data import ReplayProvider
+
+    CandleStore(str(tmp_path)).append("BTC-EUR", "1m", _frame(6000, 6000 + 9 * 60))
+    replay = ReplayProvider(str(tmp_path))
+
+    # Starts when the first candle closes and serves one more bar per request
+    seen = [replay.get_ohlc("BTC-EUR", "1m", limit=3)["timestamp"].iloc[-1] for _ in range(12)]
+    assert seen[:10] == list(range(6000, 6000 + 10 * 60, 60))
+    # ... and stops at the end of the capture
+    assert seen[10:] == [6000 + 9 * 60] * 2
+    assert replay.clock.finished()
+
+    # Tickers follow the clock without moving it
+    now = replay.clock.now()
+    assert replay.get_ticker("BTC-EUR")["price"] == _close(6000 + 9 * 60)
+    assert replay.clock.now() == now
+
+
+def test_replay_clock_stops_at_end_of_capture(tmp_path):
+    from core.data.market_data import ReplayProvider
+
+    CandleStore(str(tmp_path)).append("BTC-EUR", "1m", _frame(6000, 6000 + 9 * 60))
+    replay = ReplayProvider(str(tmp_path), speed=1e6, start=6060)
+    time.sleep(0.01)
+    assert replay.clock.now() == 6000 + 10 * 60
+    assert replay._read("BTC-EUR", "1m", limit=100)["timestamp"].iloc[-1] == 6000 + 9 * 60
+
+
+# ---------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------
+def _native(calls):
+    """Fake provider get_ohlc: `limit` bars ending at `end`, close = open time."""
+    from core.utils.time_utils import interval_seconds
+
+    def get_ohlc(symbol, interval, limit=200, end=None):
+        calls.append((interval, limit))
+        step = interval_seconds(interval)
+        last = (NOW if end is None else end) // step * step
+        ts = np.arange(last - (limit - 1) * step, last + 1, step)
+        c = ts.astype(float)
+        return pd.DataFrame({"timestamp": ts, "open": c, "high": c, "low": c, "close": c, "volume": 1.0})
+
+    return get_ohlc
+
+
+@pytest.fixture
+def rollup_market(tmp_path, monkeypatch):
+    from core.data import market_data, resample
+
+    clock = [NOW]
+    monkeypatch.setattr(resample, "now_ts", lambda: clock[0])
+    monkeypatch.setattr(market_data, "now_ts", lambda: clock[0])
+    store = CandleStore(str(tmp_path))
+    market = market_data.MarketData("coinbase", rollups=resample.StoreRollup(store))
+    calls = []
+    monkeypatch.setattr(market.provider, "get_ohlc", _native(calls))
+    return market, store, clock, calls
+
+
+def test_rollup_is_built_from_stored_minutes(rollup_market):
+    from core.data.resample import resample
+
+    market, store, clock, calls = rollup_market
+    first = LAST_CLOSED // 14400 * 14400 - 3 * 14400
+    store.append("BTC-EUR", "1m", _frame(first, LAST_CLOSED))
+
+    df = market.get_historical_data("BTC-EUR", "4h", limit=3)
+    assert not calls
+    expected = resample(store.read("BTC-EUR", "1m"), "4h").tail(3).reset_index(drop=True)
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+    # New minutes only extend the open bar
+    store.append("BTC-EUR", "1m", _frame(LAST_CLOSED + 60, LAST_CLOSED + 300))
+    clock[0] += 300
+    df = market.get_historical_data("BTC-EUR", "4h", limit=3)
+    expected = resample(store.read("BTC-EUR", "1m"), "4h").tail(3).reset_index(drop=True)
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+    assert not calls
+
+
+def test_rollup_falls_back_to_the_exchange(rollup_market):
+    market, store, clock, calls = rollup_market
+    store.append("BTC-EUR", "1m", _frame(LAST_CLOSED - 600, LAST_CLOSED))
+
+    # Older than the stored minutes: 4h rolled up from native 1h bars
+    df = market.get_historical_data("BTC-EUR", "4h", limit=5)
+    assert calls == [("1h", 24)]
+    assert len(df) == 5 and np.all(np.diff(df["timestamp"]) == 14400)
+
+    # A store that lags behind now is not served either
+    calls.clear()
+    clock[0] += 600
+    market.get_historical_data("BTC-EUR", "4h", limit=1)
+    assert calls
+
+
+def test_monthly_bars_from_a_start_date(rollup_market):
+    from core.utils.time_utils import to_epoch
+
+    market, _, clock, calls = rollup_market
+    clock[0] = to_epoch("2023-07-01T00:00:00Z")
+
+    df = market.get_historical_data("BTC-EUR", "1M", start="2023-01-01", end="2023-06-15")
+    assert [str(pd.Timestamp(t, unit="s").date()) for t in df["timestamp"]] == [
+        "2023-01-01", "2023-02-01", "2023-03-01", "2023-04-01", "2023-05-01", "2023-06-01",
+    ]
+    assert calls[0][0] == "1d"
+
+
+def test_kraken_rejects_more_than_it_serves():
+    from core.data.market_data import KrakenProvider, MarketData
+
+    with pytest.raises(ValueError, match="at most 720"):
+        MarketData("kraken").get_historical_data("BTC-EUR", "1d", limit=KrakenProvider.MAX_CANDLES + 1)
+
+
+# ---------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------
+def test_quiet_symbol_bar_closes_on_the_clock():
+    from core.data.streaming import StreamIngestor, Trade, TradeSource
+
+    bars = []
+    ingestor = StreamIngestor(TradeSource(), intervals=["1m", "5m"], grace=2)
+    ingestor.subscribe(bars.append)
+    for ts in (6000, 6010, 6030):
+        ingestor.on_trade(Trade("BTC-EUR", ts, 100.0 + ts % 7, 1.0))
+
+    assert not ingestor.flush(6061)          # within the grace period
+    closed = ingestor.flush(6062)
+    assert [(b.interval, b.timestamp, b.trades) for b in closed] == [("1m", 6000, 3)]
+    assert bars == closed
+
+    # A trade still in flight for the flushed bar does not reopen it
+    ingestor.on_trade(Trade("BTC-EUR", 6050, 1.0, 1.0))
+    assert ingestor.current_bar("BTC-EUR", "1m") is None
+    assert ingestor.current_bar("BTC-EUR", "5m").trades == 4
+
+    ingestor.on_trade(Trade("BTC-EUR", 6070, 101.0, 1.0))
+    assert ingestor.current_bar("BTC-EUR", "1m").timestamp == 6060
+    assert len(bars) == 1
+
+
+def test_stream_run_flushes_while_the_source_is_quiet():
+    from core.data.streaming import StreamIngestor, Trade, TradeSource
+
+    class QuietSource(TradeSource):
+        clock = 6000.0
+
+        def now(self):
+            return self.clock
+
+        async def __aiter__(self):
+            yield Trade("BTC-EUR", 6000, 100.0, 1.0)
+            await asyncio.sleep(10)
+
+    source = QuietSource()
+    ingestor = StreamIngestor(source, intervals=["1m"], grace=0, flush_every=0.01)
+    closed = []
+
+    async def main():
+        got = asyncio.Event()
+        ingestor.subscribe(lambda bar: (closed.append(bar), got.set()))
+        task = asyncio.create_task(ingestor.run())
+        await asyncio.sleep(0.05)
+        assert not closed
+        source.clock = 6060.0
+        await asyncio.wait_for(got.wait(), 1)
+        task.cancel()
+
+    asyncio.run(main())
+    assert [(b.timestamp, b.closed) for b in closed] == [(6000, True)]
+
+
+def test_start_stream_is_off_without_symbols():
+    from core.data.streaming import start_stream
+
+    assert start_stream([]) == []
+
+
+# ---------------------------------------------------------
+# Quote cache
+# ---------------------------------------------------------
+def test_ttl_cache_single_flight():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_fetch("k", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == [42] * 5
+    assert len(calls) == 1
+    assert cache.get_or_fetch("k", lambda: 0) == 42
+
+
+def test_ttl_cache_cancelled_leader_releases_waiters():
+    cache = TTLCache(ttl=60)
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def slow():
+            gate.set()
+            await asyncio.sleep(10)
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        leader = asyncio.create_task(cache.aget_or_fetch("k", slow))
+        await gate.wait()
+        waiter = asyncio.create_task(cache.aget_or_fetch("k", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        # The waiter retries as the new leader instead of hanging
+        assert await asyncio.wait_for(waiter, 1) == "fast"
+        assert not cache._inflight_async
+        assert await asyncio.wait_for(cache.aget_or_fetch("k", fast), 1) == "fast"
+
+    asyncio.run(main())
+
+
+# ---------------------------------------------------------
+# Feature store
+# ---------------------------------------------------------
+def test_feature_store_matches_full_computation(tmp_path):
+    from core.model.feature_engineering import compute_indicators
+
+    candles = CandleStore(str(tmp_path / "candles"))
+    features = FeatureStore(str(tmp_path / "features"), candles)
+    df = _frame(0, 599 * 60)
+    candles.append("BTC-EUR", "1m", df.iloc[:400])
+    features.update("BTC-EUR", "1m")
+    candles.append("BTC-EUR", "1m", df)
+
+    stored = features.read("BTC-EUR", "1m")
+    expected = compute_indicators(df["close"].to_numpy())
+    assert len(stored["timestamp"]) == 600
+    for name, values in stored.items():
+        if name != "timestamp":
+            np.testing.assert_allclose(values, expected[name], rtol=1e-12, atol=1e-12)
+
+
+def test_feature_store_sees_rows_written_by_another_process(tmp_path):
+    candles = CandleStore(str(tmp_path / "candles"))
+    reader = FeatureStore(str(tmp_path / "features"), candles)
+    writer = FeatureStore(str(tmp_path / "features"), candles)
+
+    candles.append("BTC-EUR", "1m", _frame(0, 99 * 60))
+    assert len(reader.read("BTC-EUR", "1m")["timestamp"]) == 100
+
+    candles.append("BTC-EUR", "1m", _frame(0, 199 * 60))
+    assert writer.update("BTC-EUR", "1m") == 100
+
+    # The reader's cached memmaps are replaced, not served stale
+    assert reader.update("BTC-EUR", "1m") == 0
+    assert len(reader.read("BTC-EUR", "1m", update=False)["timestamp"]) == 200
+    assert reader.last_timestamp("BTC-EUR", "1m") == 199 * 60
+
+    writer.reset("BTC-EUR", "1m")
+    assert reader.last_timestamp("BTC-EUR", "1m") is None
+
+
+def test_loader_updates_features_in_the_background(loader):
+    candles, _ = loader
+    features = data_loader.feature_store
+
+    data_loader.load_historical_data("BTC-EUR", limit=300)
+    features.flush()
+    assert features.last_timestamp("BTC-EUR", "1m") == LAST_CLOSED
+
+
+def test_feature_store_writers_in_two_processes_do_not_interleave(tmp_path):
+    import threading
+
+    from core.model.feature_engineering import compute_indicators
+
+    candles = CandleStore(str(tmp_path / "candles"))
+    # Separate instances share nothing in memory, like two processes
+    stores = [FeatureStore(str(tmp_path / "features"), candles) for _ in range(4)]
+    df = _frame(0, 2999 * 60)
+    candles.append("BTC-EUR", "1m", df)
+
+    threads = [threading.Thread(target=s.update, args=("BTC-EUR", "1m")) for s in stores]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stored = stores[0].read("BTC-EUR", "1m", update=False)
+    np.testing.assert_array_equal(stored["timestamp"], df["timestamp"])
+    np.testing.assert_allclose(stored["ema26"], compute_indicators(df["close"])["ema26"], rtol=1e-12)
+
+
+def test_for_frame_only_serves_the_stored_history_from_its_start(tmp_path):
+    candles = CandleStore(str(tmp_path / "candles"))
+    features = FeatureStore(str(tmp_path / "features"), candles)
+    df = _frame(0, 499 * 60)
+    candles.append("BTC-EUR", "1m", df)
+
+    # Nothing stored yet, and for_frame does not write
+    assert features.for_frame("BTC-EUR", "1m", df) is None
+    assert features.count("BTC-EUR", "1m") == 0
+
+    features.update("BTC-EUR", "1m")
+    assert features.for_frame("BTC-EUR", "1m", df) is not None
+    # A tail window has EMAs seeded earlier than its own first bar
+    assert features.for_frame("BTC-EUR", "1m", df.tail(200)) is None
+
+
+# ---------------------------------------------------------
+# Candle endpoints
+# ---------------------------------------------------------
+class _Response:
+    def __init__(self, body):
+        self.status = 200
+        self.body = body
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _CoinbaseSession:
+    """Serves every candle of the requested window, newest first."""
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, params=None):
+        from urllib.parse import unquote, urlparse
+
+        from core.utils.time_utils import to_epoch
+
+        self.urls.append(url)
+        query = dict(unquote(p).split("=", 1) for p in urlparse(url).query.split("&") if p)
+        query.update(params or {})
+        step = int(query["granularity"])
+        first, last = to_epoch(query["start"]), to_epoch(query["end"])
+        rows = [[t, 1.0, 3.0, 2.0, float(t), 5.0] for t in range(last, first - 1, -step)]
+        return _Response(json.dumps(rows).encode())
+
+
+def test_market_candles_pages_and_encodes_columns(monkeypatch):
+    from backend.routers import market_candles
+
+    monkeypatch.setattr(market_candles, "now_ts", lambda: NOW)
+    session = _CoinbaseSession()
+    response = asyncio.run(market_candles.get_candles(
+        symbol="BTC-EUR", granularity=60, limit=700, session=session,
+    ))
+
+    candles = json.loads(response.body)["candles"]
+    assert len(session.urls) == 3
+    assert len(candles) == 700
+    assert candles[-1] == {
+        "timestamp": NOW // 60 * 60, "open": 2.0, "high": 3.0, "low": 1.0,
+        "close": float(NOW // 60 * 60), "volume": 5.0,
+    }
+    assert all(b["timestamp"] - a["timestamp"] == 60 for a, b in zip(candles, candles[1:]))
+
+
+def test_candle_endpoints_document_their_shape():
+    from fastapi import FastAPI
+
+    from backend.routers import market_candles
+
+    app = FastAPI()
+    app.include_router(market_candles.router)
+    schema = app.openapi()
+    ok = schema["paths"]["/market/candles"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert ok["$ref"].endswith("/CandlesOut")
+    assert "volume" in schema["components"]["schemas"]["CandleWithVolume"]["properties"]
+
+
+def test_market_candles_limit_is_bounded():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend.routers import market_candles
+
+    app = FastAPI()
+    app.include_router(market_candles.router)
+    response = TestClient(app).get("/market/candles", params={
+        "symbol": "BTC-EUR", "granularity": 60, "limit": market_candles.MAX_CANDLES + 1,
+    })
+    assert response.status_code == 422
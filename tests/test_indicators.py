@@ -0,0 +1,115 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.indicators.moving_averages import EMA, MACD, SMA
+from core.indicators.rsi import IncrementalRSI, compute_rsi
+from core.indicators.volatility import BollingerBands, ReturnVolatility
+from core.model.feature_engineering import compute_indicators
+
+
+def _closes(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    # A steady climb: no losses in the RSI window, so RSI is undefined
+    close[150:180] = close[149] * (1 + 0.001 * np.arange(1, 31))
+    return close
+
+
+def _stream(indicator, values, read):
+    out = []
+    for v in values:
+        indicator.update(float(v))
+        value = read(indicator)
+        out.append(np.nan if value is None else value)
+    return np.array(out)
+
+
+def _assert_same(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+# ---------------------------------------------------------
+# Batch equivalence
+# ---------------------------------------------------------
+def test_sma_matches_rolling_mean():
+    close = _closes()
+    _assert_same(_stream(SMA(10), close, lambda i: i.value), pd.Series(close).rolling(10).mean())
+
+
+def test_ema_matches_ewm():
+    close = _closes()
+    _assert_same(_stream(EMA(12), close, lambda i: i.value), pd.Series(close).ewm(span=12, adjust=False).mean())
+
+
+def test_macd_matches_compute_indicators():
+    close = _closes()
+    ind = compute_indicators(close)
+    _assert_same(_stream(MACD(12, 26, 9), close, lambda i: i.value), ind["macd"])
+    _assert_same(_stream(MACD(12, 26, 9), close, lambda i: i.signal_value), ind["macd_signal"])
+
+
+def test_rsi_matches_batch_and_is_undefined_without_losses():
+    close = _closes()
+    rsi = _stream(IncrementalRSI(14), close, lambda i: i.value)
+
+    _assert_same(rsi, compute_indicators(close)["rsi"])
+    _assert_same(rsi, compute_rsi(pd.Series(close)))
+    assert np.isnan(rsi[179])
+
+
+def test_bollinger_matches_compute_indicators():
+    close = _closes()
+    ind = compute_indicators(close)
+    _assert_same(_stream(BollingerBands(20, 2.0), close, lambda i: i.upper), ind["bb_upper"])
+    _assert_same(_stream(BollingerBands(20, 2.0), close, lambda i: i.lower), ind["bb_lower"])
+    _assert_same(_stream(BollingerBands(20, 2.0), close, lambda i: i.mid), ind["bb_mid"])
+
+
+def test_return_volatility_matches_compute_indicators():
+    close = _closes()
+    _assert_same(_stream(ReturnVolatility(5), close, lambda i: i.value), compute_indicators(close)["volatility"])
+
+
+# ---------------------------------------------------------
+# Snapshot / restore
+# ---------------------------------------------------------
+@pytest.mark.parametrize("make, read", [
+    (lambda: SMA(10), lambda i: i.value),
+    (lambda: EMA(12), lambda i: i.value),
+    (lambda: MACD(12, 26, 9), lambda i: (i.value, i.signal_value)),
+    (lambda: IncrementalRSI(14), lambda i: i.value),
+    (lambda: IncrementalRSI(14, method="wilder"), lambda i: i.value),
+    (lambda: BollingerBands(20, 2.0), lambda i: (i.upper, i.lower)),
+    (lambda: ReturnVolatility(5), lambda i: i.value),
+])
+def test_snapshot_restore_resumes_the_same_stream(make, read):
+    close = _closes()
+    live = make()
+    for v in close[:200]:
+        live.update(float(v))
+
+    # Through JSON, as persisted state would be
+    resumed = make().restore(json.loads(json.dumps(live.snapshot())))
+    for v in close[200:]:
+        live.update(float(v))
+        resumed.update(float(v))
+        np.testing.assert_allclose(
+            np.array(read(resumed), dtype=float), np.array(read(live), dtype=float),
+            rtol=1e-9, equal_nan=True,
+        )
+
+
+def test_incremental_features_match_compute_features():
+    from core.model.predictor import IncrementalFeatures, compute_features
+
+    close = _closes(300)
+    features = IncrementalFeatures()
+    for v in close:
+        live = features.update(v)
+
+    batch = compute_features(pd.DataFrame({"close": close}))
+    for name, value in batch.items():
+        assert live[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
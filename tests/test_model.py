@@ -0,0 +1,395 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.model import predictor
+from core.utils.cache import prediction_cache
+
+SYMBOL = "TEST-EUR"
+
+
+def _frame(n, start=1_600_000_000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    return pd.DataFrame({
+        "timestamp": start + 60 * np.arange(n),
+        "open": close, "high": close, "low": close, "close": close,
+        "volume": 1.0,
+    })
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    prediction_cache.invalidate()
+    yield
+    prediction_cache.invalidate()
+
+
+def test_cached_predict_keys_on_frame_length():
+    df = _frame(300)
+
+    short = predictor.cached_predict(SYMBOL, "baseline", df=df.tail(50))
+    full = predictor.cached_predict(SYMBOL, "baseline", df=df)
+
+    assert len(short["actual_prices"]) == 50
+    assert len(full["actual_prices"]) == predictor.PREDICT_BARS
+
+
+def test_cached_predict_keys_on_closes():
+    df = _frame(300)
+    first = predictor.cached_predict(SYMBOL, "baseline", df=df)
+
+    revised = df.copy()
+    revised.loc[revised.index[-1], "close"] *= 1.05
+    second = predictor.cached_predict(SYMBOL, "baseline", df=revised)
+
+    assert second["actual_prices"][-1] == revised["close"].iloc[-1]
+    assert second["predicted_prices"] != first["predicted_prices"]
+
+
+def test_same_frame_is_served_from_cache():
+    df = _frame(300)
+    first = predictor.cached_predict(SYMBOL, "baseline", df=df)
+    assert predictor.cached_predict(SYMBOL, "baseline", df=df.copy()) is first
+
+
+def test_open_candle_is_not_cached(monkeypatch):
+    df = _frame(300)
+    # The last candle opened 30 s ago and is still open
+    monkeypatch.setattr(predictor, "now_ts", lambda: int(df["timestamp"].iloc[-1]) + 30)
+
+    assert not predictor.is_cacheable(df, "1m")
+    first = predictor.cached_predict(SYMBOL, "baseline", df=df)
+    assert predictor.cached_predict(SYMBOL, "baseline", df=df) is not first
+
+
+def test_new_bar_invalidates_previous_predictions():
+    df = _frame(301)
+    before = prediction_cache.stats()["invalidations"]
+    predictor.cached_predict(SYMBOL, "baseline", df=df.iloc[:300])
+    predictor.cached_predict(SYMBOL, "baseline", df=df.iloc[:300].tail(50))
+    assert prediction_cache.stats()["entries"] == 2
+
+    predictor.cached_predict(SYMBOL, "baseline", df=df.iloc[1:])
+    stats = prediction_cache.stats()
+    assert stats["entries"] == 1
+    assert stats["invalidations"] - before == 2
+
+
+def test_lru_cache_versions_and_eviction():
+    from core.utils.cache import LRUCache
+
+    cache = LRUCache(max_entries=2)
+    cache.put(("a", 1), "a1")
+    cache.put(("a", 2), "a2")
+    assert cache.get(("a", 1)) is None and cache.get(("a", 2)) == "a2"
+
+    cache.put(("b", 1), "b1")
+    cache.get(("a", 2))
+    cache.put(("c", 1), "c1")
+    # ("b", 1) was least recently used
+    assert cache.get(("b", 1)) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_predict_depends_only_on_the_frame(tmp_path, monkeypatch):
+    from core.data.candle_store import CandleStore
+    from core.data.feature_store import FeatureStore
+    from core.model.feature_engineering import compute_indicators
+
+    df = _frame(600)
+    candles = CandleStore(str(tmp_path / "candles"))
+    features = FeatureStore(str(tmp_path / "features"), candles)
+    candles.append(SYMBOL, "1m", df)
+    features.update(SYMBOL, "1m")
+    monkeypatch.setattr(predictor, "feature_store", features)
+
+    stored = predictor.predict(SYMBOL, "baseline", df=df)
+    expected = compute_indicators(df["close"].tail(predictor.PREDICT_BARS))
+    assert stored["features_used"]["macd"] == pytest.approx(expected["macd"][-1], rel=1e-12)
+
+    monkeypatch.setattr(predictor, "feature_store", FeatureStore(str(tmp_path / "empty"), candles))
+    assert predictor.predict(SYMBOL, "baseline", df=df) == stored
+
+
+def test_screen_request_size_is_bounded():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend.routers import model
+
+    app = FastAPI()
+    app.include_router(model.router)
+    client = TestClient(app)
+
+    assert client.get("/screen", params={"limit": model.SCREEN_MAX_BARS + 1}).status_code == 422
+    assert client.get("/screen", params={"limit": 0}).status_code == 422
+    symbols = ",".join(f"S{i}-EUR" for i in range(model.SCREEN_MAX_SYMBOLS + 1))
+    assert client.get("/screen", params={"symbols": symbols}).status_code == 422
+
+
+# ---------------------------------------------------------
+# Process pool
+# ---------------------------------------------------------
+def _sleep_task(descriptor, model):
+    import time
+
+    time.sleep(60)
+    return {"model": model}
+
+
+@pytest.fixture
+def pools():
+    from core.model import parallel
+
+    yield parallel
+    parallel.shutdown_pool()
+
+
+def test_timed_out_model_recycles_the_pool(pools):
+    pool = pools.get_pool()
+    pools.worker_models()
+    processes = list(pool._processes.values())
+
+    results = pools.run_models(_frame(50), ["baseline"], _sleep_task, local=None, timeout=0.5)
+
+    assert "timeout" in results["baseline"]["error"]
+    for process in processes:
+        process.join(5)
+        assert not process.is_alive()
+    assert pools.get_pool() is not pool
+
+
+def test_runtime_registered_model_runs_in_process(pools):
+    from core.model.base import DriftModel
+    from core.model.model_registry import model_registry
+
+    model_registry.register("runtime_drift", DriftModel("runtime_drift", 0.01))
+    try:
+        df = _frame(300)
+        results = pools.compare_parallel(SYMBOL, df, ["baseline", "runtime_drift"])
+    finally:
+        model_registry._builtins.pop("runtime_drift")
+
+    assert "runtime_drift" not in pools.worker_models()
+    assert results["runtime_drift"]["model"] == "runtime_drift"
+    assert results["baseline"]["model"] == "baseline"
+
+
+def test_ranking_and_backtests_use_separate_pools(pools):
+    assert pools.get_pool("models") is not pools.get_pool("backtest")
+    assert pools.get_pool("models") is pools.get_pool()
+
+
+# ---------------------------------------------------------
+# Walk-forward evaluation
+# ---------------------------------------------------------
+def _linear_model():
+    from core.model.base import HORIZON, Model
+    from core.model.feature_engineering import FEATURE_NAMES
+
+    weights = np.linspace(-1e-4, 1e-4, len(FEATURE_NAMES))
+    price = FEATURE_NAMES.index("price")
+
+    class Linear(Model):
+        name = "test_linear"
+
+        def predict_batch(self, features):
+            drift = np.tanh(features @ weights)
+            return features[:, price, None] * (1 + drift[:, None] * np.arange(1, HORIZON + 1))
+
+    return Linear()
+
+
+def test_forecast_matrix_matches_per_step_predictions():
+    from core.model.evaluation import WARMUP_BARS, forecast_matrix
+    from core.model.feature_engineering import compute_indicators
+    from core.model.model_registry import model_registry
+
+    df = _frame(120, seed=4)
+    close = df["close"].to_numpy()
+    model = _linear_model()
+    model_registry.register(model.name, model)
+    try:
+        batched = forecast_matrix(close, compute_indicators(close), model.name)
+    finally:
+        model_registry._builtins.pop(model.name)
+
+    for t in range(WARMUP_BARS, len(df)):
+        np.testing.assert_allclose(batched[t], model.predict(df.iloc[:t + 1]), rtol=1e-12)
+
+
+def test_walk_forward_scores_match_a_step_by_step_reference():
+    from core.model.evaluation import WARMUP_BARS, walk_forward_evaluate
+    from core.model.model_registry import model_registry
+
+    df = _frame(150, seed=5)
+    close = df["close"].to_numpy()
+    model = _linear_model()
+    model_registry.register(model.name, model)
+    try:
+        result = walk_forward_evaluate(df, [model.name])[0]
+    finally:
+        model_registry._builtins.pop(model.name)
+
+    errors, equity, peak, drawdown = [], 1.0, 1.0, 0.0
+    for t in range(WARMUP_BARS, len(df) - 1):
+        predicted = model.predict(df.iloc[:t + 1])[0] / close[t] - 1
+        actual = close[t + 1] / close[t] - 1
+        errors.append(predicted - actual)
+        equity *= 1 + np.sign(predicted) * actual
+        peak = max(peak, equity)
+        drawdown = min(drawdown, equity / peak - 1)
+
+    assert result["steps"] == len(errors)
+    assert result["rmse"] == pytest.approx(np.sqrt(np.mean(np.square(errors))), rel=1e-9)
+    assert result["mae"] == pytest.approx(np.mean(np.abs(errors)), rel=1e-9)
+    assert result["max_drawdown"] == pytest.approx(drawdown, rel=1e-9, abs=1e-12)
+    assert result["max_drawdown"] < 0
+
+
+# ---------------------------------------------------------
+# Model registry
+# ---------------------------------------------------------
+def _write_artifact(path, p_buy, mtime=None):
+    import os
+    import pickle
+
+    with open(path, "wb") as f:
+        pickle.dump({"predict_proba": [p_buy, 1 - p_buy, 0.0]}, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_artifacts_are_versioned_by_content(tmp_path, monkeypatch):
+    from core.model import model_registry as registry_module
+    from core.model.model_loader import sha256_file
+
+    path = _write_artifact(tmp_path / "clf.pkl", 0.7, mtime=1_000)
+    registry = registry_module.ModelRegistry(str(tmp_path))
+    first = registry.get("clf")
+    assert first.version == sha256_file(path)
+    assert registry.get("clf") is first
+
+    # Unchanged files are not re-hashed on lookup
+    hashed = []
+    monkeypatch.setattr(registry_module, "sha256_file", lambda p: hashed.append(p) or sha256_file(p))
+    registry.get("clf")
+    assert hashed == []
+
+    _write_artifact(path, 0.2, mtime=2_000)
+    second = registry.get("clf")
+    assert hashed == [path]
+    assert second.version == sha256_file(path) != first.version
+    assert second.predict(_frame(300))[-1] < second.predict(_frame(300))[0]
+    # The new version replaced the warm instance
+    stats = registry.stats()["warm"]
+    assert stats["entries"] == 1 and stats["invalidations"] == 1
+
+
+def test_warm_models_are_evicted_by_memory(tmp_path):
+    from core.model.model_registry import ModelRegistry
+
+    for name in ("a", "b", "c"):
+        _write_artifact(tmp_path / f"{name}.pkl", 0.6)
+    size = (tmp_path / "a.pkl").stat().st_size
+    registry = ModelRegistry(str(tmp_path), cache_mb=2.5 * size / (1024 * 1024))
+
+    a = registry.get("a")
+    registry.get("b")
+    assert registry.get("a") is a
+    registry.get("c")
+
+    # "b" was least recently used
+    stats = registry.stats()["warm"]
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["bytes"] == 2 * size
+    assert registry.get("a") is a
+    assert registry.stats()["warm"]["misses"] == 3
+    registry.get("b")
+    assert registry.stats()["warm"]["misses"] == 4
+
+
+def test_preload_warms_selected_artifacts(tmp_path):
+    from core.model.model_registry import ModelRegistry
+
+    for name in ("a", "b"):
+        _write_artifact(tmp_path / f"{name}.pkl", 0.6)
+    (tmp_path / "broken.pkl").write_bytes(b"not a pickle")
+
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.preload([], background=False) is None
+    assert registry.stats()["warm"]["entries"] == 0
+
+    registry.preload(["a"], background=False)
+    assert registry.stats()["warm"]["entries"] == 1
+
+    # "*" loads every artifact; a broken one does not stop the others
+    registry = ModelRegistry(str(tmp_path))
+    registry.preload(["*"]).join(5)
+    stats = registry.stats()["warm"]
+    assert stats["entries"] == 2 and stats["errors"] == 1
+
+
+class _FrameArtifact:
+    # Artifact exposing only predict(df)
+    def predict(self, df):
+        return df["close"].tail(3).tolist()
+
+
+def test_register_and_resolve(tmp_path):
+    import pickle
+
+    from core.model.base import DriftModel, FrameModel
+    from core.model.model_registry import ModelRegistry
+
+    _write_artifact(tmp_path / "clf.pkl", 0.9)
+    with open(tmp_path / "frame.pkl", "wb") as f:
+        pickle.dump(_FrameArtifact(), f)
+    registry = ModelRegistry(str(tmp_path))
+
+    registry.register("plain", lambda df: [float(df["close"].iloc[-1])] * 3)
+    assert isinstance(registry.get("plain"), FrameModel)
+    assert not registry.get("plain").batched
+
+    # In-code models shadow artifacts of the same name
+    drift = DriftModel("clf", 0.0)
+    registry.register("clf", drift)
+    assert registry.get("clf") is drift
+    assert registry.version("clf") == "builtin"
+    assert registry.names() == ["plain", "clf", "frame"]
+
+    df = _frame(300)
+    assert registry.get("frame").predict(df) == df["close"].tail(3).tolist()
+    with pytest.raises(ValueError):
+        registry.get("frame").predict_batch(np.zeros((1, 1)))
+    with pytest.raises(ValueError):
+        registry.get("missing")
+
+
+def test_register_model_hook_enables_batched_prediction():
+    from core.model.base import HORIZON, Model
+    from core.model.feature_engineering import FEATURE_NAMES, feature_vector
+    from core.model.model_registry import model_registry, register_model
+
+    @register_model
+    class Flat(Model):
+        name = "test_flat"
+
+        def predict_batch(self, features):
+            return np.repeat(features[:, FEATURE_NAMES.index("price"), None], HORIZON, axis=1)
+
+    try:
+        frames = [_frame(300, seed=s) for s in range(3)]
+        features = np.stack([
+            feature_vector(predictor.compute_features(df)) for df in frames
+        ])
+        batch = predictor.predict_batch("test_flat", features)
+        single = predictor.predict(SYMBOL, "test_flat", df=frames[1])
+    finally:
+        model_registry._builtins.pop("test_flat")
+
+    assert batch.shape == (3, HORIZON)
+    np.testing.assert_allclose(batch[:, 0], [df["close"].iloc[-1] for df in frames])
+    assert single["predicted_prices"] == batch[1].tolist()
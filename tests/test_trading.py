@@ -0,0 +1,76 @@
+import asyncio
+import math
+
+from backend.services import bot_engine
+from backend.services.risk import RiskConfig, RiskManager
+from core.market.order_book import OrderBookManager
+
+
+class _Account:
+    async def get_position_value_eur(self, symbol):
+        return 0.0
+
+
+class _Trades:
+    async def get_today_realized_pnl_eur(self):
+        return 0.0
+
+    async def get_trades_count_today(self):
+        return 0
+
+    async def get_last_trade(self, symbol):
+        return None
+
+
+class _Market:
+    def __init__(self, books):
+        self.books = books
+
+    async def get_orderbook_top(self, symbol):
+        return self.books.get_top(symbol)
+
+    async def estimate_slippage_pct(self, symbol, side, size_eur):
+        return await bot_engine.AsyncBotEngine.estimate_slippage_pct(self, symbol, side, size_eur)
+
+
+CONFIG = RiskConfig(
+    max_position_eur=1e9,
+    max_daily_loss_eur=1e9,
+    max_trades_per_day=100,
+    trade_cooldown_seconds=0,
+    min_signal_confidence=0.0,
+    max_spread_pct=1.0,
+    max_slippage_pct=0.5,
+)
+
+
+def _check(monkeypatch, size_eur, books):
+    monkeypatch.setattr(bot_engine, "order_books", books)
+    risk = RiskManager(CONFIG, _Account(), _Trades(), _Market(books))
+    return asyncio.run(risk.can_open_position("BTC-EUR", "buy", size_eur, 1.0))
+
+
+def _books():
+    books = OrderBookManager()
+    books.apply_snapshot("BTC-EUR", bids=[(99.9, 1.0)], asks=[(100.0, 1.0), (100.1, 1.0)])
+    return books
+
+
+def test_slippage_within_book_is_allowed(monkeypatch):
+    assert _check(monkeypatch, 150.0, _books()) == (True, "OK")
+
+
+def test_order_larger_than_book_is_rejected(monkeypatch):
+    books = _books()
+    monkeypatch.setattr(bot_engine, "order_books", books)
+    assert math.isinf(asyncio.run(_Market(books).estimate_slippage_pct("BTC-EUR", "buy", 1e6)))
+
+    allowed, reason = _check(monkeypatch, 1e6, books)
+    assert not allowed
+    assert reason == "Order book too thin for order size"
+
+
+def test_missing_book_skips_slippage_check(monkeypatch):
+    # No local book: neither spread nor slippage can be estimated
+    books = OrderBookManager()
+    assert _check(monkeypatch, 1e6, books) == (True, "OK")